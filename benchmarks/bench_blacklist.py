@@ -0,0 +1,81 @@
+"""Velocidad de la lista negra de fuentes.
+
+Compara `BlacklistMatcher` (autómata de Aho-Corasick para vía, extensiones y
+título, y un conjunto para la empresa) con la versión anterior de
+`is_blacklisted_source` (congelada en `tests/legacy.py`), que recorría la
+lista de fuentes una vez por campo y ejecutaba un `re.search` por fuente
+sobre el título. Se mide con las fuentes por defecto y con listas de
+`--sources` fuentes generadas, sobre empleos sintéticos cuyos campos incluyen
+fuentes al azar. La paridad y la recarga del archivo las verifica
+`tests/test_blacklist.py`.
+
+Uso:
+    python benchmarks/bench_blacklist.py --jobs 5000 --sources 300
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+os.environ.setdefault("SPRING_BOOT_API", "http://localhost:8080/api/ofertas")
+
+from benchmarks import synthetic
+from src.config.settings import BLACKLISTED_SOURCES
+from src.utils.blacklist import BlacklistMatcher
+from tests.legacy import legacy_is_blacklisted
+
+def generated_sources(count: int, seed: int):
+    """Agregadores inventados: dominios, nombres de una y de varias palabras."""
+    rng = random.Random(seed)
+    syllables = ["em", "pleo", "jo", "bs", "tra", "ba", "jo", "net", "ya", "pro", "fe", "lab", "cv", "red"]
+    sources = set(BLACKLISTED_SOURCES)
+    while len(sources) < count:
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        sources.add(rng.choice([name, f"{name}.com", f"{name}.com.ar", f"{name} careers", f"{name} jobs"]))
+    return sorted(sources)
+
+def mixed_jobs(count: int, sources, seed: int):
+    """Empleos sintéticos con fuentes insertadas al azar en vía, empresa, extensiones o título."""
+    rng = random.Random(seed)
+    for job in synthetic.jobs(count, seed=seed, paragraphs=1):
+        if rng.random() < 0.5:
+            source = rng.choice(sources)
+            variant = rng.choice([source, source.upper(), source.title(), f"{source}x", f"x{source}", source[:-1]])
+            field = rng.choice(["via", "company_name", "extensions", "title", "title_prefix"])
+            if field == "extensions":
+                cut = rng.randint(0, len(variant))
+                job["extensions"] = [variant[:cut], variant[cut:]] if rng.random() < 0.3 else [variant]
+            elif field == "title_prefix":
+                job["title"] = f"{variant} - {job['title']}"
+            elif field == "title":
+                job["title"] = f"{job['title']} {rng.choice(['', '(', '/'])}{variant}"
+            else:
+                job[field] = variant
+        yield job
+
+def timed(func, jobs) -> float:
+    start = time.perf_counter()
+    for job in jobs:
+        func(job)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=5000, help="Empleos por lista de fuentes")
+    parser.add_argument("--sources", type=int, nargs="+", default=[300], help="Tamaños de lista generada")
+    args = parser.parse_args()
+
+    for sources in [list(BLACKLISTED_SOURCES)] + [generated_sources(size, seed=size) for size in args.sources]:
+        matcher = BlacklistMatcher(sources)
+        jobs = list(mixed_jobs(args.jobs, sources, seed=len(sources)))
+        blocked = sum(legacy_is_blacklisted(job, sources) for job in jobs)
+        legacy = timed(lambda job: legacy_is_blacklisted(job, sources), jobs)
+        new = timed(matcher.match, jobs)
+        print(f"{len(sources):>5} fuentes  bloqueados {blocked}/{len(jobs)}  "
+              f"anterior {len(jobs) / legacy:>10,.0f}/s  nuevo {len(jobs) / new:>10,.0f}/s  ×{legacy / new:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark del clasificador de categorías.
+
+Compara la velocidad de `KeywordClassifier` (estrategia "reglas", una sola
+pasada) con la versión anterior de `map_category` (congelada en
+`tests/legacy.py`), que ejecutaba `re.search(rf"\\b{palabra}\\b", texto)` por
+cada palabra clave de cada categoría, sobre empleos sintéticos y sobre
+textos que combinan al azar palabras clave de varias categorías. La paridad
+entre ambas la verifica `tests/test_categories.py`.
+
+Con `--report` compara además las estrategias "reglas" y "puntaje"
+(ScoreClassifier, por lotes) contra la muestra etiquetada a mano de
+`benchmarks/data/categorias_etiquetadas.jsonl`: aciertos de cada una,
+coincidencia entre ambas y velocidad por lote.
+
+Uso:
+    python benchmarks/bench_categories.py --jobs 5000 --mixed 20000
+    python benchmarks/bench_categories.py --report
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+os.environ.setdefault("SPRING_BOOT_API", "http://localhost:8080/api/ofertas")
+
+from benchmarks import synthetic
+from src.config.categories import CATEGORIES, CATEGORY_KEYWORDS
+from src.utils import category_classifier
+from src.utils.category_classifier import KeywordClassifier, ScoreClassifier
+from tests.legacy import legacy_map_category
+
+LABELLED_SAMPLE = os.path.join(os.path.dirname(__file__), "data", "categorias_etiquetadas.jsonl")
+
+def mixed_texts(count: int, seed: int):
+    """Títulos y descripciones cortas con palabras clave de distintas categorías y bordes de palabra."""
+    rng = random.Random(seed)
+    keywords = [keyword for keywords in CATEGORY_KEYWORDS.values() for keyword in keywords]
+    glue = [" ", ", ", ". ", "-", "/", "", "s ", "_", "\n"]
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 6)):
+            word = rng.choice(keywords) if rng.random() < 0.6 else rng.choice(synthetic.WORDS)
+            if rng.random() < 0.2:
+                word = word.upper() if rng.random() < 0.5 else word.title()
+            parts.append(word + rng.choice(glue))
+        split = rng.randint(0, len(parts))
+        yield "".join(parts[:split]), "".join(parts[split:])
+
+def timed(func, inputs):
+    start = time.perf_counter()
+    for title, description in inputs:
+        func(title, description)
+    return time.perf_counter() - start
+
+def report(jobs) -> None:
+    """Aciertos de cada estrategia sobre la muestra etiquetada y velocidad por lote."""
+    names = {category_id: name for name, category_id in CATEGORIES.items()}
+    with open(LABELLED_SAMPLE, encoding="utf-8") as f:
+        sample = [json.loads(line) for line in f if line.strip()]
+    pairs = [(row["titulo"], row["descripcion"]) for row in sample]
+    rules = [names[KeywordClassifier().classify(title, description)] for title, description in pairs]
+    scores = [names[category_id] for category_id in ScoreClassifier().classify_batch(pairs)]
+    labels = [row["categoria"] for row in sample]
+
+    total = len(sample)
+    print(f"Muestra etiquetada: {total} ofertas")
+    print(f"  reglas:  {sum(a == b for a, b in zip(rules, labels))}/{total} aciertos")
+    print(f"  puntaje: {sum(a == b for a, b in zip(scores, labels))}/{total} aciertos")
+    print(f"  coincidencia entre estrategias: {sum(a == b for a, b in zip(rules, scores))}/{total}")
+    for (title, _), rule, score, label in zip(pairs, rules, scores, labels):
+        if rule != score or rule != label:
+            print(f"  {title[:40]:<40} etiqueta {label:<20} reglas {rule:<20} puntaje {score}")
+
+    numpy_available = category_classifier.np is not None
+    fallback = ScoreClassifier()
+    fallback._matrix = None
+    if numpy_available:
+        vectorized = ScoreClassifier()
+        same = vectorized.classify_batch(jobs) == fallback.classify_batch(jobs)
+        print(f"NumPy y Python puro coinciden en {len(jobs)} empleos: {'sí' if same else 'NO'}")
+    for name, classifier in (("puntaje NumPy", ScoreClassifier() if numpy_available else None),
+                             ("puntaje Python", fallback)):
+        if classifier is None:
+            print(f"{name:<20} (NumPy no está instalado)")
+            continue
+        start = time.perf_counter()
+        for offset in range(0, len(jobs), 10):
+            classifier.classify_batch(jobs[offset:offset + 10])
+        print(f"{name:<20} {len(jobs) / (time.perf_counter() - start):>10,.0f} empleos/s (lotes de 10)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=3000, help="Empleos sintéticos (descripciones largas)")
+    parser.add_argument("--mixed", type=int, default=20000, help="Textos combinados")
+    parser.add_argument("--paragraphs", type=int, default=6)
+    parser.add_argument("--report", action="store_true", help="Comparar estrategias con la muestra etiquetada")
+    args = parser.parse_args()
+    map_category = KeywordClassifier().classify
+
+    jobs = [(job["title"], job["description"]) for job in synthetic.jobs(args.jobs, seed=7, paragraphs=args.paragraphs)]
+    mixed = list(mixed_texts(args.mixed, seed=7))
+
+    for name, inputs in (("empleos sintéticos", jobs), ("textos combinados", mixed)):
+        legacy = timed(legacy_map_category, inputs)
+        new = timed(map_category, inputs)
+        print(f"{name:<20} anterior {len(inputs) / legacy:>10,.0f}/s  nuevo {len(inputs) / new:>10,.0f}/s  "
+              f"×{legacy / new:.1f}")
+    if args.report:
+        report(jobs)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Costo del logging en el hilo que publica.
+
+Mide, por oferta aceptada, el tiempo que pasan en el hilo que llama los logs
+que escribe `iter_valid_jobs` ("[VÁLIDA]" y el objeto de SerpApi):
+- "anterior": StreamHandler sincrónico con buffer de línea y el objeto de
+  SerpApi serializado con `json.dumps(..., indent=2)` en nivel INFO
+  (configuración y llamadas anteriores).
+- "cola": `setup_logging` (QueueHandler + QueueListener, archivo JSON
+  rotativo) con el objeto de SerpApi solo en DEBUG.
+
+La salida va a archivos temporales; cada modo corre en un subproceso porque
+el logging se configura una sola vez por proceso.
+
+Uso:
+    python benchmarks/bench_logging.py --offers 5000
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+os.environ.setdefault("SPRING_BOOT_API", "http://localhost:8080/api/ofertas")
+
+from benchmarks import synthetic
+
+MODES = ("anterior", "cola")
+
+def child(mode: str, offers: int, workdir: str) -> None:
+    jobs = synthetic.jobs(offers, seed=5)
+    sys.stdout = open(os.path.join(workdir, f"consola_{mode}.log"), "w", encoding="utf-8")
+    logger = logging.getLogger("src.scraper.backend")
+    if mode == "anterior":
+        sys.stdout.reconfigure(line_buffering=True)
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S'))
+        logging.getLogger().addHandler(handler)
+        logging.getLogger().setLevel(logging.INFO)
+    else:
+        from src.utils.logging import setup_logging, shutdown_logging
+        setup_logging(level="INFO", log_file=os.path.join(workdir, "bot.log"))
+
+    start = time.perf_counter()
+    for job in jobs:
+        logger.info(f"[VÁLIDA] Oferta aceptada: '{job.get('title', '')}' - {job.get('company_name', '')}")
+        if mode == "anterior":
+            logger.info(f"[SERPAPI OBJETO] {json.dumps(job, indent=2, ensure_ascii=False)}")
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[SERPAPI OBJETO] {json.dumps(job, indent=2, ensure_ascii=False)}")
+    elapsed = time.perf_counter() - start
+    if mode == "cola":
+        shutdown_logging()
+    sys.stdout.flush()
+    print(json.dumps({"modo": mode, "us_por_oferta": elapsed / offers * 1e6}), file=sys.__stdout__)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--offers", type=int, default=5000)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.offers, args.workdir)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in MODES:
+            output = subprocess.run([sys.executable, __file__, "--child", mode, "--offers", str(args.offers),
+                                     "--workdir", workdir], capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:<10} {result['us_por_oferta']:>8.1f} µs por oferta en el hilo que publica")
+        with open(os.path.join(workdir, "bot.log"), encoding="utf-8") as f:
+            json.loads(f.readline())
+        print("Archivo de log: un objeto JSON por línea")
+
+if __name__ == "__main__":
+    main()
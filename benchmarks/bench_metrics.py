@@ -0,0 +1,116 @@
+"""Costo de la instrumentación y verificación del exportador de métricas.
+
+Mide el tiempo por llamada de las funciones instrumentadas más frecuentes
+(`is_duplicate` y `map_to_oferta_empleo`) con las métricas deshabilitadas
+(sin METRICS_PORT ni METRICS_TEXTFILE) y habilitadas. Con las métricas
+habilitadas corre además `create_offer` contra los servidores locales de
+`fake_servers.py`, consulta /metrics en el servidor HTTP y verifica que
+estén las métricas de cada etapa.
+
+Cada modo corre en un subproceso porque las métricas se habilitan al
+importar, según la configuración.
+
+Uso:
+    python benchmarks/bench_metrics.py --jobs 2000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+os.environ.setdefault("SPRING_BOOT_API", "http://localhost:8080/api/ofertas")
+
+from benchmarks import synthetic
+
+MODES = ("deshabilitadas", "habilitadas")
+EXPECTED = (
+    "empleos_serpapi_pagina_segundos_count",
+    'empleos_http_pedido_segundos_count{endpoint="serpapi"}',
+    'empleos_http_pedido_segundos_count{endpoint="backend_post"}',
+    'empleos_filtrados_total{resultado="valido"}',
+    "empleos_deduplicacion_segundos_count",
+    "empleos_categorizacion_segundos_count",
+    "empleos_mapeo_segundos_count",
+    "empleos_backend_envio_segundos_count",
+    'empleos_backend_envios_total{resultado="ok"}',
+    "empleos_ofertas_publicadas_total",
+)
+
+def per_call_us(func, jobs, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for job in jobs:
+            func(job)
+        best = min(best, time.perf_counter() - start)
+    return best / len(jobs) * 1e6
+
+def child(mode: str, count: int) -> None:
+    import logging
+    logging.disable(logging.CRITICAL)
+    from src.models.oferta_empleo import map_to_oferta_empleo
+    from src.utils.content_cache import ContentCache, set_content_cache
+    from src.utils.helpers import DuplicateIndex, is_duplicate
+    from src.utils.metrics import REGISTRY, start_metrics_server
+
+    jobs = synthetic.jobs(count, seed=11, paragraphs=2)
+    index = DuplicateIndex(synthetic.existing_offers(1000, seed=11))
+    set_content_cache(ContentCache(max_entries=0, path=None))
+    result = {
+        "modo": mode,
+        "is_duplicate_us": per_call_us(lambda job: is_duplicate(job, index), jobs),
+        "map_to_oferta_empleo_us": per_call_us(map_to_oferta_empleo, jobs),
+    }
+    set_content_cache(None)
+    if REGISTRY.enabled:
+        from benchmarks.bench_pipeline import bench_end_to_end
+        bench_end_to_end(offers=3, existing=200, latency_ms=0)
+        server = start_metrics_server(port=0)
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            body = response.read().decode("utf-8")
+        server.shutdown()
+        samples = {}
+        for line in body.splitlines():
+            if line and not line.startswith("#"):
+                name, _, value = line.rpartition(" ")
+                samples[name] = float(value)
+        result["faltantes"] = [name for name in EXPECTED if not samples.get(name)]
+        result["muestras"] = len(samples)
+    print(json.dumps(result))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.jobs)
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in MODES:
+            env = dict(os.environ, METRICS_PORT="0", METRICS_TEXTFILE="")
+            if mode == "habilitadas":
+                env["METRICS_TEXTFILE"] = os.path.join(workdir, "metricas.prom")
+            output = subprocess.run([sys.executable, __file__, "--child", mode, "--jobs", str(args.jobs)],
+                                    capture_output=True, text=True, check=True, env=env).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+    for stage in ("is_duplicate_us", "map_to_oferta_empleo_us"):
+        off, on = results["deshabilitadas"][stage], results["habilitadas"][stage]
+        print(f"{stage[:-3]:<22} deshabilitadas {off:>8.2f} µs  habilitadas {on:>8.2f} µs  (+{on - off:.2f} µs)")
+    missing = results["habilitadas"]["faltantes"]
+    print(f"/metrics: {results['habilitadas']['muestras']} muestras; "
+          f"{'todas las etapas presentes' if not missing else 'FALTAN ' + ', '.join(missing)}")
+    sys.exit(1 if missing else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark de latencia de consulta del índice MinHash/LSH de casi duplicados.
+
+Uso:
+    python benchmarks/bench_minhash.py --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from array import array
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+os.environ.setdefault("SPRING_BOOT_API", "http://localhost:8080/api/ofertas")
+
+from benchmarks import synthetic
+from src.utils.minhash import NearDuplicateIndex
+
+def repost(rng: random.Random, job: dict) -> dict:
+    """Simula la misma vacante publicada por otra consultora con pequeños cambios."""
+    words = job["description"].split(" ")
+    for _ in range(max(1, len(words) // 100)):
+        words[rng.randrange(len(words))] = rng.choice(synthetic.WORDS)
+    return dict(job, company_name="Otra Consultora", description=" ".join(words))
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def run(size: int, queries: int, real_offers: int) -> dict:
+    rng = random.Random(size)
+    index = NearDuplicateIndex()
+    sig_bytes = 4 * index.num_perm
+
+    start = time.perf_counter()
+    # Relleno con firmas aleatorias: el costo de consulta depende de las tablas, no del texto
+    for _ in range(size - real_offers):
+        index.add_signature(array('I', os.urandom(sig_bytes)))
+    real_jobs = synthetic.jobs(real_offers, seed=size)
+    for job in real_jobs:
+        index.add({"titulo": job["title"], "descripcion": job["description"]})
+    build_seconds = time.perf_counter() - start
+
+    query_jobs = [repost(rng, rng.choice(real_jobs)) for _ in range(queries // 2)]
+    query_jobs += synthetic.jobs(queries - len(query_jobs), seed=size + 1)
+    signatures = [index.signature(f"{job['title']} {job['description']}") for job in query_jobs]
+
+    lookup, full, hits = [], [], 0
+    for job, signature in zip(query_jobs, signatures):
+        t0 = time.perf_counter()
+        hits += index.find_signature(signature) is not None
+        lookup.append((time.perf_counter() - t0) * 1e6)
+        t0 = time.perf_counter()
+        index.contains(job)
+        full.append((time.perf_counter() - t0) * 1e6)
+
+    return {
+        "ofertas": len(index),
+        "construccion_s": round(build_seconds, 2),
+        "lookup_p50_us": round(statistics.median(lookup), 1),
+        "lookup_p95_us": round(percentile(lookup, 0.95), 1),
+        "consulta_p50_us": round(statistics.median(full), 1),
+        "consulta_p95_us": round(percentile(full, 0.95), 1),
+        "aciertos": f"{hits}/{queries}",
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--real-offers", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'ofertas':>10} {'build(s)':>9} {'lookup p50':>11} {'lookup p95':>11} {'total p50':>10} {'total p95':>10} {'aciertos':>10}")
+    for size in args.sizes:
+        r = run(size, args.queries, min(args.real_offers, size))
+        print(f"{r['ofertas']:>10} {r['construccion_s']:>9} {r['lookup_p50_us']:>9}us {r['lookup_p95_us']:>9}us "
+              f"{r['consulta_p50_us']:>8}us {r['consulta_p95_us']:>8}us {r['aciertos']:>10}")
+
+if __name__ == "__main__":
+    main()
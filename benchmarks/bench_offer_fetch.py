@@ -0,0 +1,102 @@
+"""Benchmark de memoria al descargar el listado de ofertas del backend.
+
+Compara el pico de RSS de:
+- "json": `response.json()` sobre la lista completa (comportamiento anterior).
+- "stream": `fetch_offers_since`, que procesa la respuesta en streaming y se
+  queda solo con titulo, empresaConsultora y fechaPublicacion.
+- "store": `OfferStore.sync()` completo (streaming + firmas MinHash + SQLite).
+
+Cada modo corre en un subproceso para medir su pico de RSS por separado; el
+backend es el servidor local de `fake_servers.py`, con descripciones HTML.
+
+Uso:
+    python benchmarks/bench_offer_fetch.py --offers 10000 100000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+MODES = ("json", "stream", "store")
+
+def peak_rss_mb() -> float:
+    # VmHWM se reinicia con exec; ru_maxrss hereda el pico del proceso padre tras fork
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def child(mode: str, url: str) -> None:
+    os.environ["SPRING_BOOT_API"] = url
+    from src.scraper.backend import BASE_API_URL, fetch_offers_since
+    from src.scraper.http_client import get_http_client
+    from src.scraper.offer_store import OfferStore
+    from src.utils.minhash import NearDuplicateIndex
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "json":
+        response = get_http_client().get(BASE_API_URL, endpoint="backend_get")
+        response.raise_for_status()
+        count = len(response.json())
+    elif mode == "stream":
+        count = len(fetch_offers_since())
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            store = OfferStore(os.path.join(workdir, "ofertas.db"), signer=NearDuplicateIndex())
+            count = store.sync(full=True)
+            store.close()
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"modo": mode, "ofertas": count, "segundos": elapsed,
+                      "rss_base_mb": baseline, "rss_pico_mb": peak_rss_mb()}))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--offers", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--output", help="Archivo JSON de resultados")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.url)
+        return
+
+    os.environ.setdefault("SPRING_BOOT_API", "http://localhost:8080/api/ofertas")
+    from benchmarks.fake_servers import FakeBackend, base_url, serve
+
+    results = []
+    for size in args.offers:
+        backend = FakeBackend(size, with_description=True)
+        server = serve(backend)
+        url = f"{base_url(server)}/api/ofertas"
+        payload_mb = len(json.dumps(backend.offers, ensure_ascii=False).encode("utf-8")) / 1024 / 1024
+        print(f"{size:,} ofertas ({payload_mb:.1f} MB de JSON)")
+        for mode in args.modes:
+            output = subprocess.run([sys.executable, __file__, "--child", mode, "--url", url],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            result.update(tamano_respuesta_mb=payload_mb)
+            results.append(result)
+            print(f"  {mode:<8} pico RSS {result['rss_pico_mb']:>8.1f} MB "
+                  f"(+{result['rss_pico_mb'] - result['rss_base_mb']:.1f} MB)  {result['segundos']:.2f}s")
+        server.shutdown()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    main()
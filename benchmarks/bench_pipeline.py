@@ -0,0 +1,222 @@
+"""Benchmark de las etapas del pipeline scrape → filtro → mapeo → publicación.
+
+Mide por etapa (is_blacklisted_source, is_duplicate, map_category,
+text_to_html, map_to_oferta_empleo) y de punta a punta (`create_offer`
+contra los servidores locales de `fake_servers.py`): throughput, percentiles
+de latencia y pico de memoria (tracemalloc, en una pasada aparte para no
+distorsionar los tiempos). Los resultados se guardan en JSON para comparar
+entre commits.
+
+Uso:
+    python benchmarks/bench_pipeline.py --sizes 1000 100000 1000000 --output resultados.json
+    python benchmarks/bench_pipeline.py --compare base.json resultados.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+os.environ.setdefault("SPRING_BOOT_API", "http://localhost:8080/api/ofertas")
+
+from benchmarks import synthetic
+from benchmarks.fake_servers import FakeBackend, FakeSerpApi, FaultInjector, base_url, serve
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def measure(name: str, func: Callable, inputs: List, repeat: int = 1) -> Dict:
+    """Ejecuta `func` sobre cada entrada y resume latencias (µs), throughput y pico de memoria."""
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in inputs:
+            t0 = time.perf_counter()
+            func(item)
+            latencies.append((time.perf_counter() - t0) * 1e6)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for item in inputs:
+        func(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        "etapa": name,
+        "operaciones": len(latencies),
+        "ops_por_seg": len(latencies) / elapsed,
+        "p50_us": percentile(latencies, 0.50),
+        "p95_us": percentile(latencies, 0.95),
+        "p99_us": percentile(latencies, 0.99),
+        "media_us": statistics.fmean(latencies),
+        "pico_memoria_kb": peak / 1024,
+    }
+    print(f"{name:<40} {result['ops_por_seg']:>12,.0f} ops/s  p50 {result['p50_us']:>9.1f}µs  "
+          f"p95 {result['p95_us']:>9.1f}µs  p99 {result['p99_us']:>9.1f}µs  pico {result['pico_memoria_kb']:>9.1f}KB")
+    return result
+
+def bench_stages(jobs: List[Dict], repeat: int) -> List[Dict]:
+    from src.models.oferta_empleo import map_to_oferta_empleo
+    from src.utils.content_cache import ContentCache, set_content_cache
+    from src.utils.helpers import is_blacklisted_source, map_category, text_to_html
+
+    # Sin memo, para medir el costo real de cada etapa
+    set_content_cache(ContentCache(max_entries=0, path=None))
+    results = [
+        measure("is_blacklisted_source", is_blacklisted_source, jobs, repeat),
+        measure("map_category", lambda job: map_category(job["title"], job["description"]), jobs, repeat),
+        measure("text_to_html", lambda job: text_to_html(job["description"]), jobs, repeat),
+        measure("map_to_oferta_empleo", map_to_oferta_empleo, jobs, repeat),
+    ]
+    # Con memo: los empleos repetidos (misma vacante en otra consulta u horario) no se recalculan
+    set_content_cache(ContentCache(path=None, max_entries=len(jobs)))
+    results.append(measure("map_to_oferta_empleo (memo)", map_to_oferta_empleo, jobs, repeat))
+    set_content_cache(None)
+    return results
+
+def bench_duplicates(jobs: List[Dict], size: int) -> List[Dict]:
+    from src.utils.helpers import DuplicateIndex, is_duplicate
+    from src.utils.minhash import NearDuplicateIndex
+
+    existing = synthetic.existing_offers(size, seed=size)
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = DuplicateIndex(existing, near_duplicates=NearDuplicateIndex())
+    build_seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{f'DuplicateIndex (construcción, {size:,})':<40} {build_seconds:>12.2f} s      "
+          f"pico {peak / 1024 / 1024:.1f}MB")
+
+    result = measure(f"is_duplicate ({size:,} existentes)", lambda job: is_duplicate(job, index), jobs)
+    result.update(existentes=size, construccion_seg=build_seconds, construccion_pico_mb=peak / 1024 / 1024)
+    return [result]
+
+def bench_end_to_end(offers: int, existing: int, latency_ms: float) -> Dict:
+    """Corre `create_offer` contra SerpApi y backend locales, en un directorio temporal."""
+    fake_serpapi = FakeSerpApi(pages=3, faults=FaultInjector(latency_ms))
+    fake_backend = FakeBackend(existing, faults=FaultInjector(latency_ms))
+    serpapi = serve(fake_serpapi)
+    backend = serve(fake_backend)
+    workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        from src.scraper import backend as backend_module, serpapi as serpapi_module
+        from src.scraper.offer_store import OfferStore
+        from src.scraper.serpapi_budget import SerpApiBudget, set_serpapi_budget
+        from src.scraper.query_planner import QueryPlanner, set_query_planner
+        from src.utils.helpers import DuplicateIndex
+        from src.utils.minhash import NearDuplicateIndex
+
+        # Apuntar el código real a los servidores locales
+        serpapi_module.SERPAPI_URL = f"{base_url(serpapi)}/search"
+        backend_module.BASE_API_URL = f"{base_url(backend)}/api/ofertas"
+        backend_module.SPRING_BOOT_API = f"{backend_module.BASE_API_URL}/automated"
+        set_serpapi_budget(SerpApiBudget(os.path.join(workdir, "budget.json"), 0, 0, 0))
+        set_query_planner(QueryPlanner(None))
+
+        store = OfferStore(os.path.join(workdir, "ofertas.db"), fetcher=backend_module.iter_offers_since)
+        tracemalloc.start()
+        start = time.perf_counter()
+        store.sync()
+        index = DuplicateIndex(near_duplicates=NearDuplicateIndex(), store=store)
+        load_seconds = time.perf_counter() - start
+        created = backend_module.create_offer(index, desired_offers=offers)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        os.chdir(previous_cwd)
+        serpapi.shutdown()
+        backend.shutdown()
+
+    result = {
+        "etapa": "create_offer (punta a punta)",
+        "ofertas": created,
+        "existentes": existing,
+        "latencia_simulada_ms": latency_ms,
+        "carga_seg": load_seconds,
+        "total_seg": elapsed,
+        "ofertas_por_seg": created / elapsed if elapsed else 0.0,
+        "consultas_serpapi": fake_serpapi.requests,
+        "pedidos_backend": fake_backend.requests,
+        "pico_memoria_mb": peak / 1024 / 1024,
+    }
+    print(f"{'create_offer (punta a punta)':<40} {created} ofertas en {elapsed:.2f}s "
+          f"(carga {load_seconds:.2f}s)  pico {result['pico_memoria_mb']:.1f}MB")
+    return result
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+def compare(base_path: str, new_path: str) -> None:
+    """Muestra la variación de throughput y p95 por etapa entre dos resultados."""
+    with open(base_path, encoding="utf-8") as f:
+        base = {r["etapa"]: r for r in json.load(f)["resultados"]}
+    with open(new_path, encoding="utf-8") as f:
+        new = {r["etapa"]: r for r in json.load(f)["resultados"]}
+    for name, result in new.items():
+        if name not in base or "ops_por_seg" not in result:
+            continue
+        speedup = result["ops_por_seg"] / base[name]["ops_por_seg"]
+        p95 = result["p95_us"] / base[name]["p95_us"] if base[name]["p95_us"] else float("nan")
+        print(f"{name:<40} throughput ×{speedup:.2f}  p95 ×{p95:.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=2000, help="Empleos sintéticos por etapa")
+    parser.add_argument("--paragraphs", type=int, default=6, help="Párrafos por descripción")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Cantidades de ofertas existentes para is_duplicate")
+    parser.add_argument("--e2e-offers", type=int, default=5, help="Ofertas a publicar de punta a punta (0 = omitir)")
+    parser.add_argument("--e2e-existing", type=int, default=10000)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Latencia simulada de SerpApi y backend")
+    parser.add_argument("--output", help="Archivo JSON de resultados")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NUEVO"), help="Comparar dos archivos de resultados")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    # El costo de escribir logs no es parte de lo que se mide
+    logging.disable(logging.CRITICAL)
+
+    jobs = synthetic.jobs(args.jobs, seed=1, paragraphs=args.paragraphs)
+    results = bench_stages(jobs, args.repeat)
+    for size in args.sizes:
+        results.extend(bench_duplicates(jobs[:1000], size))
+    if args.e2e_offers:
+        results.append(bench_end_to_end(args.e2e_offers, args.e2e_existing, args.latency_ms))
+
+    report = {
+        "commit": git_commit(),
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "parametros": vars(args),
+        "resultados": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Resultados guardados en {args.output}")
+
+if __name__ == "__main__":
+    main()
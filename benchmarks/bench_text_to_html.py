@@ -0,0 +1,63 @@
+"""Throughput de `text_to_html` frente a la implementación anterior.
+
+La versión actual recorre las líneas una sola vez y escapa el contenido como
+HTML. La paridad con la implementación anterior (congelada en
+`tests/legacy.py`) la verifica `tests/test_text_to_html.py`.
+
+El throughput se mide en MB/s de texto de entrada, con descripciones del
+corpus concatenadas hasta `--size-kb`, junto con el pico de memoria.
+
+Uso:
+    python benchmarks/bench_text_to_html.py --size-kb 16 1024
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+os.environ.setdefault("SPRING_BOOT_API", "http://localhost:8080/api/ofertas")
+
+from src.utils.helpers import text_to_html
+from tests.legacy import legacy_text_to_html
+
+CORPUS = os.path.join(os.path.dirname(__file__), "data", "descripciones.jsonl")
+
+def load_corpus():
+    with open(CORPUS, encoding="utf-8") as f:
+        return [json.loads(line)["descripcion"] for line in f if line.strip()]
+
+def throughput(func, text: str, min_seconds: float = 0.5) -> float:
+    runs, start = 0, time.perf_counter()
+    while True:
+        func(text)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return len(text.encode("utf-8")) * runs / elapsed / 1024 / 1024
+
+def peak_kb(func, text: str) -> float:
+    tracemalloc.start()
+    func(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-kb", type=int, nargs="+", default=[4, 64, 1024], help="Tamaños de texto a medir")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    joined = "\n\n".join(corpus)
+    for size_kb in args.size_kb:
+        text = (joined * (size_kb * 1024 // len(joined) + 1))[:size_kb * 1024]
+        legacy, new = throughput(legacy_text_to_html, text), throughput(text_to_html, text)
+        print(f"{size_kb:>6} KB  anterior {legacy:>7.1f} MB/s  nuevo {new:>7.1f} MB/s  ×{new / legacy:.1f}  "
+              f"pico anterior {peak_kb(legacy_text_to_html, text):>8.1f} KB  nuevo {peak_kb(text_to_html, text):>8.1f} KB")
+
+if __name__ == "__main__":
+    main()
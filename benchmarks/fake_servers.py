@@ -0,0 +1,230 @@
+"""Servidores locales que reemplazan a SerpApi y al backend Spring Boot.
+
+Permiten ejecutar el código real (`scrape_google_jobs`, `create_offer`,
+`OfferStore.sync`, ...) sin conexión, con latencia y errores inyectados, para
+medir o reproducir problemas. Basta con apuntar la configuración a ellos:
+
+    SERPAPI_URL=http://127.0.0.1:8001/search SPRING_BOOT_API=http://127.0.0.1:8002/api/ofertas
+
+Uso:
+    python benchmarks/fake_servers.py --serpapi-port 8001 --backend-port 8002 --latency-ms 300 --error-rate 0.05
+    python benchmarks/fake_servers.py --replay serpapi_cache.db   # repetir respuestas grabadas
+
+Las respuestas grabadas son las de la caché de SerpApi (`SERPAPI_CACHE_PATH`):
+una corrida real con la caché habilitada sirve como grabación.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+os.environ.setdefault("SPRING_BOOT_API", "http://localhost:8080/api/ofertas")
+
+from benchmarks import synthetic
+
+class FaultInjector:
+    """Latencia (media ± jitter) y errores aleatorios compartidos por ambos servidores."""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 error_status: int = 503, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def apply(self) -> Optional[int]:
+        """Duerme la latencia simulada y devuelve un código de error si corresponde inyectarlo."""
+        with self._lock:
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            fail = self._rng.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        return self.error_status if fail else None
+
+class FakeSerpApi:
+    """Imita `GET /search` de SerpApi (engine google_jobs).
+
+    Con `replay` sirve las respuestas grabadas en una caché de SerpApi; si una
+    consulta no está grabada, o sin `replay`, genera páginas sintéticas
+    deterministas por consulta con `next_page_token` hasta `pages` páginas.
+    """
+
+    def __init__(self, pages: int = 3, jobs_per_page: int = 10, paragraphs: int = 6,
+                 faults: Optional[FaultInjector] = None, replay: Optional[str] = None):
+        self.pages = pages
+        self.jobs_per_page = jobs_per_page
+        self.paragraphs = paragraphs
+        self.faults = faults or FaultInjector()
+        self.replay = None
+        if replay:
+            from src.scraper.serpapi_cache import SerpApiCache
+            self.replay = SerpApiCache(replay, cache_only=True)
+        self.requests = 0
+
+    def synthetic_page(self, params: Dict) -> Dict:
+        token = params.get("next_page_token")
+        page = int(token[1:]) if token and token.startswith("p") and token[1:].isdigit() else 0
+        rng = random.Random(zlib.crc32(f"{params.get('q')}|{page}".encode("utf-8")))
+        data = {"jobs_results": [synthetic.job(rng, self.paragraphs) for _ in range(self.jobs_per_page)]}
+        if page + 1 < self.pages:
+            data["serpapi_pagination"] = {"next_page_token": f"p{page + 1}"}
+        return data
+
+    def handle(self, method: str, path: str, params: Dict, body: bytes,
+               headers: Optional[Dict] = None) -> Tuple[int, object]:
+        self.requests += 1
+        error = self.faults.apply()
+        if error:
+            return error, {"error": "Error inyectado"}
+        if method != "GET":
+            return 405, {"error": "Método no permitido"}
+        if not params.get("q"):
+            return 400, {"error": "Missing query `q` parameter."}
+        data = self.replay.get(params, None) if self.replay is not None else None
+        return 200, data if data is not None else self.synthetic_page(params)
+
+class FakeBackend:
+    """Imita el backend Spring Boot: `GET <base>` lista las ofertas y `POST <base>/automated` crea una.
+
+    Si se configura `since_param`, el GET filtra por fecha de publicación como
+    lo haría un backend con soporte incremental. Con los parámetros `page` y
+    `size` responde páginas al estilo de Spring Data. Con `conditional` el
+    listado lleva ETag y responde 304 a un If-None-Match vigente.
+    """
+
+    def __init__(self, existing: int = 0, seed: int = 0, faults: Optional[FaultInjector] = None,
+                 since_param: Optional[str] = None, with_description: bool = False, conditional: bool = False):
+        self.offers: List[Dict] = synthetic.existing_offers(existing, seed, with_description)
+        self.faults = faults or FaultInjector()
+        self.since_param = since_param
+        self.conditional = conditional
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+
+    def add(self, oferta: Dict) -> None:
+        """Agrega una oferta como si se hubiera cargado a mano en el backend."""
+        with self._lock:
+            self.offers.append(oferta)
+
+    def handle(self, method: str, path: str, params: Dict, body: bytes,
+               headers: Optional[Dict] = None) -> Tuple[int, object]:
+        self.requests += 1
+        error = self.faults.apply()
+        if error:
+            return error, {"error": "Error inyectado"}
+        if method == "POST" and path.endswith("/automated"):
+            try:
+                oferta = json.loads(json.loads(body)["oferta"])
+            except (ValueError, KeyError, TypeError):
+                return 400, {"error": "Cuerpo inválido"}
+            oferta.setdefault("fechaPublicacion", datetime.now().isoformat())
+            with self._lock:
+                self.offers.append(oferta)
+                oferta_id = len(self.offers)
+            return 201, {"id": oferta_id}
+        if method == "GET":
+            since = params.get(self.since_param) if self.since_param else None
+            with self._lock:
+                offers = list(self.offers)
+            if self.conditional and "size" not in params:
+                etag = f'"{len(offers)}-{zlib.crc32((since or "").encode("utf-8"))}"'
+                if (headers or {}).get("If-None-Match") == etag:
+                    self.not_modified += 1
+                    return 304, None, {"ETag": etag}
+            if since:
+                offers = [o for o in offers if (o.get("fechaPublicacion") or "") >= since]
+            if "size" in params:
+                # Paginación al estilo de Spring Data (page/size → Page con "content")
+                page, size = int(params.get("page", 0)), int(params["size"])
+                content = offers[page * size:(page + 1) * size]
+                return 200, {"content": content, "number": page, "last": (page + 1) * size >= len(offers)}
+            if self.conditional:
+                return 200, offers, {"ETag": etag}
+            return 200, offers
+        return 405, {"error": "Método no permitido"}
+
+def _handler_for(app) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _dispatch(self, method: str):
+            url = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            status, payload, *extra = app.handle(method, url.path, dict(parse_qsl(url.query)), body, self.headers)
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8") if status != 304 else b""
+            self.send_response(status)
+            for name, value in (extra[0] if extra else {}).items():
+                self.send_header(name, value)
+            if status != 304:
+                self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def serve(app, port: int = 0, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Levanta `app` en un hilo de fondo. Con `port=0` se elige un puerto libre (ver `server.server_port`)."""
+    server = ThreadingHTTPServer((host, port), _handler_for(app))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name=f"fake-{type(app).__name__}").start()
+    return server
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--serpapi-port", type=int, default=8001)
+    parser.add_argument("--backend-port", type=int, default=8002)
+    parser.add_argument("--pages", type=int, default=3, help="Páginas sintéticas por consulta")
+    parser.add_argument("--jobs-per-page", type=int, default=10)
+    parser.add_argument("--existing", type=int, default=1000, help="Ofertas iniciales del backend")
+    parser.add_argument("--since-param", default=os.getenv("BACKEND_SINCE_PARAM"))
+    parser.add_argument("--conditional", action="store_true", help="Listado con ETag (responde 304 si no cambió)")
+    parser.add_argument("--replay", help="Caché de SerpApi (SQLite) con respuestas grabadas")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0, help="Fracción de pedidos que fallan")
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    def faults(seed):
+        return FaultInjector(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status, seed)
+
+    serpapi = serve(FakeSerpApi(args.pages, args.jobs_per_page, faults=faults(1), replay=args.replay), args.serpapi_port)
+    backend = serve(FakeBackend(args.existing, faults=faults(2), since_param=args.since_param,
+                                conditional=args.conditional), args.backend_port)
+    print(f"SERPAPI_URL={base_url(serpapi)}/search")
+    print(f"SPRING_BOOT_API={base_url(backend)}/api/ofertas")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
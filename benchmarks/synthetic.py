@@ -0,0 +1,61 @@
+"""Generadores de empleos y ofertas sintéticas para los benchmarks."""
+import random
+from typing import Dict, List
+
+ROLES = ["cocinero", "ayudante de cocina", "mozo", "vendedor", "cajero", "chofer", "repartidor",
+         "recepcionista", "enfermero", "docente", "operario", "electricista", "administrativo",
+         "desarrollador", "guía de turismo", "marinero", "community manager", "contador"]
+SENIORITY = ["", "junior", "senior", "semi senior", "con experiencia", "part time", "full time"]
+COMPANIES = ["Consultora Patagonia", "Hotel Península", "Supermercado del Golfo", "Pesquera Atlántica",
+             "Clínica Madryn", "Transportes Chubut", "Estudio Contable Sur", "Agencia Ballenas",
+             "Restaurante La Costa", "Tech Madryn SRL"]
+VIAS = ["LinkedIn", "Indeed", "Computrabajo", "Bumeran", "ZonaJobs", "Jooble", "Glassdoor"]
+WORDS = ("empresa líder en la región busca incorporar personal para su equipo de trabajo en puerto "
+         "madryn con disponibilidad horaria experiencia comprobable buena predisposición trabajo en "
+         "equipo atención al público manejo de herramientas informáticas licencia de conducir "
+         "excelente ambiente laboral capacitación continua posibilidades de crecimiento obra social "
+         "turnos rotativos fines de semana incorporación inmediata presentarse con cv actualizado").split()
+
+def description(rng: random.Random, paragraphs: int = 6) -> str:
+    """Genera una descripción con párrafos, secciones y listas como las de Google Jobs."""
+    parts = []
+    for i in range(paragraphs):
+        parts.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(25, 60))).capitalize() + ".")
+        if i % 2 == 0:
+            parts.append(rng.choice(["Requisitos:", "Responsabilidades:", "Beneficios:"]))
+            parts.extend(f"- {' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 10)))}"
+                         for _ in range(rng.randint(3, 6)))
+        parts.append("")
+    return "\n".join(parts)
+
+def job(rng: random.Random, paragraphs: int = 6) -> Dict:
+    """Genera un empleo con el formato de `jobs_results` de SerpApi."""
+    title = f"{rng.choice(ROLES)} {rng.choice(SENIORITY)}".strip().title()
+    return {
+        "title": title,
+        "company_name": rng.choice(COMPANIES),
+        "location": "Puerto Madryn, Chubut",
+        "via": rng.choice(VIAS),
+        "description": description(rng, paragraphs),
+        "extensions": [rng.choice(["Hace 1 día", "Hace 3 días", "Tiempo completo"])],
+        "job_id": f"{rng.getrandbits(64):016x}",
+    }
+
+def jobs(count: int, seed: int = 0, paragraphs: int = 6) -> List[Dict]:
+    rng = random.Random(seed)
+    return [job(rng, paragraphs) for _ in range(count)]
+
+def existing_offer(rng: random.Random, with_description: bool = False) -> Dict:
+    """Genera una oferta con el formato que devuelve el backend."""
+    offer = {
+        "titulo": f"{rng.choice(ROLES)} {rng.choice(SENIORITY)} {rng.randint(1, 10**6)}".strip().title(),
+        "empresaConsultora": rng.choice(COMPANIES) + f" {rng.randint(1, 5000)}",
+        "fechaPublicacion": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+    }
+    if with_description:
+        offer["descripcion"] = description(rng, 3)
+    return offer
+
+def existing_offers(count: int, seed: int = 0, with_description: bool = False) -> List[Dict]:
+    rng = random.Random(seed)
+    return [existing_offer(rng, with_description) for _ in range(count)]
@@ -9,6 +9,27 @@ load_dotenv("config/.env")
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")
 SPRING_BOOT_API = os.getenv("SPRING_BOOT_API") + "/automated"
 BASE_API_URL = os.getenv("SPRING_BOOT_API")
+# Parámetro opcional del backend para pedir solo las ofertas publicadas desde una fecha
+BACKEND_SINCE_PARAM = os.getenv("BACKEND_SINCE_PARAM")
+# Formato (strftime, hora local) de la fecha enviada en BACKEND_SINCE_PARAM; por defecto
+# ISO sin zona, como las fechaPublicacion del backend. Con "%Y-%m-%dT%H:%M:%S%z" se envía con offset
+BACKEND_SINCE_FORMAT = os.getenv("BACKEND_SINCE_FORMAT", "%Y-%m-%dT%H:%M:%S")
+# Paginación opcional del listado de ofertas del backend (0 = el endpoint devuelve todo en un arreglo)
+BACKEND_PAGE_SIZE = int(os.getenv("BACKEND_PAGE_SIZE", 0))
+BACKEND_PAGE_PARAM = os.getenv("BACKEND_PAGE_PARAM", "page")
+BACKEND_SIZE_PARAM = os.getenv("BACKEND_SIZE_PARAM", "size")
+# Tamaño de los fragmentos al leer el listado de ofertas sin cargarlo completo en memoria
+BACKEND_STREAM_CHUNK_BYTES = 64 * 1024
+# Endpoint opcional del backend para crear varias ofertas en un solo pedido
+BACKEND_BATCH_URL = os.getenv("BACKEND_BATCH_URL")
+# Máximo de ofertas enviadas al backend en paralelo cuando no hay endpoint de lote
+BACKEND_PUBLISH_CONCURRENCY = int(os.getenv("BACKEND_PUBLISH_CONCURRENCY", 5))
+# Cola persistente de ofertas cuya publicación falló: reintentos con espera exponencial (segundos)
+OUTBOX_PATH = os.getenv("OUTBOX_PATH", "outbox.db")
+OUTBOX_BACKOFF_BASE_SECONDS = 60
+OUTBOX_BACKOFF_MAX_SECONDS = 3600
+# Antigüedad máxima (horas) de una oferta encolada antes de descartarla
+OUTBOX_MAX_AGE_HOURS = 24
 USER_ID = os.getenv("USER_ID")
 EMAIL_DEFAULT = os.getenv("EMAIL_DEFAULT")
 DESIRED_OFFERS_PER_DAY = 5
@@ -19,6 +40,102 @@ END_MINUTE = int(os.getenv("END_MINUTE", 0))
 HOURS_IN_RANGE = (END_HOUR * 60 + END_MINUTE - START_HOUR * 60 - START_MINUTE) / 60
 INTERVAL_BETWEEN_OFFERS = HOURS_IN_RANGE / DESIRED_OFFERS_PER_DAY  
 MAX_PAGES = 10  
+# Máximo de consultas simultáneas a SerpApi (variantes × filtros de fecha). Cada consulta
+# cuesta un crédito; con más de 1 las tandas se ensanchan solo tras tandas sin empleos válidos
+SERPAPI_MAX_CONCURRENCY = int(os.getenv("SERPAPI_MAX_CONCURRENCY", 1))
+SERPAPI_URL = os.getenv("SERPAPI_URL", "https://serpapi.com/search")
+
+# Planificador adaptativo de consultas: estadísticas por filtro de fecha y variante
+QUERY_PLANNER_FILE = os.getenv("QUERY_PLANNER_FILE", "query_stats.json")
+QUERY_PLANNER_EXPLORATION = float(os.getenv("QUERY_PLANNER_EXPLORATION", 1.0))
+# Una combinación se omite tras QUERY_PLANNER_MIN_CALLS consultas con menos de QUERY_PLANNER_MIN_YIELD válidas por consulta
+QUERY_PLANNER_MIN_CALLS = 10
+QUERY_PLANNER_MIN_YIELD = 0.05
+# Cada consulta de una combinación multiplica sus contadores anteriores por QUERY_PLANNER_DECAY,
+# de modo que pesan más las consultas recientes
+QUERY_PLANNER_DECAY = 0.98
+# Probabilidad de volver a probar, al final del plan, cada combinación omitida
+QUERY_PLANNER_RETRY_RATE = 0.1
+
+# Presupuesto de créditos de SerpApi (0 = sin tope)
+SERPAPI_BUDGET_FILE = os.getenv("SERPAPI_BUDGET_FILE", "serpapi_budget.json")
+SERPAPI_DAILY_LIMIT = int(os.getenv("SERPAPI_DAILY_LIMIT", 150))
+SERPAPI_MONTHLY_LIMIT = int(os.getenv("SERPAPI_MONTHLY_LIMIT", 5000))
+SERPAPI_RATE_PER_MINUTE = int(os.getenv("SERPAPI_RATE_PER_MINUTE", 30))
+
+# Caché en disco de respuestas de SerpApi (ruta vacía para deshabilitarla)
+SERPAPI_CACHE_PATH = os.getenv("SERPAPI_CACHE_PATH", "serpapi_cache.db")
+SERPAPI_CACHE_MAX_BYTES = int(os.getenv("SERPAPI_CACHE_MAX_MB", 50)) * 1024 * 1024
+SERPAPI_CACHE_ONLY = os.getenv("SERPAPI_CACHE_ONLY", "false").lower() in ("1", "true", "si", "sí")
+# Vigencia en horas de una respuesta según el filtro de fecha de la consulta
+SERPAPI_CACHE_TTL_HOURS = {
+    "date_posted:yesterday": 6,
+    "date_posted:3days": 12,
+    "date_posted:week": 24,
+    "none": 24,
+}
+
+# Cliente HTTP compartido: conexiones por host, reintentos y timeouts por endpoint (segundos)
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 4))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", max(SERPAPI_MAX_CONCURRENCY, BACKEND_PUBLISH_CONCURRENCY, 4)))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", 1.0))
+HTTP_TIMEOUTS = {
+    "default": 10,
+    "serpapi": float(os.getenv("SERPAPI_TIMEOUT", 15)),
+    "backend_get": float(os.getenv("BACKEND_GET_TIMEOUT", 30)),
+    "backend_post": float(os.getenv("BACKEND_POST_TIMEOUT", 10)),
+}
 DEFAULT_LOGO_URL = "https://example.com/default-logo.png"
+# Categorización: "reglas" (primera palabra clave en el orden de CATEGORY_KEYWORDS) o
+# "puntaje" (categoría con más apariciones de sus palabras clave, el título pesa más)
+CATEGORY_STRATEGY = os.getenv("CATEGORY_STRATEGY", "reglas")
+CATEGORY_TITLE_WEIGHT = 3.0
+CATEGORY_DESCRIPTION_WEIGHT = 1.0
+# Memo de campos derivados (categoría, HTML, enlace) por contenido del empleo: entradas en memoria
+# y capa opcional en SQLite que sobrevive reinicios (ruta vacía para deshabilitarla)
+CONTENT_CACHE_SIZE = int(os.getenv("CONTENT_CACHE_SIZE", 512))
+CONTENT_CACHE_PATH = os.getenv("CONTENT_CACHE_PATH", "")
+CONTENT_CACHE_DISK_MAX_ENTRIES = 20000
+# Lista negra de fuentes y patrones de título (JSON); se recarga al cambiar el archivo. Sin archivo
+# se usan las fuentes por defecto
+BLACKLIST_FILE = os.getenv("BLACKLIST_FILE", "config/blacklist.json")
+BLACKLIST_RELOAD_SECONDS = 5
+BLACKLISTED_SOURCES = ["conectan2.com", "bebee careers", "outlier", "superprof"]
 ARGENTINA_TZ = ZoneInfo("America/Argentina/Buenos_Aires")
-CHECK_INTERVAL_SECONDS = 60  
+# Logging: nivel, formato de la consola ("texto" o "json") y archivo opcional en JSON que rota por tamaño
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "texto")
+LOG_FILE = os.getenv("LOG_FILE", "")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_MB", 10)) * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+# Métricas en formato Prometheus: servidor HTTP local (0 = sin servidor) y/o archivo para el textfile
+# collector de node_exporter (vacío = sin archivo). Sin ninguno de los dos, la instrumentación no hace nada
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE", "")
+METRICS_TEXTFILE_SECONDS = 15
+METRICS_ENABLED = bool(METRICS_PORT or METRICS_TEXTFILE)
+# Programador de eventos: política ante horarios vencidos ("skip", "one" o "all")
+CATCH_UP_POLICY = os.getenv("CATCH_UP_POLICY", "one")
+SLOT_TOLERANCE_SECONDS = 60
+SLOT_RETRY_MINUTES = int(os.getenv("SLOT_RETRY_MINUTES", 10))
+PREFETCH_LEAD_MINUTES = int(os.getenv("PREFETCH_LEAD_MINUTES", 10))
+SCHEDULER_MAX_SLEEP_SECONDS = 3600
+
+# Detección de casi duplicados (MinHash + LSH) entre empresas distintas
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", 0.8))
+MINHASH_NUM_PERM = int(os.getenv("MINHASH_NUM_PERM", 64))
+MINHASH_SHINGLE_SIZE = 3
+
+# Réplica local en SQLite de las ofertas del backend
+OFFER_STORE_PATH = os.getenv("OFFER_STORE_PATH", "ofertas.db")
+OFFER_STORE_FULL_SYNC_HOURS = int(os.getenv("OFFER_STORE_FULL_SYNC_HOURS", 24 * 7))
+# Sin BACKEND_SINCE_PARAM ni ETag/Last-Modified cada sincronización descarga el listado completo:
+# en ese caso se sincroniza como mucho cada OFFER_STORE_UNFILTERED_SYNC_MINUTES
+OFFER_STORE_UNFILTERED_SYNC_MINUTES = int(os.getenv("OFFER_STORE_UNFILTERED_SYNC_MINUTES", 60))
+
+# Reserva de ofertas candidatas preparadas antes de cada horario
+CANDIDATE_POOL_FILE = os.getenv("CANDIDATE_POOL_FILE", "candidate_pool.json")
+CANDIDATE_POOL_SIZE = int(os.getenv("CANDIDATE_POOL_SIZE", DESIRED_OFFERS_PER_DAY))
+CANDIDATE_MAX_AGE_HOURS = int(os.getenv("CANDIDATE_MAX_AGE_HOURS", 24))
@@ -1,4 +1,5 @@
 import json
+import logging
 import sys
 import os
 
@@ -7,13 +8,25 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, project_root)
 
 from src.utils.logging import setup_logging
-from src.scraper.backend import fetch_existing_offers, create_offer
-from src.scheduler.scheduler import should_create_offer, get_next_scheduled_time
-from src.config.settings import CHECK_INTERVAL_SECONDS, END_HOUR, END_MINUTE, DESIRED_OFFERS_PER_DAY, ARGENTINA_TZ, START_HOUR, START_MINUTE
+from src.scraper.backend import create_offer, fill_pool, publish_outbox
+from src.scraper.candidate_pool import CandidatePool
+from src.scraper.outbox import Outbox
+from src.scraper.offer_store import OfferStore
+from src.scraper.serpapi_budget import get_serpapi_budget
+from src.scraper.serpapi_cache import get_serpapi_cache
+from src.utils.content_cache import get_content_cache
+from src.utils.helpers import DuplicateIndex
+from src.utils.metrics import (CREDITS_PER_OFFER, LOOP_EVENTS, OFFERS_TODAY, SLOT_DELAY_SECONDS, SLOT_PUBLISH_SECONDS,
+                               start_metrics_exporter)
+from src.utils.minhash import NearDuplicateIndex
+from src.scheduler.event_scheduler import (EventScheduler, SystemClock, OUTBOX_RETRY, PREFETCH, PUBLISH, ROLLOVER,
+                                           catch_up_count, plan_day)
+from src.config.settings import CATCH_UP_POLICY, END_HOUR, END_MINUTE, DESIRED_OFFERS_PER_DAY, ARGENTINA_TZ, SLOT_RETRY_MINUTES
 from datetime import datetime, timedelta, time as datetime_time
+from typing import List, Optional
 import time as time_module
 
-logger = setup_logging()
+logger = logging.getLogger(__name__)
 
 STATE_FILE = "script_state.json"
 
@@ -27,6 +40,7 @@ def load_state() -> dict:
 
 def save_state(last_date, offers_today, last_scheduled_time):
     """Guarda el estado persistente en un archivo."""
+    OFFERS_TODAY.set(offers_today)
     state = {
         "last_date": last_date.isoformat() if last_date else None,
         "offers_today": offers_today,
@@ -38,111 +52,184 @@ def save_state(last_date, offers_today, last_scheduled_time):
     except Exception as e:
         logger.error(f"Error al guardar estado: {e}")
 
-def main(test_mode: bool = False, test_5min: bool = False, test_force: bool = False):
-    """Función principal para scraping y creación de ofertas de forma continua."""
-    existing_offers = fetch_existing_offers()
+def load_existing_offers(offer_store: OfferStore) -> DuplicateIndex:
+    """Sincroniza la réplica local con el backend y construye el índice de duplicados sobre ella."""
+    offer_store.sync()
+    return DuplicateIndex(near_duplicates=NearDuplicateIndex(), store=offer_store)
+
+def main(test_mode: bool = False, test_5min: bool = False, test_force: bool = False, clock=None):
+    """Función principal para scraping y creación de ofertas de forma continua.
+
+    `clock` permite inyectar un reloj (por ejemplo FakeClock) para simular el
+    programa de publicaciones sin esperas reales.
+    """
+    clock = clock or SystemClock()
+    offer_store = OfferStore(signer=NearDuplicateIndex())
+    existing_offers = load_existing_offers(offer_store)
+    pool = CandidatePool()
+    outbox = Outbox(clock=lambda: clock.now().timestamp())
+    # Los topes diario y mensual cambian de período con el mismo reloj que el programa
+    get_serpapi_budget().now = clock.now
+    CREDITS_PER_OFFER.set_function(lambda: get_serpapi_budget().credits_per_offer())
     logger.info(f"Ofertas existentes en la base de datos: {len(existing_offers)}")
     
     state = load_state()
     last_date = datetime.fromisoformat(state["last_date"]).date() if state["last_date"] else None
-    offers_today = state["offers_today"]
     last_scheduled_time = datetime.fromisoformat(state["last_scheduled_time"]) if state["last_scheduled_time"] else None
-    last_log_time = None
-    last_log_message = None
 
-    while True:
-        now = datetime.now(ARGENTINA_TZ)
-        today = now.date()
-        current_total_minutes = now.hour * 60 + now.minute
-        start_total_minutes = START_HOUR * 60 + START_MINUTE
-        end_total_minutes = END_HOUR * 60 + END_MINUTE
-
-        # Reiniciar al cambiar de día
-        if last_date != today:
-            logger.info(f"[SISTEMA] Nuevo día detectado: {today}. Reiniciando contadores.")
-            last_date = today
-            last_scheduled_time = None
-            existing_offers = fetch_existing_offers()
-            offers_today = 0
-            last_log_time = None
-            last_log_message = None
-            logger.info(f"[SISTEMA] Ofertas existentes en la base de datos: {len(existing_offers)}")
+    now = clock.now()
+    today = now.date()
+    if last_date != today:
+        logger.info(f"[SISTEMA] Nuevo día detectado: {today}. Reiniciando contadores.")
+        last_date = today
+        last_scheduled_time = None
+    offers_today = offer_store.count_published_on(today)
+    save_state(last_date, offers_today, last_scheduled_time)
+
+    # Modo de prueba: forzar 5 publicaciones inmediatas
+    if test_force:
+        logger.info("[MODO PRUEBA] Forzando 5 publicaciones inmediatas")
+        offers_created = create_offer(existing_offers, desired_offers=DESIRED_OFFERS_PER_DAY, pool=pool, outbox=outbox)
+        logger.info(f"[RESUMEN] Se publicaron {offers_created}/{DESIRED_OFFERS_PER_DAY} ofertas")
+        save_state(last_date, offers_today + offers_created, last_scheduled_time)
+        return
+
+    # Modo de prueba: 5 ofertas en 5 minutos
+    if test_5min:
+        logger.info("[MODO PRUEBA] 5 ofertas en 5 minutos")
+        for i in range(DESIRED_OFFERS_PER_DAY):
+            if offers_today >= DESIRED_OFFERS_PER_DAY:
+                logger.info("Se alcanzaron las 5 ofertas. Finalizando modo de prueba.")
+                break
+            logger.info(f"[MODO PRUEBA] Publicando oferta {i+1}/{DESIRED_OFFERS_PER_DAY}")
+            offers_created = create_offer(existing_offers, pool=pool, outbox=outbox)
+            offers_today += offers_created
             save_state(last_date, offers_today, last_scheduled_time)
-        else:
-            offers_today = sum(1 for offer in existing_offers if datetime.fromisoformat(offer["fechaPublicacion"]).astimezone(ARGENTINA_TZ).date() == today)
-
-        today_offers = [offer for offer in existing_offers if datetime.fromisoformat(offer["fechaPublicacion"]).astimezone(ARGENTINA_TZ).date() == today]
-        last_offer_time = max((datetime.fromisoformat(offer["fechaPublicacion"]).astimezone(ARGENTINA_TZ) for offer in today_offers), default=None) if today_offers else None
-
-        # Modo de prueba: forzar 5 publicaciones inmediatas
-        if test_force:
-            logger.info("[MODO PRUEBA] Forzando 5 publicaciones inmediatas")
-            offers_created = create_offer(existing_offers, desired_offers=DESIRED_OFFERS_PER_DAY)
-            logger.info(f"[RESUMEN] Se publicaron {offers_created}/{DESIRED_OFFERS_PER_DAY} ofertas")
-            save_state(last_date, offers_today + offers_created, last_scheduled_time)
-            break
+            if offers_created > 0 and i < DESIRED_OFFERS_PER_DAY - 1:
+                clock.sleep(60)
+        return
 
-        # Modo de prueba: 5 ofertas en 5 minutos
-        if test_5min:
-            logger.info("[MODO PRUEBA] 5 ofertas en 5 minutos")
-            for i in range(DESIRED_OFFERS_PER_DAY):
-                if offers_today >= DESIRED_OFFERS_PER_DAY:
-                    logger.info("Se alcanzaron las 5 ofertas. Finalizando modo de prueba.")
-                    break
-                logger.info(f"[MODO PRUEBA] Publicando oferta {i+1}/{DESIRED_OFFERS_PER_DAY}")
-                offers_created = create_offer(existing_offers)
-                offers_today += offers_created
-                save_state(last_date, offers_today, last_scheduled_time)
-                if offers_created > 0 and i < DESIRED_OFFERS_PER_DAY - 1:
-                    time_module.sleep(60)
-            break
+    # Modo de prueba: publicación inmediata (una oferta)
+    if test_mode:
+        logger.info("[MODO PRUEBA] Ignorando restricciones de horario")
+        offers_created = create_offer(existing_offers, pool=pool, outbox=outbox)
+        logger.info(f"[RESUMEN] Se publicó {offers_created} oferta")
+        save_state(last_date, offers_today + offers_created, last_scheduled_time)
+        return
 
-        # Modo de prueba: publicación inmediata (una oferta)
-        if test_mode:
-            logger.info("[MODO PRUEBA] Ignorando restricciones de horario")
-            offers_created = create_offer(existing_offers)
-            logger.info(f"[RESUMEN] Se publicó {offers_created} oferta")
-            save_state(last_date, offers_today + offers_created, last_scheduled_time)
-            break
+    # Modo normal: dormir hasta el próximo evento programado
+    scheduler = EventScheduler(clock)
+    log_day_plan(plan_day(scheduler, today, offers_today, now), offers_today)
+    due_slots = []
+    outbox_retry_at = schedule_outbox_retry(scheduler, outbox, None)
 
-        # Modo normal: verificar horarios programados
-        if offers_today >= DESIRED_OFFERS_PER_DAY:
-            if last_log_message != "offers_complete":
-                next_start = datetime.combine(today + timedelta(days=1), datetime_time(hour=8, minute=50), tzinfo=ARGENTINA_TZ)
-                seconds_to_next_start = (next_start - now).total_seconds()
-                if seconds_to_next_start < 0:
-                    next_start += timedelta(days=1)
-                    seconds_to_next_start = (next_start - now).total_seconds()
-                logger.info(f"[SISTEMA] Completadas todas las ofertas del día ({offers_today}). Pausando hasta {next_start.strftime('%H:%M')}")
-                last_log_message = "offers_complete"
-                last_log_time = now
-                time_module.sleep(seconds_to_next_start)
-                continue
-        elif current_total_minutes < start_total_minutes:
-            if last_log_time is None or (now - last_log_time).total_seconds() >= 3600:
-                logger.info(f"[HORARIO] Esperando hora de inicio ({START_HOUR}:{START_MINUTE:02d})")
-                last_log_time = now
-                last_log_message = "before_start"
-        elif current_total_minutes >= end_total_minutes:
-            if last_log_time is None or (now - last_log_time).total_seconds() >= 3600:
-                logger.info(f"[PROGRAMACION] Fuera de horario de publicación (límite: {END_HOUR}:{END_MINUTE:02d})")
-                last_log_time = now
-                last_log_message = "after_end"
-        else:
-            next_scheduled_time = get_next_scheduled_time(now, offers_today)
-            if next_scheduled_time:
-                if should_create_offer(now, last_offer_time, offers_today, last_scheduled_time):
-                    offers_created = create_offer(existing_offers)
-                    if offers_created > 0:
-                        offers_today += offers_created
-                        last_scheduled_time = next_scheduled_time
+    while True:
+        for event in scheduler.wait():
+            LOOP_EVENTS.inc(tipo=event.kind)
+            if event.kind == ROLLOVER:
+                if due_slots:
+                    logger.warning(f"[PROGRAMACION] Se descartan {len(due_slots)} horarios vencidos del día anterior")
+                    due_slots = []
+                today = event.when.date()
+                logger.info(f"[SISTEMA] Nuevo día detectado: {today}. Reiniciando contadores.")
+                if get_serpapi_cache() is not None:
+                    get_serpapi_cache().log_stats()
+                get_serpapi_budget().log_summary()
+                get_content_cache().log_stats()
+                existing_offers = load_existing_offers(offer_store)
+                logger.info(f"[SISTEMA] Ofertas existentes en la base de datos: {len(existing_offers)}")
+                last_date = today
+                last_scheduled_time = None
+                offers_today = offer_store.count_published_on(today)
+                save_state(last_date, offers_today, last_scheduled_time)
+                log_day_plan(plan_day(scheduler, today, offers_today, clock.now()), offers_today)
+                outbox_retry_at = schedule_outbox_retry(scheduler, outbox, None)
+            elif event.kind == PREFETCH:
+                # Incorporar ofertas publicadas en el backend desde la última sincronización
+                existing_offers.refresh()
+                # Preparar candidatas para que el próximo horario sea un único POST
+                added = fill_pool(existing_offers, pool)
+                logger.info(f"[POOL] Reserva preparada: {len(pool)} candidatas ({added} nuevas)")
+            elif event.kind == OUTBOX_RETRY:
+                outbox_retry_at = None
+                remaining = DESIRED_OFFERS_PER_DAY - offers_today
+                # Con el cupo del día completo, lo encolado espera al cambio de día
+                if remaining > 0:
+                    # Igual que antes de un horario: incorporar lo cargado a mano desde la última sincronización
+                    existing_offers.refresh()
+                    published, _ = publish_outbox(outbox, existing_offers, remaining)
+                    if published:
+                        offers_today += published
                         logger.info(f"[PROGRESO] Ofertas creadas hoy: {offers_today}/{DESIRED_OFFERS_PER_DAY}")
-                        last_log_time = now
-                        last_log_message = "offer_created"
                         save_state(last_date, offers_today, last_scheduled_time)
+                    outbox_retry_at = schedule_outbox_retry(scheduler, outbox, outbox_retry_at)
+            else:
+                due_slots.append(event.when)
+
+        if not due_slots:
+            continue
+
+        now = clock.now()
+        pending = min(catch_up_count(due_slots, now), DESIRED_OFFERS_PER_DAY - offers_today)
+        if pending < len(due_slots):
+            logger.info(f"[PROGRAMACION] Se omiten {len(due_slots) - pending} horarios vencidos (política '{CATCH_UP_POLICY}')")
+        if pending > 0:
+            # Ofertas cargadas a mano en el backend desde el prefetch (consulta condicional: 304 si no hay)
+            existing_offers.refresh()
+            # Cada oferta encolada en el outbox corresponde a un horario anterior que quedó sin publicar
+            desired = min(pending + len(outbox), DESIRED_OFFERS_PER_DAY - offers_today)
+            logger.info(f"[PROGRAMACION] Ejecutando publicación programada: {due_slots[-1].strftime('%H:%M:%S')} ({desired} ofertas)")
+            with SLOT_PUBLISH_SECONDS.time():
+                offers_created = create_offer(existing_offers, desired_offers=desired, pool=pool, outbox=outbox)
+            # Puntualidad: demora de cada horario atendido respecto de su hora programada
+            if offers_created:
+                published_at = clock.now()
+                for slot in due_slots[-min(offers_created, len(due_slots)):]:
+                    SLOT_DELAY_SECONDS.observe((published_at - slot).total_seconds())
+            offers_today += offers_created
+            last_scheduled_time = due_slots[-1]
+            logger.info(f"[PROGRESO] Ofertas creadas hoy: {offers_today}/{DESIRED_OFFERS_PER_DAY}")
+            save_state(last_date, offers_today, last_scheduled_time)
+            # Las ofertas que quedan en el outbox se reintentan por su cuenta; el resto, con un nuevo horario
+            outbox_retry_at = schedule_outbox_retry(scheduler, outbox, outbox_retry_at)
+            missing = desired - offers_created - len(outbox)
+            if missing > 0:
+                schedule_retries(scheduler, now, missing)
+        due_slots = []
+
+        if offers_today >= DESIRED_OFFERS_PER_DAY:
+            logger.info(f"[SISTEMA] Completadas todas las ofertas del día ({offers_today}). Pausando hasta el próximo día.")
+
+def log_day_plan(slots: List[datetime], offers_today: int):
+    """Informa los horarios de publicación pendientes del día."""
+    if not slots:
+        logger.info(f"[PROGRAMACION] No hay más publicaciones programadas para hoy ({offers_today}/{DESIRED_OFFERS_PER_DAY}).")
+        return
+    logger.info(f"[PROGRAMACION] Horarios pendientes: {', '.join(slot.strftime('%H:%M') for slot in slots)}")
+
+def schedule_retries(scheduler: EventScheduler, now: datetime, count: int):
+    """Reprograma las publicaciones fallidas dentro del horario de publicación."""
+    retry_time = now + timedelta(minutes=SLOT_RETRY_MINUTES)
+    end_time = datetime.combine(now.date(), datetime_time(hour=END_HOUR, minute=END_MINUTE), tzinfo=ARGENTINA_TZ)
+    if retry_time >= end_time:
+        logger.warning(f"[PROGRAMACION] No quedan horarios para reintentar {count} publicaciones (límite: {END_HOUR}:{END_MINUTE:02d})")
+        return
+    logger.info(f"[PROGRAMACION] Reintentando {count} publicaciones a las {retry_time.strftime('%H:%M')}")
+    for _ in range(count):
+        scheduler.schedule(retry_time, PUBLISH)
 
-        # Esperar antes de la próxima verificación
-        time_module.sleep(CHECK_INTERVAL_SECONDS)
+def schedule_outbox_retry(scheduler: EventScheduler, outbox: Outbox, scheduled_at: Optional[datetime]) -> Optional[datetime]:
+    """Programa el próximo reintento del outbox si hay ofertas encoladas. Devuelve el horario programado."""
+    next_retry = outbox.next_retry_at()
+    if next_retry is None:
+        return scheduled_at
+    # Nunca en el pasado: un reintento vencido se atiende en el próximo segundo
+    retry_time = max(datetime.fromtimestamp(next_retry, ARGENTINA_TZ), scheduler.clock.now() + timedelta(seconds=1))
+    if scheduled_at is not None and scheduled_at <= retry_time:
+        return scheduled_at
+    logger.info(f"[OUTBOX] {len(outbox)} ofertas encoladas; próximo reintento a las {retry_time.strftime('%H:%M:%S')}")
+    scheduler.schedule(retry_time, OUTBOX_RETRY)
+    return retry_time
 
 def run_with_restart():
     """Ejecuta main con reinicio en caso de fallo."""
@@ -165,4 +252,6 @@ def run_with_restart():
             time_module.sleep(retry_delay)
 
 if __name__ == "__main__":
+    setup_logging()
+    start_metrics_exporter()
     run_with_restart()
\ No newline at end of file
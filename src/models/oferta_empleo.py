@@ -1,10 +1,21 @@
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, Optional
 from src.config.settings import USER_ID, EMAIL_DEFAULT
+from src.utils.content_cache import content_key, get_content_cache
 from src.utils.helpers import map_category, get_logo_url, generate_link_postulacion, text_to_html
+from src.utils.metrics import MAP_SECONDS, timed
 
-def map_to_oferta_empleo(job: Dict) -> Dict:
-    """Mapea los datos de un empleo a una oferta para el backend."""
+@timed(MAP_SECONDS)
+def map_to_oferta_empleo(job: Dict, categoria: Optional[str] = None) -> Dict:
+    """Mapea los datos de un empleo a una oferta para el backend.
+
+    `categoria` es la categoría ya calculada (iter_valid_jobs categoriza la
+    página completa de una vez); sin ella se calcula aquí. El HTML, la
+    categoría y el enlace generado se toman del memo por contenido
+    (ContentCache) si el mismo empleo ya se mapeó antes.
+    """
+    cache = get_content_cache()
+    key = content_key(job)
     apply_options = job.get("apply_options", [])
     via = job.get("via", "").lower()
     known_platforms = ["linkedin", "indeed", "glassdoor", "computrabajo", "bumeran", "zonajobs", "jooble", "jobted"]
@@ -19,14 +30,17 @@ def map_to_oferta_empleo(job: Dict) -> Dict:
         forma_postulacion = "LINK" if any(platform in via for platform in known_platforms) else "MAIL"
         email_contacto = EMAIL_DEFAULT if forma_postulacion == "MAIL" else None
         if forma_postulacion == "LINK":
-            link_postulacion = generate_link_postulacion(job)
+            link_postulacion = cache.get_or_compute(key, "link", lambda: generate_link_postulacion(job))
             if link_postulacion and len(link_postulacion) > 250:
                 link_postulacion = link_postulacion[:250]  # Limitar a 250 caracteres
         else:
             link_postulacion = None
 
     # Convertir la descripción de texto plano a HTML para el editor TipTap
-    descripcion = text_to_html(job.get("description", "Sin descripción"))
+    descripcion = cache.get_or_compute(key, "html", lambda: text_to_html(job.get("description", "Sin descripción")))
+    if categoria is None:
+        categoria = cache.get_or_compute(
+            key, "categoria", lambda: map_category(job.get("title", ""), job.get("description", "")))
     
     
     # Asegurarse de que fechaCierre sea explícitamente None para que el backend no aplique una fecha por defecto
@@ -40,7 +54,7 @@ def map_to_oferta_empleo(job: Dict) -> Dict:
         "formaPostulacion": forma_postulacion,
         "emailContacto": email_contacto,
         "linkPostulacion": link_postulacion,
-        "categoria": {"id": map_category(job.get("title", ""), job.get("description", ""))},
+        "categoria": {"id": categoria},
         "logoUrl": get_logo_url(job),
         "habilitado": True
     }
\ No newline at end of file
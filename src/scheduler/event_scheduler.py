@@ -0,0 +1,124 @@
+import heapq
+import itertools
+import logging
+import time as time_module
+from datetime import date, datetime, time, timedelta
+from typing import List, NamedTuple, Optional
+from src.config.settings import (ARGENTINA_TZ, CATCH_UP_POLICY, PREFETCH_LEAD_MINUTES, SCHEDULER_MAX_SLEEP_SECONDS,
+                                 SLOT_TOLERANCE_SECONDS)
+from src.scheduler.scheduler import get_scheduled_times
+
+logger = logging.getLogger(__name__)
+
+# Tipos de evento
+PUBLISH = "publicar"
+PREFETCH = "prefetch"
+ROLLOVER = "cambio_de_dia"
+OUTBOX_RETRY = "reintento_outbox"
+
+CATCH_UP_POLICIES = ("skip", "one", "all")
+
+class ScheduledEvent(NamedTuple):
+    when: datetime
+    kind: str
+
+class SystemClock:
+    """Reloj real en hora de Argentina."""
+
+    def now(self) -> datetime:
+        return datetime.now(ARGENTINA_TZ)
+
+    def sleep(self, seconds: float) -> None:
+        time_module.sleep(seconds)
+
+class FakeClock:
+    """Reloj simulado: `sleep` avanza la hora al instante, para recorrer un día en milisegundos."""
+
+    def __init__(self, start: datetime):
+        self.current = start
+
+    def now(self) -> datetime:
+        return self.current
+
+    def sleep(self, seconds: float) -> None:
+        self.current += timedelta(seconds=seconds)
+
+class EventScheduler:
+    """Programador basado en un heap de temporizadores.
+
+    En lugar de despertar cada cierto intervalo, duerme exactamente hasta el
+    próximo evento pendiente (publicación, prefetch o cambio de día). El reloj
+    es inyectable para poder simular un día completo sin esperas reales.
+    """
+
+    def __init__(self, clock=None, max_sleep_seconds: float = SCHEDULER_MAX_SLEEP_SECONDS):
+        self.clock = clock or SystemClock()
+        self.max_sleep_seconds = max_sleep_seconds
+        self._heap = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, when: datetime, kind: str) -> None:
+        heapq.heappush(self._heap, (when.timestamp(), next(self._counter), ScheduledEvent(when, kind)))
+
+    def clear(self) -> None:
+        self._heap.clear()
+
+    def peek(self) -> Optional[ScheduledEvent]:
+        return self._heap[0][2] if self._heap else None
+
+    def wait(self) -> List[ScheduledEvent]:
+        """Duerme hasta el próximo evento y devuelve todos los eventos vencidos, en orden.
+
+        Las esperas largas se dividen en tramos de `max_sleep_seconds` para
+        tolerar saltos del reloj del sistema.
+        """
+        if not self._heap:
+            return []
+        while True:
+            delay = self._heap[0][0] - self.clock.now().timestamp()
+            if delay <= 0:
+                break
+            self.clock.sleep(min(delay, self.max_sleep_seconds))
+
+        now = self.clock.now().timestamp()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[2])
+        return due
+
+def catch_up_count(due_slots: List[datetime], now: datetime, policy: str = CATCH_UP_POLICY,
+                   tolerance_seconds: float = SLOT_TOLERANCE_SECONDS) -> int:
+    """Cantidad de ofertas a publicar para un grupo de horarios vencidos.
+
+    Un horario está a tiempo si se atiende dentro de `tolerance_seconds`; el
+    resto son horarios perdidos (por ejemplo, tras una búsqueda lenta o un
+    reinicio). Políticas:
+    - "skip": solo se publica por los horarios a tiempo.
+    - "one": se publica una sola oferta por todos los horarios vencidos.
+    - "all": se publica una oferta por cada horario vencido.
+    """
+    if policy not in CATCH_UP_POLICIES:
+        raise ValueError(f"Política de recuperación desconocida: {policy}")
+    if policy == "one":
+        return min(1, len(due_slots))
+    if policy == "skip":
+        return sum(1 for slot in due_slots if (now - slot).total_seconds() <= tolerance_seconds)
+    return len(due_slots)
+
+def plan_day(scheduler: EventScheduler, day: date, offers_today: int, now: datetime) -> List[datetime]:
+    """Programa los horarios restantes del día, sus prefetch y el cambio de día.
+
+    Devuelve los horarios de publicación programados (pueden incluir horarios ya
+    vencidos, que se resuelven con la política de recuperación).
+    """
+    slots = get_scheduled_times(day)[offers_today:]
+    for slot in slots:
+        scheduler.schedule(slot, PUBLISH)
+        prefetch_time = slot - timedelta(minutes=PREFETCH_LEAD_MINUTES)
+        if prefetch_time > now:
+            scheduler.schedule(prefetch_time, PREFETCH)
+    scheduler.schedule(datetime.combine(day + timedelta(days=1), time(), tzinfo=ARGENTINA_TZ), ROLLOVER)
+    return slots
@@ -0,0 +1,25 @@
+from datetime import date, datetime
+from typing import Dict, Iterable
+from src.config.settings import ARGENTINA_TZ
+
+class PublicationIndex:
+    """Índice de fechas de publicación agrupadas por día en hora de Argentina.
+
+    Cada fecha se convierte a día una sola vez al agregarse; el conteo de un
+    día se responde en tiempo constante.
+    """
+
+    def __init__(self, timestamps: Iterable[float] = ()):
+        # día -> cantidad de ofertas
+        self._days: Dict[date, int] = {}
+        for timestamp in timestamps:
+            self.add(timestamp)
+
+    def add(self, timestamp: float) -> None:
+        """Registra una publicación a partir de su epoch."""
+        day = datetime.fromtimestamp(timestamp, ARGENTINA_TZ).date()
+        self._days[day] = self._days.get(day, 0) + 1
+
+    def count_on(self, day: date) -> int:
+        """Cantidad de ofertas publicadas en el día."""
+        return self._days.get(day, 0)
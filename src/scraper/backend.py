@@ -1,29 +1,121 @@
 import json
+import logging
 import requests
-from typing import List, Dict
+from typing import Callable, Iterator, List, Dict, Optional, Sequence, Tuple, Union
 from datetime import datetime
-from src.config.settings import BASE_API_URL, SPRING_BOOT_API, ARGENTINA_TZ, MAX_PAGES
-from src.utils.logging import setup_logging
+from concurrent.futures import ThreadPoolExecutor
+from src.config.settings import (BASE_API_URL, BACKEND_BATCH_URL, BACKEND_PAGE_PARAM, BACKEND_PAGE_SIZE,
+                                 BACKEND_PUBLISH_CONCURRENCY, BACKEND_SIZE_PARAM, BACKEND_SINCE_PARAM,
+                                 BACKEND_STREAM_CHUNK_BYTES, SPRING_BOOT_API, ARGENTINA_TZ)
+from src.scraper.http_client import get_http_client
+from src.utils.json_stream import iter_json_array
 from src.models.oferta_empleo import map_to_oferta_empleo
-from src.utils.helpers import is_duplicate, is_blacklisted_source
+from src.utils.blacklist import get_blacklist
+from src.utils.helpers import DuplicateIndex, OfferRecord, is_duplicate, map_categories
+from src.utils.metrics import BACKEND_SEND_SECONDS, BACKEND_SENDS, CATEGORIZE_SECONDS, JOBS_FILTERED, OFFERS_PUBLISHED, timed
 from src.scheduler.scheduler import get_next_scheduled_time
-from src.scraper.serpapi import scrape_google_jobs
+from src.scraper.search import ConcurrentJobSearch, job_identity
+from src.scraper.candidate_pool import CandidatePool
+from src.scraper.outbox import Outbox
+from src.scraper.query_planner import get_query_planner
+from src.scraper.serpapi_budget import get_serpapi_budget
+from src.scraper.serpapi_cache import get_serpapi_cache
 
-logger = setup_logging()
+logger = logging.getLogger(__name__)
+
+# Campos de las ofertas del backend que usan la deduplicación y la programación
+OFFER_FIELDS = ("titulo", "empresaConsultora", "fechaPublicacion")
+
+class ListingValidators:
+    """Validadores HTTP (ETag y Last-Modified) del listado de ofertas.
+
+    Se envían como If-None-Match / If-Modified-Since y se actualizan con cada
+    respuesta. Si el backend responde 304, `not_modified` queda en True y el
+    listado no se descarga.
+    """
+
+    __slots__ = ("etag", "last_modified", "not_modified")
+
+    def __init__(self, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.not_modified = False
+
+    def headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def update(self, response: requests.Response) -> None:
+        self.not_modified = response.status_code == 304
+        self.etag = response.headers.get("ETag", self.etag)
+        self.last_modified = response.headers.get("Last-Modified", self.last_modified)
+
+def iter_offers_since(since: Optional[str] = None, fields: Optional[Sequence[str]] = OFFER_FIELDS,
+                      validators: Optional[ListingValidators] = None) -> Iterator[Dict]:
+    """Recorre las ofertas del backend, opcionalmente solo las publicadas desde `since`.
+
+    La respuesta se procesa a medida que llega y cada oferta se reduce a
+    `fields`, así la memoria no crece con el tamaño de las descripciones. Si
+    BACKEND_PAGE_SIZE está configurado se recorren las páginas del endpoint
+    (arreglos u objetos con "content", como los Page de Spring).
+
+    El filtro solo se envía si BACKEND_SINCE_PARAM está configurado; quien llama
+    debe tolerar que el backend lo ignore. Con `validators` la consulta es
+    condicional: si el listado no cambió (304) no se recorre ninguna oferta.
+    Las consultas paginadas no son condicionales. Propaga los errores de red,
+    HTTP y de formato (ValueError).
+    """
+    params = {BACKEND_SINCE_PARAM: since} if since and BACKEND_SINCE_PARAM else {}
+    if BACKEND_PAGE_SIZE <= 0:
+        headers = validators.headers() if validators is not None else {}
+        with get_http_client().get(f"{BASE_API_URL}", endpoint="backend_get", params=params or None,
+                                   headers=headers or None, stream=True) as response:
+            response.raise_for_status()
+            if validators is not None:
+                validators.update(response)
+                if validators.not_modified:
+                    return
+            yield from iter_json_array(response.iter_content(chunk_size=BACKEND_STREAM_CHUNK_BYTES), fields,
+                                       encoding=response.encoding or "utf-8")
+        return
+
+    page = 0
+    while True:
+        page_params = dict(params, **{BACKEND_PAGE_PARAM: page, BACKEND_SIZE_PARAM: BACKEND_PAGE_SIZE})
+        response = get_http_client().get(f"{BASE_API_URL}", endpoint="backend_get", params=page_params)
+        response.raise_for_status()
+        body = response.json()
+        content = body.get("content", []) if isinstance(body, dict) else body
+        for offer in content:
+            yield {field: offer.get(field) for field in fields} if fields is not None else offer
+        last = body.get("last") if isinstance(body, dict) else None
+        if last or (last is None and len(content) < BACKEND_PAGE_SIZE):
+            return
+        page += 1
+
+def fetch_offers_since(since: Optional[str] = None, fields: Optional[Sequence[str]] = OFFER_FIELDS) -> List[Dict]:
+    """Consulta las ofertas del backend (ver iter_offers_since) y las devuelve en una lista."""
+    return list(iter_offers_since(since, fields))
 
 def fetch_existing_offers() -> List[Dict]:
     """Consulta las ofertas existentes en el backend."""
     try:
-        response = requests.get(f"{BASE_API_URL}", timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return fetch_offers_since()
     except requests.exceptions.HTTPError as e:
         logger.error(f"[API] Error HTTP al consultar ofertas existentes: {e}")
         return []
     except requests.exceptions.RequestException as e:
         logger.error(f"[API] Error de red al consultar ofertas existentes: {e}")
         return []
+    except ValueError as e:
+        logger.error(f"[API] Respuesta inválida al consultar ofertas existentes: {e}")
+        return []
 
+@timed(BACKEND_SEND_SECONDS)
 def send_to_backend(oferta: Dict) -> bool:
     """Envía una oferta al backend."""
     # Asegurarse de que fechaCierre sea null en el JSON
@@ -35,145 +127,364 @@ def send_to_backend(oferta: Dict) -> bool:
     try:
         # Convertir a JSON manualmente para asegurar que None se convierta a null
         oferta_json = json.dumps(oferta)
-        response = requests.post(SPRING_BOOT_API, headers=headers, json={"oferta": oferta_json}, timeout=10)
+        response = get_http_client().post(SPRING_BOOT_API, endpoint="backend_post", headers=headers, json={"oferta": oferta_json})
         response.raise_for_status()
         logger.info(f"[API] Oferta creada: {oferta['titulo']}")
+        BACKEND_SENDS.inc(resultado="ok")
         return True
     except requests.exceptions.HTTPError as e:
         logger.error(f"[API] Error HTTP al enviar oferta '{oferta['titulo']}': {response.status_code} - {response.text}")
+        BACKEND_SENDS.inc(resultado="error")
         return False
     except requests.exceptions.RequestException as e:
         logger.error(f"[API] Error de red al enviar oferta '{oferta['titulo']}': {e}")
+        BACKEND_SENDS.inc(resultado="error")
         return False
 
-def create_offer(existing_offers: List[Dict], desired_offers: int = 1) -> int:
-    """Crea una oferta y la envía al backend. Devuelve el número de ofertas creadas."""
-    offers_created = 0
-    page_count = 0
-    next_token = None
-    # Contador para rastrear cuántas ofertas válidas encontramos en la página actual
-    valid_offers_in_current_page = 0
-    # Contador para rastrear cuántas páginas consecutivas sin ofertas válidas
-    consecutive_pages_without_valid_offers = 0
-    # Máximo de páginas consecutivas sin ofertas válidas antes de cambiar de filtro
-    # Aumentado para explorar más páginas antes de cambiar de filtro
+def send_batch_to_backend(ofertas: List[Dict]) -> Optional[List[bool]]:
+    """Envía varias ofertas en un solo pedido al endpoint de lote (BACKEND_BATCH_URL).
+
+    Devuelve el resultado por oferta, tomado de la lista de booleanos que
+    responde el backend, o None si el envío falló o la respuesta no trae un
+    resultado por oferta. En ese caso el lote pudo aplicarse en parte: no se
+    sabe qué ofertas se crearon.
+    """
+    headers = {"Content-Type": "application/json"}
+    try:
+        response = get_http_client().post(BACKEND_BATCH_URL, endpoint="backend_post", headers=headers,
+                                          json={"ofertas": [json.dumps(oferta) for oferta in ofertas]})
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.error(f"[API] Error al enviar lote de {len(ofertas)} ofertas: {e}")
+        return None
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    if not isinstance(body, list) or len(body) != len(ofertas):
+        logger.error(f"[API] El lote de {len(ofertas)} ofertas respondió sin un resultado por oferta")
+        return None
+    results = [bool(ok) for ok in body]
+    for oferta, ok in zip(ofertas, results):
+        if ok:
+            logger.info(f"[API] Oferta creada: {oferta['titulo']}")
+        else:
+            logger.error(f"[API] El backend rechazó la oferta '{oferta['titulo']}' del lote")
+        BACKEND_SENDS.inc(resultado="ok" if ok else "error")
+    return results
+
+def _send_each(ofertas: List[Dict], max_workers: int) -> List[bool]:
+    """Envía las ofertas una por una, en paralelo con hasta `max_workers` pedidos simultáneos."""
+    if len(ofertas) <= 1 or max_workers <= 1:
+        return [send_to_backend(oferta) for oferta in ofertas]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(ofertas)), thread_name_prefix="publicar") as executor:
+        return list(executor.map(send_to_backend, ofertas))
+
+def publish_offers(ofertas: List[Dict], max_workers: int = BACKEND_PUBLISH_CONCURRENCY,
+                   published_in_backend: Optional[Callable[[List[Dict]], List[bool]]] = None) -> List[bool]:
+    """Publica varias ofertas a la vez. Devuelve el resultado de cada una, en el mismo orden.
+
+    Usa el endpoint de lote si está configurado; si no, envía las ofertas en
+    paralelo con hasta `max_workers` pedidos simultáneos, de modo que publicar
+    N ofertas cuesta aproximadamente lo que un POST. Si el lote falla o no
+    confirma cada oferta, `published_in_backend(ofertas)` indica cuáles ya
+    figuran en el backend y solo se reenvían las demás.
+    """
+    if not ofertas:
+        return []
+    results = [False] * len(ofertas)
+    if BACKEND_BATCH_URL and len(ofertas) > 1:
+        batch_results = send_batch_to_backend(ofertas)
+        if batch_results is not None:
+            return batch_results
+        if published_in_backend is not None:
+            results = published_in_backend(ofertas)
+            for oferta, ok in zip(ofertas, results):
+                if ok:
+                    logger.info(f"[API] La oferta '{oferta['titulo']}' del lote ya figura en el backend")
+                    BACKEND_SENDS.inc(resultado="ok")
+    pending = [i for i, ok in enumerate(results) if not ok]
+    for i, ok in zip(pending, _send_each([ofertas[i] for i in pending], max_workers)):
+        results[i] = ok
+    return results
+
+def iter_valid_jobs(duplicate_index: DuplicateIndex) -> Iterator[Tuple[Dict, str]]:
+    """Recorre las búsquedas de SerpApi y devuelve, a medida que aparecen, los empleos válidos.
+
+    Un empleo es válido si no proviene de una fuente bloqueada y no está
+    duplicado. Las consultas de todas las variantes y filtros de fecha se
+    lanzan en tandas (ver ConcurrentJobSearch) en el orden que decide el
+    QueryPlanner, y los resultados de cada página se le informan antes de
+    entregarlos. La búsqueda se detiene cuando quien consume deja de pedir
+    empleos o cuando no quedan páginas por consultar.
+
+    Cada empleo se entrega junto con su categoría, calculada para toda la
+    página de una vez (ver map_categories); el empleo no se modifica.
+    """
+    # Máximo de páginas consecutivas sin ofertas válidas antes de abandonar un filtro
     max_consecutive_pages_without_valid_offers = 5
-    
-    # Lista de filtros de fecha en orden de prioridad (según las opciones reales de Google Jobs)
-    # Priorizar primero "ayer" y luego "últimos 3 días" como solicitó el usuario
-    date_filters = ["date_posted:yesterday", "date_posted:3days", "date_posted:week", None]
-    current_filter_index = 0  # Comenzamos con "date_posted:yesterday"
-    
-    # Número de variantes de consulta disponibles (definido en serpapi.py)
-    num_query_variants = 3  # "empleos puerto madryn", "trabajo puerto madryn", "ofertas laborales puerto madryn"
-
-    while offers_created < desired_offers and page_count < MAX_PAGES:
-        # Obtener el filtro actual
-        current_filter = date_filters[current_filter_index]
-        
-        # Variable para rastrear la variante de consulta actual
-        query_variant_attempts = 0
-        current_query_variant = 0
-        
-        # Bucle para probar todas las variantes de consulta antes de cambiar de filtro
-        while query_variant_attempts < num_query_variants:
-            # Obtener empleos con el filtro actual y la variante de consulta actual
-            jobs, next_token, current_query_variant = scrape_google_jobs(
-                next_page_token=next_token, 
-                date_filter=current_filter,
-                query_variant=current_query_variant
-            )
-            
-            # Si encontramos empleos, salir del bucle de variantes
-            if jobs:
-                break
-                
-            # Si no encontramos empleos, probar con la siguiente variante
-            query_variant_attempts += 1
-            current_query_variant = (current_query_variant + 1) % num_query_variants
-            logger.info(f"[BUSQUEDA] Probando variante de consulta {current_query_variant+1}/{num_query_variants} para filtro '{current_filter}'")
-            next_token = None  # Reiniciar token de página al cambiar de variante
-        
-        # Si después de probar todas las variantes no hay resultados, cambiar de filtro
-        if not jobs:
-            logger.info(f"[BUSQUEDA] No hay empleos con filtro '{current_filter}' en ninguna variante de consulta. Cambiando al siguiente filtro.")
-            # Reiniciar el token de página y cambiar a un filtro menos restrictivo
-            next_token = None
-            page_count = 0
-            current_filter_index = (current_filter_index + 1) % len(date_filters)
-            consecutive_pages_without_valid_offers = 0
-            continue
+    consecutive_pages_without_valid_offers = {}
+    seen_jobs = set()
+    planner = get_query_planner()
 
-        logger.info(f"[BUSQUEDA] Encontrados {len(jobs)} empleos con filtro '{current_filter}' (página {page_count})")
-        valid_offers_in_current_page = 0
+    try:
+        with ConcurrentJobSearch(planner=planner) as search:
+            while not search.done():
+                # Sin créditos solo pueden responder las consultas en caché; sin caché no tiene sentido seguir
+                if get_serpapi_cache() is None and get_serpapi_budget().exhausted():
+                    logger.warning("[PRESUPUESTO] Créditos de SerpApi agotados. Se suspende la búsqueda.")
+                    return
+                wave_valid = 0
+                for task, jobs in search.next_wave():
+                    current_filter = task.date_filter
+                    arm = (task.filter_index, task.query_variant)
+                    if not jobs:
+                        logger.info(f"[BUSQUEDA] Sin empleos con filtro '{current_filter}' (variante {task.query_variant + 1}, página {task.page})")
+                        # Sin créditos (o en modo solo caché) una página vacía no dice nada del rendimiento
+                        cache = get_serpapi_cache()
+                        if not get_serpapi_budget().exhausted() and not (cache is not None and cache.cache_only):
+                            planner.record(arm, jobs=0, valid=0, duplicates=0, blacklisted=0)
+                        continue
 
-        for job in jobs:
-            if offers_created >= desired_offers:
-                break
+                    logger.info(f"[BUSQUEDA] Encontrados {len(jobs)} empleos con filtro '{current_filter}' (variante {task.query_variant + 1}, página {task.page})")
 
-            # Verificar si la oferta es de una fuente no deseada
-            if is_blacklisted_source(job):
-                # El logging ahora se hace dentro de is_blacklisted_source
-                continue
+                    # Clasificar la página completa para que el planificador vea su rendimiento real
+                    unseen_jobs = []
+                    duplicates = 0
+                    for job in jobs:
+                        # El mismo empleo suele aparecer en varias variantes y filtros
+                        identity = job_identity(job)
+                        if identity in seen_jobs:
+                            duplicates += 1
+                            continue
+                        seen_jobs.add(identity)
+                        unseen_jobs.append(job)
 
-            # Verificar si la oferta ya existe
-            if is_duplicate(job, existing_offers):
-                logger.info(f"[FILTRO] Oferta duplicada: '{job.get('title', '')}' - {job.get('company_name', '')}")
-                continue
-                
-            # Logging para ofertas válidas encontradas
-            logger.info(f"[VÁLIDA] Oferta aceptada: '{job.get('title', '')}' - {job.get('company_name', '')}")
-            
-            # Mostrar el objeto completo de SerpAPI para depuración
-            logger.info(f"[SERPAPI OBJETO] {json.dumps(job, indent=2, ensure_ascii=False)}")
-
-            # Si llegamos aquí, la oferta es válida
-            valid_offers_in_current_page += 1
-            
-            oferta = map_to_oferta_empleo(job)
-            logger.info(f"[OFERTA] Procesando: '{oferta['titulo']}' (Categoría: {oferta['categoria']['id']})")
-            
-            if send_to_backend(oferta):
-                offers_created += 1
-                existing_offers.append({
-                    "titulo": oferta["titulo"],
-                    "empresaConsultora": oferta["empresaConsultora"],
-                    "fechaPublicacion": oferta["fechaPublicacion"]
-                })
-                logger.info(f"[PROGRESO] Ofertas creadas: {offers_created}/{desired_offers}")
-                
-                # Calcular y mostrar la hora de la próxima publicación
-                now = datetime.now(ARGENTINA_TZ)
-                next_scheduled_time = get_next_scheduled_time(now, offers_created)
-                if next_scheduled_time:
-                    logger.info(f"[PROGRAMACION] Próxima publicación: {next_scheduled_time.strftime('%H:%M:%S')}")
-                else:
-                    logger.info("[PROGRAMACION] No hay más publicaciones programadas para hoy.")
-
-        # Actualizar contadores para la lógica de cambio de filtro
-        if valid_offers_in_current_page == 0:
-            consecutive_pages_without_valid_offers += 1
+                    # Descartar de una vez las ofertas de fuentes no deseadas de la página
+                    candidates, rejected = get_blacklist().filter_page(unseen_jobs)
+                    for job, reason in rejected:
+                        logger.info(f"[FILTRO] Fuente no deseada ({reason}): '{job.get('title', '')}' - {job.get('company_name', '')}")
+                    blacklisted = len(rejected)
+
+                    valid_jobs = []
+                    for job in candidates:
+                        # Verificar si la oferta ya existe
+                        if is_duplicate(job, duplicate_index):
+                            logger.info(f"[FILTRO] Oferta duplicada: '{job.get('title', '')}' - {job.get('company_name', '')}")
+                            duplicates += 1
+                            continue
+                        valid_jobs.append(job)
+                    planner.record(arm, jobs=len(jobs), valid=len(valid_jobs), duplicates=duplicates,
+                                   blacklisted=blacklisted)
+                    wave_valid += len(valid_jobs)
+                    JOBS_FILTERED.inc(len(valid_jobs), resultado="valido")
+                    JOBS_FILTERED.inc(duplicates, resultado="duplicado")
+                    JOBS_FILTERED.inc(blacklisted, resultado="bloqueado")
+                    # Categorizar en lote las válidas de la página (ver map_categories)
+                    with CATEGORIZE_SECONDS.time():
+                        categorias = map_categories(valid_jobs)
+
+                    for index, (job, categoria) in enumerate(zip(valid_jobs, categorias)):
+                        # Lo publicado mientras se consumía la página puede volver duplicado al resto
+                        if index and is_duplicate(job, duplicate_index):
+                            continue
+
+                        # Logging para ofertas válidas encontradas
+                        logger.info(f"[VÁLIDA] Oferta aceptada: '{job.get('title', '')}' - {job.get('company_name', '')}")
+
+                        # Mostrar el objeto completo de SerpAPI para depuración (solo se serializa con DEBUG)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"[SERPAPI OBJETO] {json.dumps(job, indent=2, ensure_ascii=False)}")
+
+                        yield job, categoria
+
+                    # Si hemos pasado demasiadas páginas sin ofertas válidas, abandonar el filtro
+                    if valid_jobs:
+                        consecutive_pages_without_valid_offers[task.filter_index] = 0
+                        continue
+                    misses = consecutive_pages_without_valid_offers.get(task.filter_index, 0) + 1
+                    consecutive_pages_without_valid_offers[task.filter_index] = misses
+                    if misses >= max_consecutive_pages_without_valid_offers:
+                        logger.info(f"[BUSQUEDA] Sin ofertas válidas en {misses} páginas con filtro '{current_filter}'. Cambiando filtro.")
+                        search.drop_filter(task.filter_index)
+                search.report(wave_valid)
+    finally:
+        planner.save()
+
+    logger.warning("[BUSQUEDA] No quedan páginas por consultar.")
+
+def _register_published(oferta: Dict, existing_offers: Optional[List[OfferRecord]], duplicate_index: DuplicateIndex) -> None:
+    """Registra una oferta ya publicada en las ofertas existentes."""
+    record = duplicate_index.add(oferta)
+    if existing_offers is not None:
+        existing_offers.append(record)
+    get_serpapi_budget().record_published()
+    OFFERS_PUBLISHED.inc()
+
+def _publish_batch(ofertas: List[Dict], existing_offers: Optional[List[OfferRecord]],
+                   duplicate_index: DuplicateIndex) -> List[bool]:
+    """Publica un lote de ofertas mapeadas y registra las que se crearon."""
+
+    def published_in_backend(pending: List[Dict]) -> List[bool]:
+        # El lote pudo aplicarse en parte: se incorporan las ofertas del backend antes de reenviar
+        duplicate_index.refresh()
+        return [duplicate_index.contains_offer(oferta) for oferta in pending]
+
+    results = publish_offers(ofertas, published_in_backend=published_in_backend)
+    for oferta, ok in zip(ofertas, results):
+        if ok:
+            _register_published(oferta, existing_offers, duplicate_index)
+    return results
+
+def publish_outbox(outbox: Outbox, existing_offers: Union[List[OfferRecord], DuplicateIndex], limit: int,
+                   due_only: bool = True) -> Tuple[int, int]:
+    """Reintenta publicar hasta `limit` ofertas de la cola. Devuelve (publicadas, fallidas).
+
+    Antes de reenviar se verifica que la oferta no esté ya en el backend: un
+    timeout puede ocurrir después de que el backend la haya creado.
+    """
+    if isinstance(existing_offers, DuplicateIndex):
+        duplicate_index, existing_offers = existing_offers, None
+    else:
+        duplicate_index = DuplicateIndex(existing_offers)
+
+    batch = []
+    for key, oferta in outbox.pending(limit, due_only=due_only):
+        if duplicate_index.contains_offer(oferta):
+            logger.info(f"[OUTBOX] La oferta '{oferta['titulo']}' ya figura en el backend. Se quita de la cola.")
+            outbox.mark_published(key)
+            continue
+        oferta["fechaPublicacion"] = datetime.now().isoformat()
+        batch.append((key, oferta))
+    if not batch:
+        return 0, 0
+
+    logger.info(f"[OUTBOX] Reintentando publicar {len(batch)} ofertas encoladas")
+    published = failed = 0
+    for (key, oferta), ok in zip(batch, _publish_batch([oferta for _, oferta in batch], existing_offers, duplicate_index)):
+        if ok:
+            outbox.mark_published(key)
+            published += 1
         else:
-            consecutive_pages_without_valid_offers = 0
-
-        # Si hemos pasado demasiadas páginas sin ofertas válidas, cambiar de filtro
-        if consecutive_pages_without_valid_offers >= max_consecutive_pages_without_valid_offers:
-            logger.info(f"[BUSQUEDA] Sin ofertas válidas en {consecutive_pages_without_valid_offers} páginas con filtro '{current_filter}'. Cambiando filtro.")
-            next_token = None
-            page_count = 0
-            current_filter_index = (current_filter_index + 1) % len(date_filters)
-            consecutive_pages_without_valid_offers = 0
+            outbox.mark_failed(key)
+            failed += 1
+    return published, failed
+
+def _next_candidates(jobs: Iterator[Tuple[Dict, str]], count: int, batch_index: DuplicateIndex) -> List[Dict]:
+    """Toma hasta `count` empleos válidos y los mapea, sin repetir ofertas dentro del lote."""
+    batch = []
+    for job, categoria in jobs:
+        # Las ofertas del lote aún no están en el índice de duplicados
+        if batch_index.contains(job):
             continue
+        oferta = map_to_oferta_empleo(job, categoria)
+        logger.info(f"[OFERTA] Procesando: '{oferta['titulo']}' (Categoría: {oferta['categoria']['id']})")
+        batch_index.add(oferta)
+        batch.append(oferta)
+        if len(batch) >= count:
+            break
+    return batch
+
+def _log_progress(offers_created: int, desired_offers: int):
+    logger.info(f"[PROGRESO] Ofertas creadas: {offers_created}/{desired_offers}")
+    
+    # Calcular y mostrar la hora de la próxima publicación
+    now = datetime.now(ARGENTINA_TZ)
+    next_scheduled_time = get_next_scheduled_time(now, offers_created)
+    if next_scheduled_time:
+        logger.info(f"[PROGRAMACION] Próxima publicación: {next_scheduled_time.strftime('%H:%M:%S')}")
+    else:
+        logger.info("[PROGRAMACION] No hay más publicaciones programadas para hoy.")
+
+def create_offer(existing_offers: Union[List[OfferRecord], DuplicateIndex], desired_offers: int = 1,
+                 pool: Optional[CandidatePool] = None, outbox: Optional[Outbox] = None) -> int:
+    """Crea ofertas y las envía al backend. Devuelve el número de ofertas creadas.
 
-        page_count += 1
+    Acepta la lista de ofertas existentes (dicts del backend u OfferRecord) o
+    un DuplicateIndex ya construido; las ofertas publicadas se agregan como
+    OfferRecord a la lista, o al índice recibido. El
+    orden de origen es: ofertas encoladas en `outbox` tras un envío fallido,
+    reserva de candidatas y, si no alcanzan, búsqueda en SerpApi. Las ofertas
+    de cada lote se publican en paralelo (ver publish_offers).
 
-        # Si no hay más páginas disponibles con este filtro, cambiar al siguiente
-        if not next_token:
-            logger.info(f"[BUSQUEDA] Fin de resultados con filtro '{current_filter}'. Cambiando al siguiente filtro.")
-            page_count = 0
-            current_filter_index = (current_filter_index + 1) % len(date_filters)
-            consecutive_pages_without_valid_offers = 0
+    Con `outbox`, las ofertas que no se pudieron publicar se encolan para
+    reintentarlas y no se sigue buscando: mientras el backend falle, buscar
+    reemplazos solo gasta créditos de SerpApi.
+    """
+    if isinstance(existing_offers, DuplicateIndex):
+        duplicate_index = existing_offers
+        existing_offers = None
+    else:
+        duplicate_index = DuplicateIndex(existing_offers)
+    offers_created = 0
+    backend_failed = False
+
+    if outbox is not None:
+        published, failed = publish_outbox(outbox, existing_offers if existing_offers is not None else duplicate_index,
+                                           desired_offers, due_only=False)
+        for _ in range(published):
+            offers_created += 1
+            _log_progress(offers_created, desired_offers)
+        backend_failed = failed > 0
+
+    if pool is not None and not backend_failed:
+        batch = []
+        while len(batch) < desired_offers - offers_created:
+            oferta = pool.pop()
+            if oferta is None:
+                break
+            # La reserva pudo quedar desactualizada desde el prefetch
+            if duplicate_index.contains_offer(oferta):
+                logger.info(f"[POOL] Oferta de la reserva ya publicada: '{oferta['titulo']}'")
+                continue
+            oferta["fechaPublicacion"] = datetime.now().isoformat()
+            logger.info(f"[OFERTA] Publicando desde la reserva: '{oferta['titulo']}' (Categoría: {oferta['categoria']['id']})")
+            batch.append(oferta)
+        for oferta, ok in zip(batch, _publish_batch(batch, existing_offers, duplicate_index)):
+            if ok:
+                offers_created += 1
+                _log_progress(offers_created, desired_offers)
+            elif outbox is not None:
+                outbox.enqueue(oferta)
+                backend_failed = True
+            else:
+                pool.push_front(oferta)
 
+    if offers_created < desired_offers and not backend_failed:
+        jobs = iter_valid_jobs(duplicate_index)
+        batch_index = DuplicateIndex()
+        try:
+            while offers_created < desired_offers and not backend_failed:
+                batch = _next_candidates(jobs, desired_offers - offers_created, batch_index)
+                if not batch:
+                    break
+                for oferta, ok in zip(batch, _publish_batch(batch, existing_offers, duplicate_index)):
+                    if ok:
+                        offers_created += 1
+                        _log_progress(offers_created, desired_offers)
+                    elif outbox is not None:
+                        outbox.enqueue(oferta)
+                        backend_failed = True
+        finally:
+            jobs.close()
+
+    if backend_failed:
+        logger.warning(f"[OUTBOX] Falló la publicación en el backend; {len(outbox)} ofertas quedan encoladas para reintentar.")
     if offers_created < desired_offers:
         logger.warning(f"[RESUMEN] Se crearon {offers_created}/{desired_offers} ofertas solicitadas.")
-    return offers_created
\ No newline at end of file
+    return offers_created
+
+def fill_pool(duplicate_index: DuplicateIndex, pool: CandidatePool) -> int:
+    """Completa la reserva de candidatas con ofertas válidas y mapeadas. Devuelve cuántas agregó."""
+    pool.prune()
+    if pool.is_full():
+        return 0
+    added = 0
+    for job, categoria in iter_valid_jobs(duplicate_index):
+        oferta = map_to_oferta_empleo(job, categoria)
+        if pool.add(oferta):
+            added += 1
+            logger.info(f"[POOL] Candidata reservada: '{oferta['titulo']}' ({len(pool)}/{pool.max_size})")
+        if pool.is_full():
+            break
+    return added
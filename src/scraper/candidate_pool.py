@@ -0,0 +1,86 @@
+import json
+import logging
+import time as time_module
+from typing import Dict, List, Optional
+from src.config.settings import CANDIDATE_POOL_FILE, CANDIDATE_POOL_SIZE, CANDIDATE_MAX_AGE_HOURS
+from src.utils.helpers import normalize_company, normalize_title
+
+logger = logging.getLogger(__name__)
+
+def candidate_key(oferta: Dict) -> str:
+    """Clave de deduplicación de una oferta mapeada (empresa y título normalizados)."""
+    return f"{normalize_company(oferta.get('empresaConsultora') or '')}|{normalize_title(oferta.get('titulo') or '')}"
+
+class CandidatePool:
+    """Reserva acotada de ofertas ya validadas y mapeadas, lista para publicar.
+
+    Se llena antes de cada horario de publicación para que, llegado el momento,
+    publicar sea un único POST. Las entradas vencen por antigüedad, no se
+    repiten por empresa y título, y se guardan en disco para sobrevivir a
+    reinicios.
+    """
+
+    def __init__(self, path: str = CANDIDATE_POOL_FILE, max_size: int = CANDIDATE_POOL_SIZE,
+                 max_age_hours: float = CANDIDATE_MAX_AGE_HOURS):
+        self.path = path
+        self.max_size = max_size
+        self.max_age_seconds = max_age_hours * 3600
+        self._entries: List[Dict] = []
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._entries = []
+        self.prune()
+
+    def save(self) -> None:
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+        except OSError as e:
+            logger.error(f"[POOL] Error al guardar la reserva de ofertas: {e}")
+
+    def prune(self) -> int:
+        """Descarta las entradas vencidas. Devuelve cuántas se descartaron."""
+        limit = time_module.time() - self.max_age_seconds
+        before = len(self._entries)
+        self._entries = [entry for entry in self._entries if entry["agregada"] >= limit]
+        expired = before - len(self._entries)
+        if expired:
+            logger.info(f"[POOL] Se descartaron {expired} ofertas vencidas de la reserva")
+        return expired
+
+    def is_full(self) -> bool:
+        return len(self._entries) >= self.max_size
+
+    def contains(self, oferta: Dict) -> bool:
+        key = candidate_key(oferta)
+        return any(entry["clave"] == key for entry in self._entries)
+
+    def add(self, oferta: Dict) -> bool:
+        """Agrega una oferta mapeada si hay lugar y no está repetida."""
+        if self.is_full() or self.contains(oferta):
+            return False
+        self._entries.append({"clave": candidate_key(oferta), "agregada": time_module.time(), "oferta": oferta})
+        self.save()
+        return True
+
+    def pop(self) -> Optional[Dict]:
+        """Saca la oferta más antigua que siga vigente."""
+        self.prune()
+        if not self._entries:
+            return None
+        entry = self._entries.pop(0)
+        self.save()
+        return entry["oferta"]
+
+    def push_front(self, oferta: Dict) -> None:
+        """Devuelve una oferta a la reserva (por ejemplo, si falló su publicación)."""
+        self._entries.insert(0, {"clave": candidate_key(oferta), "agregada": time_module.time(), "oferta": oferta})
+        self.save()
@@ -0,0 +1,73 @@
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.config.settings import (HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR,
+                                 HTTP_TIMEOUTS)
+from src.utils.metrics import HTTP_REQUEST_SECONDS, HTTP_RETRIES
+
+# Errores transitorios que justifican reintentar un pedido
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+class HttpClient:
+    """Cliente HTTP compartido por SerpApi y el backend.
+
+    Mantiene una sesión con conexiones keep-alive agrupadas por host, reintentos
+    con espera exponencial (solo para métodos idempotentes ante errores de
+    estado; los errores de conexión se reintentan siempre) y un timeout por
+    endpoint lógico ("serpapi", "backend_get", "backend_post").
+    """
+
+    def __init__(self, pool_connections: int = HTTP_POOL_CONNECTIONS, pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 max_retries: int = HTTP_MAX_RETRIES, backoff_factor: float = HTTP_BACKOFF_FACTOR,
+                 timeouts: Optional[Dict[str, float]] = None, session: Optional[requests.Session] = None):
+        self.timeouts = dict(HTTP_TIMEOUTS, **(timeouts or {}))
+        self.session = session or requests.Session()
+        retry = Retry(total=max_retries, backoff_factor=backoff_factor, status_forcelist=RETRY_STATUS_CODES,
+                      allowed_methods=frozenset(["GET", "HEAD"]), raise_on_status=False,
+                      respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _timeout(self, endpoint: str) -> float:
+        return self.timeouts.get(endpoint, self.timeouts["default"])
+
+    @staticmethod
+    def _count_retries(response: requests.Response, endpoint: str) -> None:
+        retries = getattr(response.raw, "retries", None)
+        if retries is not None and retries.history:
+            HTTP_RETRIES.inc(len(retries.history), endpoint=endpoint)
+
+    def get(self, url: str, endpoint: str = "default", **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self._timeout(endpoint))
+        with HTTP_REQUEST_SECONDS.time(endpoint=endpoint):
+            response = self.session.get(url, **kwargs)
+        self._count_retries(response, endpoint)
+        return response
+
+    def post(self, url: str, endpoint: str = "default", **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self._timeout(endpoint))
+        with HTTP_REQUEST_SECONDS.time(endpoint=endpoint):
+            response = self.session.post(url, **kwargs)
+        self._count_retries(response, endpoint)
+        return response
+
+    def close(self) -> None:
+        self.session.close()
+
+_client: Optional[HttpClient] = None
+
+def get_http_client() -> HttpClient:
+    """Devuelve el cliente HTTP compartido, creándolo la primera vez."""
+    global _client
+    if _client is None:
+        _client = HttpClient()
+    return _client
+
+def set_http_client(client: Optional[HttpClient]) -> None:
+    """Reemplaza el cliente compartido (por ejemplo, por uno apuntado a un servidor local de pruebas)."""
+    global _client
+    if _client is not None and _client is not client:
+        _client.close()
+    _client = client
@@ -0,0 +1,326 @@
+import hashlib
+import logging
+import sqlite3
+import time as time_module
+from array import array
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import requests
+from src.config.settings import (BACKEND_SINCE_FORMAT, BACKEND_SINCE_PARAM, OFFER_STORE_PATH,
+                                 OFFER_STORE_FULL_SYNC_HOURS, OFFER_STORE_UNFILTERED_SYNC_MINUTES)
+from src.scheduler.publication_index import PublicationIndex
+from src.scraper.backend import OFFER_FIELDS, ListingValidators, iter_offers_since
+from src.utils.helpers import OfferRecord, normalize_company, normalize_title, parse_fecha_publicacion
+from src.utils.minhash import NearDuplicateIndex
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ofertas (
+    fingerprint TEXT PRIMARY KEY,
+    titulo TEXT NOT NULL,
+    empresa_consultora TEXT NOT NULL,
+    empresa_normalizada TEXT NOT NULL,
+    fecha_publicacion REAL NOT NULL,
+    firma BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_ofertas_empresa ON ofertas (empresa_normalizada);
+CREATE INDEX IF NOT EXISTS idx_ofertas_fecha ON ofertas (fecha_publicacion);
+CREATE TABLE IF NOT EXISTS sync_estado (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+"""
+
+# Cambia cuando cambia el cálculo de offer_fingerprint; las réplicas con otra versión se resincronizan
+FINGERPRINT_VERSION = "2"
+
+def offer_fingerprint(offer: Dict, published: Optional[float] = None) -> str:
+    """Huella estable de una oferta a partir de empresa, título y fecha de publicación.
+
+    La fecha entra como epoch truncado a segundos (`published`, o la
+    fechaPublicacion convertida), así la misma oferta da la misma huella
+    aunque el backend cambie el formato de la fecha (zona, microsegundos).
+    """
+    if published is None:
+        try:
+            published = parse_fecha_publicacion(offer["fechaPublicacion"])
+        except (KeyError, TypeError, ValueError):
+            published = None
+    key = "\x1f".join((normalize_company(offer.get("empresaConsultora") or ""),
+                       normalize_title(offer.get("titulo") or ""),
+                       str(int(published)) if published is not None else ""))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+def _signature_from_blob(blob: Optional[bytes]) -> Optional[array]:
+    if blob is None:
+        return None
+    signature = array('I')
+    signature.frombytes(blob)
+    return signature
+
+class OfferStore:
+    """Réplica local en SQLite de las ofertas del backend.
+
+    Guarda solo la proyección que usan la deduplicación y la programación
+    (título, empresa, fecha de publicación, huella y firma MinHash) con índices
+    por empresa y por fecha. La sincronización es incremental a partir de la
+    fecha de la oferta más reciente recibida del backend (`marca_backend` en
+    `sync_estado`; las que registra el script con `add` no la mueven), con una
+    resincronización completa como respaldo. Las ofertas del backend se procesan en streaming: nunca se
+    tiene la respuesta completa en memoria. Las fechas de publicación se mantienen además en un
+    PublicationIndex para que el ciclo principal consulte las ofertas del día
+    sin tocar la base.
+
+    La sincronización incremental es una consulta condicional (ETag /
+    Last-Modified guardados en `sync_estado`): si el backend no cambió, cuesta
+    una respuesta 304. Si el backend no admite el filtro por fecha
+    (BACKEND_SINCE_PARAM) ni envía validadores, cada sincronización descarga el
+    listado completo; en ese caso se sincroniza como mucho cada
+    `unfiltered_interval` segundos. `generation` aumenta con cada resincronización completa
+    para que quien mantenga estructuras derivadas sepa que debe recargarlas.
+    """
+
+    def __init__(self, path: str = OFFER_STORE_PATH, signer: Optional[NearDuplicateIndex] = None,
+                 fetcher: Callable[..., Iterable[Dict]] = iter_offers_since,
+                 unfiltered_interval: float = OFFER_STORE_UNFILTERED_SYNC_MINUTES * 60):
+        """`fetcher(since, fields, validators)` recorre las ofertas del backend (ver iter_offers_since)."""
+        self.path = path
+        self.signer = signer
+        self.fetcher = fetcher
+        self.unfiltered_interval = unfiltered_interval
+        # Momento (monotónico) de la última sincronización que descargó el listado completo sin filtro
+        self._unfiltered_synced_at: Optional[float] = None
+        self._warned_unfiltered = False
+        # La descripción solo hace falta para calcular la firma; se descarta al guardar
+        self.fields = OFFER_FIELDS + ("descripcion",) if signer is not None else OFFER_FIELDS
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self.generation = 0
+        self._check_stored_params()
+        self._load_publications()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM ofertas").fetchone()[0]
+
+    def _load_publications(self) -> None:
+        self.publications = PublicationIndex(row[0] for row in self._conn.execute("SELECT fecha_publicacion FROM ofertas"))
+
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT valor FROM sync_estado WHERE clave = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO sync_estado (clave, valor) VALUES (?, ?)", (key, value))
+
+    def _check_stored_params(self) -> None:
+        """Descarta la réplica si sus firmas MinHash o sus huellas se calcularon de otra forma."""
+        params = self.signer.params_key if self.signer is not None else ""
+        stored = self._get_state("firma_params")
+        if stored is not None and stored != params:
+            logger.info("[STORE] Cambiaron los parámetros de firma. Se forzará una resincronización completa.")
+            self._clear()
+        elif self._get_state("huella_version") != FINGERPRINT_VERSION and len(self):
+            logger.info("[STORE] Cambió el cálculo de las huellas. Se forzará una resincronización completa.")
+            self._clear()
+        with self._conn:
+            self._set_state("firma_params", params)
+            self._set_state("huella_version", FINGERPRINT_VERSION)
+
+    def _clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM ofertas")
+            self._conn.execute("DELETE FROM sync_estado")
+
+    def _row(self, offer: Dict, signature: Optional[array] = None) -> Optional[tuple]:
+        try:
+            published = parse_fecha_publicacion(offer["fechaPublicacion"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"[STORE] Oferta sin fecha de publicación válida: '{offer.get('titulo', '')}'")
+            return None
+        if signature is None and self.signer is not None:
+            signature = self.signer.offer_signature(offer)
+        return (offer_fingerprint(offer, published), offer.get("titulo") or "", offer.get("empresaConsultora") or "",
+                normalize_company(offer.get("empresaConsultora") or ""), published,
+                signature.tobytes() if signature is not None else None)
+
+    def _insert(self, offers: Iterable[Dict]) -> Tuple[int, Optional[float]]:
+        """Guarda las ofertas del backend. Devuelve las filas nuevas y la fecha de publicación más reciente recibida."""
+        latest = None
+
+        def rows() -> Iterator[tuple]:
+            nonlocal latest
+            for row in (self._row(offer) for offer in offers):
+                if row is not None:
+                    latest = row[4] if latest is None else max(latest, row[4])
+                    yield row
+
+        before = self._conn.total_changes
+        self._conn.executemany("INSERT OR IGNORE INTO ofertas VALUES (?, ?, ?, ?, ?, ?)", rows())
+        return self._conn.total_changes - before, latest
+
+    def add(self, offer: Dict, signature: Optional[array] = None) -> bool:
+        """Registra una oferta publicada por el script. Devuelve False si ya estaba (misma huella) o no tiene fecha."""
+        row = self._row(offer, signature)
+        if row is None:
+            return False
+        with self._conn:
+            inserted = self._conn.execute("INSERT OR IGNORE INTO ofertas VALUES (?, ?, ?, ?, ?, ?)", row).rowcount
+        if inserted:
+            self.publications.add(row[4])
+        return bool(inserted)
+
+    def last_rowid(self) -> int:
+        """Marca de la última fila guardada; ver rows_after."""
+        return self._conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM ofertas").fetchone()[0]
+
+    def rows_after(self, rowid: int) -> Iterator[Tuple[OfferRecord, Optional[array]]]:
+        """Registros y firmas de las ofertas guardadas después de la marca `rowid`."""
+        for company, title, published, blob in self._conn.execute(
+                "SELECT empresa_normalizada, titulo, fecha_publicacion, firma FROM ofertas WHERE rowid > ? ORDER BY rowid",
+                (rowid,)):
+            yield OfferRecord(company, normalize_title(title), published), _signature_from_blob(blob)
+
+    def _load_validators(self) -> ListingValidators:
+        return ListingValidators(self._get_state("etag"), self._get_state("last_modified"))
+
+    def _save_validators(self, validators: ListingValidators) -> None:
+        for key, value in (("etag", validators.etag), ("last_modified", validators.last_modified)):
+            if value:
+                self._set_state(key, value)
+            else:
+                self._conn.execute("DELETE FROM sync_estado WHERE clave = ?", (key,))
+
+    def high_water_mark(self) -> Optional[float]:
+        """Fecha de publicación (epoch) de la oferta más reciente recibida del backend.
+
+        No se toma de la tabla: las ofertas que registra el script con `add` pueden
+        ser más nuevas que otras ya cargadas en el backend y todavía no recibidas.
+        """
+        value = self._get_state("marca_backend")
+        return float(value) if value is not None else None
+
+    def sync(self, full: bool = False) -> int:
+        """Sincroniza la réplica con el backend. Devuelve la cantidad de ofertas nuevas.
+
+        Usa la sincronización incremental salvo que se pida una completa, la réplica
+        esté vacía o la última resincronización completa sea más antigua que
+        OFFER_STORE_FULL_SYNC_HOURS. Si el backend no filtra ni envía validadores
+        y la última descarga fue hace menos de `unfiltered_interval`, no consulta.
+        """
+        high_water_mark = self.high_water_mark()
+        last_full_sync = float(self._get_state("ultima_sincronizacion_completa") or 0)
+        if full or high_water_mark is None or time_module.time() - last_full_sync > OFFER_STORE_FULL_SYNC_HOURS * 3600:
+            return self._sync_full()
+        if self._unfiltered_synced_at is not None and \
+                time_module.monotonic() - self._unfiltered_synced_at < self.unfiltered_interval:
+            logger.debug("[STORE] Sincronización omitida: el backend solo devuelve el listado completo")
+            return 0
+
+        # En hora local, como las fechas sin zona del backend (ver parse_fecha_publicacion). Truncada a
+        # segundos: las ofertas de ese mismo segundo vuelven a llegar y se descartan por su huella
+        since = datetime.fromtimestamp(high_water_mark).astimezone().strftime(BACKEND_SINCE_FORMAT)
+        stored = len(self)
+        mark = self.last_rowid()
+        validators = self._load_validators()
+        counts = {"anteriores": 0, "conocidas": 0}
+        latest = high_water_mark
+
+        def unknown_offers() -> Iterator[Dict]:
+            nonlocal latest
+            for offer in self.fetcher(since, self.fields, validators):
+                try:
+                    published = parse_fecha_publicacion(offer["fechaPublicacion"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                # La marca avanza también con las ofertas ya guardadas (p. ej. las que registró `add`)
+                latest = max(latest, published)
+                # Anterior al segundo de `since`: el backend ignoró el filtro
+                if published < int(high_water_mark):
+                    counts["anteriores"] += 1
+                if self._contains(offer_fingerprint(offer, published)):
+                    counts["conocidas"] += 1
+                else:
+                    yield offer
+
+        try:
+            with self._conn:
+                new_offers, _ = self._insert(unknown_offers())
+                if latest > high_water_mark:
+                    self._set_state("marca_backend", repr(latest))
+                self._save_validators(validators)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"[STORE] Error al sincronizar ofertas desde {since}: {e}")
+            return 0
+        except sqlite3.Error as e:
+            logger.error(f"[STORE] Error en la sincronización incremental: {e}. Resincronizando.")
+            return self._sync_full()
+
+        # Si el backend ignoró el filtro, devolvió el listado completo: las ofertas de la
+        # réplica que no volvieron a llegar se dieron de baja y se resincroniza todo
+        if counts["anteriores"] and counts["conocidas"] < stored:
+            logger.info("[STORE] El backend tiene menos ofertas que la réplica. Resincronizando.")
+            return self._sync_full()
+        if validators.not_modified:
+            logger.debug("[STORE] Sin cambios en el backend desde la última sincronización")
+            return 0
+        self._check_unfiltered(validators)
+        for record, _ in self.rows_after(mark):
+            self.publications.add(record.publicada)
+
+        logger.info(f"[STORE] Sincronización incremental: {new_offers} ofertas nuevas (total {len(self)})")
+        return new_offers
+
+    def _check_unfiltered(self, validators: ListingValidators) -> None:
+        """Registra si la sincronización descargó el listado completo por no tener filtro ni validadores."""
+        if BACKEND_SINCE_PARAM or validators.etag or validators.last_modified:
+            self._unfiltered_synced_at = None
+            return
+        self._unfiltered_synced_at = time_module.monotonic()
+        if not self._warned_unfiltered:
+            self._warned_unfiltered = True
+            logger.warning(f"[STORE] El backend no admite filtro por fecha (BACKEND_SINCE_PARAM) ni envía "
+                           f"ETag/Last-Modified: cada sincronización descarga el listado completo. Se "
+                           f"sincronizará como mucho cada {self.unfiltered_interval / 60:.0f} minutos.")
+
+    def _contains(self, fingerprint: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM ofertas WHERE fingerprint = ?", (fingerprint,)).fetchone() is not None
+
+    def _sync_full(self) -> int:
+        """Reemplaza la réplica con el listado completo. Ante un error se conserva la réplica anterior."""
+        validators = ListingValidators()
+        try:
+            with self._conn:
+                self._conn.execute("DELETE FROM ofertas")
+                inserted, latest = self._insert(self.fetcher(None, self.fields, validators))
+                if latest is not None:
+                    self._set_state("marca_backend", repr(latest))
+                else:
+                    self._conn.execute("DELETE FROM sync_estado WHERE clave = 'marca_backend'")
+                self._set_state("ultima_sincronizacion_completa", str(time_module.time()))
+                self._save_validators(validators)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"[STORE] Error en la resincronización completa: {e}. Se mantiene la réplica local.")
+            return 0
+        self._check_unfiltered(validators)
+        self.generation += 1
+        self._load_publications()
+        logger.info(f"[STORE] Resincronización completa: {inserted} ofertas")
+        return inserted
+
+    def records_for_company(self, company: str) -> List[OfferRecord]:
+        """Registros compactos de las ofertas de una empresa (ya normalizada)."""
+        return [OfferRecord(company, normalize_title(title), published) for title, published in self._conn.execute(
+            "SELECT titulo, fecha_publicacion FROM ofertas WHERE empresa_normalizada = ?", (company,))]
+
+    def iter_signatures(self) -> Iterator[array]:
+        """Recorre las firmas MinHash guardadas."""
+        for (blob,) in self._conn.execute("SELECT firma FROM ofertas WHERE firma IS NOT NULL"):
+            yield _signature_from_blob(blob)
+
+    def count_published_on(self, day: date) -> int:
+        """Cantidad de ofertas publicadas en un día (hora de Argentina)."""
+        return self.publications.count_on(day)
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import time as time_module
+from typing import Callable, Dict, List, Optional, Tuple
+from src.config.settings import OUTBOX_PATH, OUTBOX_BACKOFF_BASE_SECONDS, OUTBOX_BACKOFF_MAX_SECONDS, OUTBOX_MAX_AGE_HOURS
+from src.utils.helpers import normalize_company, normalize_title
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pendientes (
+    clave TEXT PRIMARY KEY,
+    oferta TEXT NOT NULL,
+    creada REAL NOT NULL,
+    intentos INTEGER NOT NULL DEFAULT 0,
+    proximo_intento REAL NOT NULL,
+    ultimo_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pendientes_proximo ON pendientes (proximo_intento);
+"""
+
+def idempotency_key(oferta: Dict) -> str:
+    """Clave de idempotencia de una oferta mapeada: título, empresa y día de publicación."""
+    day = (oferta.get("fechaPublicacion") or "")[:10]
+    raw = f"{normalize_title(oferta.get('titulo') or '')}|{normalize_company(oferta.get('empresaConsultora') or '')}|{day}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class Outbox:
+    """Cola persistente (SQLite) de ofertas mapeadas cuya publicación falló.
+
+    Cada oferta se guarda una sola vez por clave de idempotencia y se
+    reintenta con espera exponencial (`backoff_base` · 2^intentos, hasta
+    `backoff_max`). Las ofertas más viejas que `max_age_hours` se descartan:
+    ya no tiene sentido publicarlas. El reloj (epoch) es inyectable para que
+    los reintentos sigan al reloj del programador.
+    """
+
+    def __init__(self, path: str = OUTBOX_PATH, backoff_base: float = OUTBOX_BACKOFF_BASE_SECONDS,
+                 backoff_max: float = OUTBOX_BACKOFF_MAX_SECONDS, max_age_hours: float = OUTBOX_MAX_AGE_HOURS,
+                 clock: Callable[[], float] = time_module.time):
+        self.path = path
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_age_seconds = max_age_hours * 3600
+        self.clock = clock
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM pendientes").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def enqueue(self, oferta: Dict, error: str = "") -> bool:
+        """Encola una oferta para reintentar. Devuelve False si ya estaba encolada."""
+        now = self.clock()
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO pendientes (clave, oferta, creada, intentos, proximo_intento, ultimo_error) "
+                "VALUES (?, ?, ?, 1, ?, ?)",
+                (idempotency_key(oferta), json.dumps(oferta, ensure_ascii=False), now, now + self.backoff_base, error))
+        if cursor.rowcount:
+            logger.info(f"[OUTBOX] Oferta encolada para reintentar: '{oferta.get('titulo')}'")
+        return bool(cursor.rowcount)
+
+    def prune(self) -> int:
+        """Descarta las ofertas vencidas. Devuelve cuántas se descartaron."""
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM pendientes WHERE creada < ?",
+                                        (self.clock() - self.max_age_seconds,))
+        if cursor.rowcount:
+            logger.warning(f"[OUTBOX] Se descartaron {cursor.rowcount} ofertas vencidas sin poder publicarlas")
+        return cursor.rowcount
+
+    def pending(self, limit: int, due_only: bool = True) -> List[Tuple[str, Dict]]:
+        """Ofertas a reintentar, las más antiguas primero. Con `due_only=False` ignora la espera."""
+        self.prune()
+        query = "SELECT clave, oferta FROM pendientes"
+        params: tuple = ()
+        if due_only:
+            query += " WHERE proximo_intento <= ?"
+            params = (self.clock(),)
+        rows = self._conn.execute(query + " ORDER BY creada LIMIT ?", params + (limit,)).fetchall()
+        return [(key, json.loads(oferta)) for key, oferta in rows]
+
+    def mark_published(self, key: str) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM pendientes WHERE clave = ?", (key,))
+
+    def mark_failed(self, key: str, error: str = "") -> None:
+        """Registra un intento fallido y programa el próximo con espera exponencial."""
+        row = self._conn.execute("SELECT intentos FROM pendientes WHERE clave = ?", (key,)).fetchone()
+        if row is None:
+            return
+        delay = min(self.backoff_max, self.backoff_base * 2 ** row[0])
+        with self._conn:
+            self._conn.execute("UPDATE pendientes SET intentos = intentos + 1, proximo_intento = ?, ultimo_error = ? "
+                               "WHERE clave = ?", (self.clock() + delay, error, key))
+
+    def next_retry_at(self) -> Optional[float]:
+        """Momento (epoch) del próximo reintento, o None si la cola está vacía."""
+        return self._conn.execute("SELECT MIN(proximo_intento) FROM pendientes").fetchone()[0]
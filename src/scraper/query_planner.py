@@ -0,0 +1,153 @@
+import json
+import logging
+import math
+import random
+import threading
+from typing import Dict, List, Optional, Tuple
+from src.config.settings import (QUERY_PLANNER_DECAY, QUERY_PLANNER_FILE, QUERY_PLANNER_EXPLORATION,
+                                 QUERY_PLANNER_MIN_CALLS, QUERY_PLANNER_MIN_YIELD, QUERY_PLANNER_RETRY_RATE)
+
+logger = logging.getLogger(__name__)
+
+# Un brazo es una combinación (índice de filtro de fecha, variante de consulta)
+Arm = Tuple[int, int]
+
+_COUNTERS = ("consultas", "empleos", "validas", "duplicadas", "bloqueadas")
+
+def _arm_key(arm: Arm) -> str:
+    return f"{arm[0]}|{arm[1]}"
+
+class QueryPlanner:
+    """Planificador adaptativo de consultas a SerpApi.
+
+    Lleva, por cada combinación de filtro de fecha y variante de consulta, las
+    consultas hechas, los empleos obtenidos y cuántos resultaron válidos,
+    duplicados o bloqueados. Con esas estadísticas ordena la búsqueda con una
+    política UCB (rendimiento observado de ofertas válidas por consulta más un
+    bono de exploración) y poda las combinaciones que, con suficiente
+    evidencia, rinden por debajo de `min_yield`.
+
+    La poda no es definitiva: cada consulta multiplica los contadores
+    anteriores de su combinación por `decay`, así que pesan más los
+    resultados recientes, y cada combinación podada se vuelve a probar al
+    final del plan con probabilidad `retry_rate`. Si la prueba da ofertas
+    válidas, la combinación recupera su lugar en los planes siguientes.
+
+    Sin historial todas las combinaciones tienen el mismo puntaje y se
+    conserva el orden por defecto (filtro de fecha y luego variante).
+    """
+
+    def __init__(self, path: Optional[str] = QUERY_PLANNER_FILE, exploration: float = QUERY_PLANNER_EXPLORATION,
+                 min_calls: int = QUERY_PLANNER_MIN_CALLS, min_yield: float = QUERY_PLANNER_MIN_YIELD,
+                 decay: float = QUERY_PLANNER_DECAY, retry_rate: float = QUERY_PLANNER_RETRY_RATE,
+                 rng: Optional[random.Random] = None):
+        if not 0 < decay <= 1:
+            raise ValueError(f"El factor de olvido debe estar entre 0 y 1: {decay}")
+        if not 0 <= retry_rate <= 1:
+            raise ValueError(f"La probabilidad de reintento debe estar entre 0 y 1: {retry_rate}")
+        self.path = path
+        self.exploration = exploration
+        self.min_calls = min_calls
+        self.min_yield = min_yield
+        self.decay = decay
+        self.retry_rate = retry_rate
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            try:
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(self.stats, f, indent=2)
+            except OSError as e:
+                logger.error(f"[PLANIFICADOR] Error al guardar las estadísticas de consultas: {e}")
+
+    def record(self, arm: Arm, jobs: int, valid: int, duplicates: int, blacklisted: int) -> None:
+        """Registra el resultado de una consulta (una página) de un brazo."""
+        with self._lock:
+            entry = self.stats.setdefault(_arm_key(arm), dict.fromkeys(_COUNTERS, 0))
+            for counter, value in zip(_COUNTERS, (1, jobs, valid, duplicates, blacklisted)):
+                entry[counter] = entry[counter] * self.decay + value
+
+    def _counts(self, arm: Arm) -> Dict[str, float]:
+        return self.stats.get(_arm_key(arm)) or dict.fromkeys(_COUNTERS, 0)
+
+    def mean_yield(self, arm: Arm) -> float:
+        """Ofertas válidas por consulta, suavizado con una consulta previa de rendimiento 1."""
+        counts = self._counts(arm)
+        return (counts["validas"] + 1) / (counts["consultas"] + 1)
+
+    def _bonus(self, arm: Arm, total_calls: int) -> float:
+        return self.exploration * math.sqrt(math.log(total_calls + 1) / (self._counts(arm)["consultas"] + 1))
+
+    def is_pruned(self, arm: Arm) -> bool:
+        """Indica si el brazo rinde por debajo de `min_yield` con al menos `min_calls` consultas."""
+        return self._counts(arm)["consultas"] >= self.min_calls and self.mean_yield(arm) < self.min_yield
+
+    def plan(self, arms: List[Arm]) -> List[Arm]:
+        """Ordena los brazos por puntaje UCB y descarta los de bajo rendimiento comprobado.
+
+        `arms` debe venir en el orden por defecto, que se usa para desempatar.
+        Los brazos podados que salen sorteados para reintentarse van al final.
+        Siempre queda al menos un brazo: si todos están podados y ninguno sale
+        sorteado, se consulta el de mejor rendimiento observado.
+        """
+        with self._lock:
+            total_calls = sum(self._counts(arm)["consultas"] for arm in arms)
+            scored = []
+            for position, arm in enumerate(arms):
+                mean = self.mean_yield(arm)
+                upper = mean + self._bonus(arm, total_calls)
+                scored.append((-upper, position, arm, mean))
+        scored.sort()
+
+        planned, retried, pruned = [], [], []
+        for _, position, arm, mean in scored:
+            if not self.is_pruned(arm):
+                planned.append(arm)
+                continue
+            calls = self._counts(arm)["consultas"]
+            if self._rng.random() < self.retry_rate:
+                logger.info(f"[PLANIFICADOR] Se vuelve a probar filtro {arm[0]} / variante {arm[1] + 1}: "
+                            f"{mean:.2f} válidas por consulta en {calls:.0f} consultas")
+                retried.append(arm)
+                continue
+            logger.info(f"[PLANIFICADOR] Se omite filtro {arm[0]} / variante {arm[1] + 1}: "
+                        f"{mean:.2f} válidas por consulta en {calls:.0f} consultas")
+            pruned.append((-mean, position, arm))
+        if not planned and not retried:
+            return [min(pruned)[2]]
+        return planned + retried
+
+    def summary(self) -> List[Tuple[Arm, Dict[str, float]]]:
+        with self._lock:
+            return [(tuple(int(part) for part in key.split("|")), dict(counts)) for key, counts in self.stats.items()]
+
+_planner: Optional[QueryPlanner] = None
+_planner_lock = threading.Lock()
+
+def get_query_planner() -> QueryPlanner:
+    """Devuelve el planificador compartido, creándolo la primera vez."""
+    global _planner
+    with _planner_lock:
+        if _planner is None:
+            _planner = QueryPlanner()
+        return _planner
+
+def set_query_planner(planner: Optional[QueryPlanner]) -> None:
+    """Reemplaza el planificador compartido."""
+    global _planner
+    with _planner_lock:
+        _planner = planner
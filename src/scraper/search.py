@@ -0,0 +1,95 @@
+import heapq
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from src.config.settings import MAX_PAGES, SERPAPI_MAX_CONCURRENCY
+from src.scraper.query_planner import QueryPlanner
+from src.scraper.serpapi import BASE_QUERIES, DATE_FILTERS, scrape_google_jobs
+from src.utils.helpers import normalize_company, normalize_title
+
+logger = logging.getLogger(__name__)
+
+class SearchTask(NamedTuple):
+    # El orden de los campos define la prioridad: grupo, página y posición en el plan.
+    # Con el plan por defecto, el grupo es el filtro de fecha y la posición sigue a la variante.
+    group: int
+    page: int
+    rank: int
+    filter_index: int
+    query_variant: int
+    date_filter: Optional[str]
+    next_page_token: Optional[str]
+
+def job_identity(job: Dict) -> str:
+    """Identidad de un empleo para unificar resultados de distintas consultas."""
+    if job.get("job_id"):
+        return job["job_id"]
+    return f"{normalize_company(job.get('company_name', ''))}|{normalize_title(job.get('title', ''))}"
+
+class ConcurrentJobSearch:
+    """Búsqueda concurrente sobre la grilla de filtros de fecha × variantes de consulta.
+
+    Las consultas pendientes se ordenan por prioridad y se ejecutan en tandas.
+    Cada pedido cuesta un crédito aunque sus empleos no se lleguen a usar, así
+    que la primera tanda es de una sola consulta y el ancho se duplica (hasta
+    `max_concurrency`) solo mientras las tandas anteriores no dieron empleos
+    válidos; una tanda con empleos válidos lo vuelve a 1 (ver report). Cada tanda devuelve sus
+    resultados en orden de prioridad. Sin planificador se conserva el orden
+    ayer → 3 días → semana → sin filtro al elegir candidatas; con un
+    QueryPlanner las combinaciones se recorren en el orden que él decida, en
+    grupos del tamaño de la cantidad de variantes y página por página dentro
+    de cada grupo. Con `max_concurrency` mayor que 1, el peor caso cuesta unas
+    pocas tandas en lugar de una docena de pedidos seguidos.
+    """
+
+    def __init__(self, date_filters: List[Optional[str]] = DATE_FILTERS, query_variants: int = len(BASE_QUERIES),
+                 max_concurrency: int = SERPAPI_MAX_CONCURRENCY, max_pages: int = MAX_PAGES,
+                 fetch: Callable = scrape_google_jobs, planner: Optional[QueryPlanner] = None):
+        self.date_filters = date_filters
+        self.max_concurrency = max(1, max_concurrency)
+        self._wave_size = 1
+        self.max_pages = max_pages
+        self.fetch = fetch
+        arms = [(filter_index, variant) for filter_index in range(len(date_filters)) for variant in range(query_variants)]
+        if planner is not None:
+            arms = planner.plan(arms)
+        self._pending = [SearchTask(rank // query_variants, 0, rank, filter_index, variant, date_filters[filter_index], None)
+                         for rank, (filter_index, variant) in enumerate(arms)]
+        heapq.heapify(self._pending)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="serpapi")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def done(self) -> bool:
+        return not self._pending
+
+    def drop_filter(self, filter_index: int) -> None:
+        """Descarta las consultas pendientes de un filtro de fecha."""
+        self._pending = [task for task in self._pending if task.filter_index != filter_index]
+        heapq.heapify(self._pending)
+
+    def report(self, valid: int) -> None:
+        """Informa cuántos empleos válidos dio la última tanda, para decidir el ancho de la siguiente."""
+        self._wave_size = 1 if valid else min(self._wave_size * 2, self.max_concurrency)
+
+    def _run(self, task: SearchTask) -> Tuple[List[Dict], Optional[str]]:
+        jobs, next_token, _ = self.fetch(next_page_token=task.next_page_token, date_filter=task.date_filter,
+                                         query_variant=task.query_variant)
+        return jobs, next_token
+
+    def next_wave(self) -> List[Tuple[SearchTask, List[Dict]]]:
+        """Ejecuta la próxima tanda de consultas y devuelve (consulta, empleos) en orden de prioridad."""
+        wave = [heapq.heappop(self._pending) for _ in range(min(self._wave_size, len(self._pending)))]
+        results = []
+        for task, (jobs, next_token) in zip(wave, self._executor.map(self._run, wave)):
+            if next_token and task.page + 1 < self.max_pages:
+                heapq.heappush(self._pending, task._replace(page=task.page + 1, next_page_token=next_token))
+            results.append((task, jobs))
+        return results
@@ -1,31 +1,39 @@
+import logging
 import requests
 from typing import List, Dict, Tuple, Optional
-from src.config.settings import SERPAPI_KEY, MAX_PAGES
-import time as time_module
-from src.utils.logging import setup_logging
+from src.config.settings import SERPAPI_KEY, SERPAPI_URL, MAX_PAGES
+from src.scraper.http_client import get_http_client
+from src.scraper.serpapi_budget import get_serpapi_budget
+from src.scraper.serpapi_cache import get_serpapi_cache
+from src.utils.metrics import SERPAPI_PAGE_SECONDS, SERPAPI_PAGES, timed
 
-logger = setup_logging()
+logger = logging.getLogger(__name__)
 
-def scrape_google_jobs(next_page_token: Optional[str] = None, date_filter: Optional[str] = None, max_retries: int = 3, retry_delay: int = 5, query_variant: int = 0) -> Tuple[List[Dict], Optional[str], int]:
+# Consulta base - Usar variantes para capturar más resultados
+BASE_QUERIES = [
+    "empleos puerto madryn",
+    "trabajo puerto madryn",
+    "ofertas laborales puerto madryn"
+]
+
+# Lista de filtros de fecha en orden de prioridad (según las opciones reales de Google Jobs)
+# Priorizar primero "ayer" y luego "últimos 3 días"
+DATE_FILTERS = ["date_posted:yesterday", "date_posted:3days", "date_posted:week", None]
+
+@timed(SERPAPI_PAGE_SECONDS)
+def scrape_google_jobs(next_page_token: Optional[str] = None, date_filter: Optional[str] = None, query_variant: int = 0) -> Tuple[List[Dict], Optional[str], int]:
     """Obtiene empleos de SerpApi, priorizando los más recientes.
     
     Args:
         next_page_token: Token para paginación de resultados
         date_filter: Filtro de fecha (yesterday, 3days, week)
-        max_retries: Número máximo de reintentos
-        retry_delay: Tiempo de espera entre reintentos
         query_variant: Índice de la variante de consulta a usar (0-2)
         
     Returns:
         Tuple con: lista de empleos, token para siguiente página, y variante de consulta usada
     """
-    # Consulta base - Usar variantes para capturar más resultados
-    base_queries = [
-        "empleos puerto madryn",
-        "trabajo puerto madryn",
-        "ofertas laborales puerto madryn"
-    ]
-    
+    base_queries = BASE_QUERIES
+
     # Asegurarse de que el índice de variante sea válido
     if query_variant >= len(base_queries):
         query_variant = 0
@@ -64,36 +72,51 @@ def scrape_google_jobs(next_page_token: Optional[str] = None, date_filter: Optio
     if next_page_token:
         base_params["next_page_token"] = next_page_token
         
-    # Intentar obtener resultados
+    cache = get_serpapi_cache()
+
+    # Intentar obtener resultados (los reintentos con espera exponencial los hace el cliente HTTP)
     while page_count < MAX_PAGES:
-        for attempt in range(max_retries):
-            try:
-                response = requests.get("https://serpapi.com/search", params=base_params, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                jobs = data.get("jobs_results", [])
-                next_token = data.get("serpapi_pagination", {}).get("next_page_token")
+        try:
+            data = cache.get(base_params, date_filter) if cache is not None else None
+            if data is None:
+                if cache is not None and cache.cache_only:
+                    logger.info(f"[CACHE] Consulta '{filter_desc}' (página {page_count}) no está en caché (modo solo caché)")
+                    return [], None, query_variant
+                if not get_serpapi_budget().acquire():
+                    # Sin créditos, una respuesta vencida de la caché sirve más que omitir la consulta
+                    data = cache.get(base_params, date_filter, allow_stale=True) if cache is not None else None
+                    if data is None:
+                        logger.warning(f"[PRESUPUESTO] Créditos de SerpApi agotados: se omite la consulta '{filter_desc}' (página {page_count})")
+                        return [], None, query_variant
+                    logger.info(f"[SERPAPI] Créditos agotados: se usa la respuesta vencida en caché de '{filter_desc}' (página {page_count})")
+                    SERPAPI_PAGES.inc(origen="cache")
+                else:
+                    response = get_http_client().get(SERPAPI_URL, endpoint="serpapi", params=base_params)
+                    response.raise_for_status()
+                    data = response.json()
+                    SERPAPI_PAGES.inc(origen="red")
+                    if cache is not None:
+                        cache.put(base_params, date_filter, data)
+            else:
+                SERPAPI_PAGES.inc(origen="cache")
+            jobs = data.get("jobs_results", [])
+            next_token = data.get("serpapi_pagination", {}).get("next_page_token")
+            
+            if jobs:
+                logger.info(f"[SERPAPI] Consulta '{filter_desc}': {len(jobs)} empleos encontrados (página {page_count})")
+                return jobs, next_token, query_variant
                 
-                if jobs:
-                    logger.info(f"[SERPAPI] Consulta '{filter_desc}': {len(jobs)} empleos encontrados (página {page_count})")
-                    return jobs, next_token, query_variant
-                    
-                logger.info(f"[SERPAPI] No se encontraron empleos para '{filter_desc}' (página {page_count})")
-                break
-            except requests.exceptions.HTTPError as e:
-                logger.error(f"[SERPAPI] Error HTTP en consulta '{filter_desc}' (pág. {page_count}): {e}. Intento {attempt + 1}/{max_retries}")
-                if response.status_code == 400:
-                    try:
-                        error_message = response.json().get("error", "No se proporcionó mensaje de error")
-                        logger.error(f"Detalles del error 400: {error_message}")
-                    except ValueError:
-                        logger.error("No se pudo obtener el mensaje de error (respuesta no es JSON).")
-                if attempt < max_retries - 1:
-                    time_module.sleep(retry_delay)
-            except requests.exceptions.RequestException as e:
-                logger.error(f"[SERPAPI] Error de red en consulta '{filter_desc}' (pág. {page_count}): {e}. Intento {attempt + 1}/{max_retries}")
-                if attempt < max_retries - 1:
-                    time_module.sleep(retry_delay)
+            logger.info(f"[SERPAPI] No se encontraron empleos para '{filter_desc}' (página {page_count})")
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"[SERPAPI] Error HTTP en consulta '{filter_desc}' (pág. {page_count}): {e}")
+            if response.status_code == 400:
+                try:
+                    error_message = response.json().get("error", "No se proporcionó mensaje de error")
+                    logger.error(f"Detalles del error 400: {error_message}")
+                except ValueError:
+                    logger.error("No se pudo obtener el mensaje de error (respuesta no es JSON).")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"[SERPAPI] Error de red en consulta '{filter_desc}' (pág. {page_count}): {e}")
 
         page_count += 1
         if not next_token:
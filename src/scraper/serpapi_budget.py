@@ -0,0 +1,146 @@
+import json
+import logging
+import threading
+import time as time_module
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from src.config.settings import (ARGENTINA_TZ, SERPAPI_BUDGET_FILE, SERPAPI_DAILY_LIMIT, SERPAPI_MONTHLY_LIMIT,
+                                 SERPAPI_RATE_PER_MINUTE)
+
+logger = logging.getLogger(__name__)
+
+class SerpApiBudget:
+    """Presupuesto de créditos de SerpApi compartido por todas las consultas.
+
+    Cada pedido pagado consume un crédito. Hay un tope diario y uno mensual
+    (0 = sin tope) que se guardan en disco para sobrevivir a reinicios, y un
+    token bucket que limita la cantidad de pedidos por minuto: si no hay
+    tokens, `acquire` espera a que se repongan. Cuando se agota un tope,
+    `acquire` devuelve False y quien llama debe usar la caché o saltear la
+    búsqueda.
+
+    `clock` y `sleep` (monotónicos) regulan el token bucket; `now` da la hora
+    de Argentina con la que se decide el cambio de día y de mes.
+    """
+
+    def __init__(self, path: str = SERPAPI_BUDGET_FILE, daily_limit: int = SERPAPI_DAILY_LIMIT,
+                 monthly_limit: int = SERPAPI_MONTHLY_LIMIT, rate_per_minute: int = SERPAPI_RATE_PER_MINUTE,
+                 clock: Callable[[], float] = time_module.monotonic, sleep: Callable[[float], None] = time_module.sleep,
+                 now: Optional[Callable[[], datetime]] = None):
+        self.path = path
+        self.daily_limit = daily_limit
+        self.monthly_limit = monthly_limit
+        self.rate_per_minute = rate_per_minute
+        self.clock = clock
+        self.sleep = sleep
+        self.now = now or (lambda: datetime.now(ARGENTINA_TZ))
+        self._lock = threading.Lock()
+        self._tokens = float(rate_per_minute)
+        self._last_refill = clock()
+        self.state = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self) -> None:
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f)
+        except OSError as e:
+            logger.error(f"[PRESUPUESTO] Error al guardar el consumo de SerpApi: {e}")
+
+    def _roll_periods(self) -> None:
+        """Reinicia los contadores al cambiar el día o el mes."""
+        now = self.now()
+        day, month = now.date().isoformat(), now.strftime("%Y-%m")
+        if self.state.get("mes") != month:
+            self.state.update(mes=month, usados_mes=0, publicadas_mes=0)
+        if self.state.get("dia") != day:
+            self.state.update(dia=day, usados_dia=0, publicadas_dia=0)
+
+    def _exhausted(self) -> bool:
+        return ((self.daily_limit > 0 and self.state["usados_dia"] >= self.daily_limit) or
+                (self.monthly_limit > 0 and self.state["usados_mes"] >= self.monthly_limit))
+
+    def exhausted(self) -> bool:
+        with self._lock:
+            self._roll_periods()
+            return self._exhausted()
+
+    def remaining_today(self) -> Optional[int]:
+        """Créditos disponibles hoy, teniendo en cuenta ambos topes (None si no hay topes)."""
+        with self._lock:
+            self._roll_periods()
+            limits = []
+            if self.daily_limit > 0:
+                limits.append(self.daily_limit - self.state["usados_dia"])
+            if self.monthly_limit > 0:
+                limits.append(self.monthly_limit - self.state["usados_mes"])
+            return max(0, min(limits)) if limits else None
+
+    def acquire(self) -> bool:
+        """Reserva un crédito para un pedido pagado. Devuelve False si se agotó el presupuesto."""
+        with self._lock:
+            self._roll_periods()
+            if self._exhausted():
+                return False
+            self.state["usados_dia"] += 1
+            self.state["usados_mes"] += 1
+            self._save()
+
+            # Token bucket: el token se reserva ya (puede quedar en negativo) y se espera fuera del lock
+            delay = 0.0
+            if self.rate_per_minute > 0:
+                now = self.clock()
+                self._tokens = min(float(self.rate_per_minute),
+                                   self._tokens + (now - self._last_refill) * self.rate_per_minute / 60)
+                self._last_refill = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    delay = -self._tokens * 60 / self.rate_per_minute
+        if delay > 0:
+            logger.info(f"[PRESUPUESTO] Límite de {self.rate_per_minute} consultas por minuto: esperando {delay:.1f}s")
+            self.sleep(delay)
+        return True
+
+    def record_published(self, count: int = 1) -> None:
+        """Registra ofertas publicadas, para medir créditos gastados por oferta."""
+        with self._lock:
+            self._roll_periods()
+            self.state["publicadas_dia"] += count
+            self.state["publicadas_mes"] += count
+            self._save()
+
+    def credits_per_offer(self, period: str = "mes") -> Optional[float]:
+        """Créditos de SerpApi consumidos por oferta publicada en el día o el mes (None si no hubo publicaciones)."""
+        with self._lock:
+            self._roll_periods()
+            published = self.state[f"publicadas_{period}"]
+            return self.state[f"usados_{period}"] / published if published else None
+
+    def log_summary(self) -> None:
+        ratio = self.credits_per_offer()
+        ratio_desc = f"{ratio:.1f} créditos por oferta" if ratio is not None else "sin ofertas publicadas"
+        logger.info(f"[PRESUPUESTO] SerpApi: {self.state.get('usados_dia', 0)}/{self.daily_limit or '∞'} créditos hoy, "
+                    f"{self.state.get('usados_mes', 0)}/{self.monthly_limit or '∞'} este mes ({ratio_desc})")
+
+_budget: Optional[SerpApiBudget] = None
+_budget_lock = threading.Lock()
+
+def get_serpapi_budget() -> SerpApiBudget:
+    """Devuelve el presupuesto compartido, creándolo la primera vez."""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            _budget = SerpApiBudget()
+        return _budget
+
+def set_serpapi_budget(budget: Optional[SerpApiBudget]) -> None:
+    """Reemplaza el presupuesto compartido (por ejemplo, por uno sin topes para pruebas)."""
+    global _budget
+    with _budget_lock:
+        _budget = budget
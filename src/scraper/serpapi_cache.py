@@ -0,0 +1,128 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time as time_module
+import zlib
+from typing import Dict, Optional
+from src.config.settings import (SERPAPI_CACHE_PATH, SERPAPI_CACHE_MAX_BYTES, SERPAPI_CACHE_TTL_HOURS,
+                                 SERPAPI_CACHE_ONLY)
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS respuestas (
+    clave TEXT PRIMARY KEY,
+    filtro TEXT,
+    creada REAL NOT NULL,
+    usada REAL NOT NULL,
+    tamano INTEGER NOT NULL,
+    cuerpo BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_respuestas_usada ON respuestas (usada);
+"""
+
+def cache_key(params: Dict) -> str:
+    """Clave de contenido de una consulta: sus parámetros (sin la API key) en forma canónica."""
+    canonical = {key: value for key, value in params.items() if key != "api_key"}
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+class SerpApiCache:
+    """Caché en disco (SQLite, JSON comprimido) de respuestas de SerpApi.
+
+    Las respuestas se guardan por el contenido de la consulta (q, filtro de
+    fecha, token de página, ...) con un TTL según el filtro de fecha y se
+    descartan las menos usadas recientemente cuando el total supera
+    `max_bytes`. En modo `cache_only` nunca se consulta la red y se ignoran
+    los TTL, lo que permite repetir un día sin conexión. Con `allow_stale`
+    también se aceptan respuestas vencidas, por ejemplo cuando se agotan los
+    créditos de SerpApi.
+    """
+
+    def __init__(self, path: str = SERPAPI_CACHE_PATH, max_bytes: int = SERPAPI_CACHE_MAX_BYTES,
+                 ttl_hours: Dict[str, float] = SERPAPI_CACHE_TTL_HOURS, cache_only: bool = SERPAPI_CACHE_ONLY):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_hours = ttl_hours
+        self.cache_only = cache_only
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stale": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _ttl_seconds(self, date_filter: Optional[str]) -> float:
+        return self.ttl_hours.get(date_filter or "none", self.ttl_hours["none"]) * 3600
+
+    def get(self, params: Dict, date_filter: Optional[str], allow_stale: bool = False) -> Optional[Dict]:
+        """Devuelve la respuesta guardada para la consulta, o None si no hay una vigente.
+
+        Con `allow_stale` devuelve también una respuesta vencida. Es una segunda
+        consulta tras un fallo, así que no cuenta como acierto ni como fallo.
+        """
+        key = cache_key(params)
+        now = time_module.time()
+        with self._lock:
+            row = self._conn.execute("SELECT creada, cuerpo FROM respuestas WHERE clave = ?", (key,)).fetchone()
+            if allow_stale:
+                if row is None:
+                    return None
+                self.stats["stale"] += 1
+            else:
+                if row is not None and not self.cache_only and now - row[0] > self._ttl_seconds(date_filter):
+                    self.stats["expired"] += 1
+                    row = None
+                if row is None:
+                    self.stats["misses"] += 1
+                    return None
+                self.stats["hits"] += 1
+            with self._conn:
+                self._conn.execute("UPDATE respuestas SET usada = ? WHERE clave = ?", (now, key))
+        return json.loads(zlib.decompress(row[1]))
+
+    def put(self, params: Dict, date_filter: Optional[str], data: Dict) -> None:
+        """Guarda una respuesta y aplica el límite de tamaño."""
+        body = zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        now = time_module.time()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO respuestas VALUES (?, ?, ?, ?, ?, ?)",
+                               (cache_key(params), date_filter or "none", now, now, len(body), body))
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(tamano), 0) FROM respuestas").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT clave, tamano FROM respuestas ORDER BY usada").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM respuestas WHERE clave = ?", (key,))
+            total -= size
+            self.stats["evictions"] += 1
+
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def log_stats(self) -> None:
+        logger.info(f"[CACHE] SerpApi: {self.stats['hits']} aciertos, {self.stats['misses']} fallos "
+                    f"({self.stats['expired']} vencidas, {self.stats['stale']} usadas sin créditos), "
+                    f"{self.stats['evictions']} descartadas, "
+                    f"tasa de acierto {self.hit_rate():.0%}")
+
+_cache: Optional[SerpApiCache] = None
+
+def get_serpapi_cache() -> Optional[SerpApiCache]:
+    """Devuelve la caché compartida, o None si está deshabilitada (SERPAPI_CACHE_PATH vacío)."""
+    global _cache
+    if _cache is None and SERPAPI_CACHE_PATH:
+        _cache = SerpApiCache()
+    return _cache
+
+def set_serpapi_cache(cache: Optional[SerpApiCache]) -> None:
+    """Reemplaza la caché compartida (por ejemplo, por una en modo solo caché)."""
+    global _cache
+    _cache = cache
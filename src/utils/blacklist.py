@@ -0,0 +1,251 @@
+import json
+import logging
+import os
+import re
+import threading
+import time as time_module
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+from src.config.settings import BLACKLIST_FILE, BLACKLIST_RELOAD_SECONDS, BLACKLISTED_SOURCES
+
+logger = logging.getLogger(__name__)
+
+class BlacklistMatch(NamedTuple):
+    """Motivo por el que se rechaza un empleo: campo revisado y fuente o patrón encontrado."""
+    field: str
+    pattern: str
+
+    def __str__(self) -> str:
+        return f"{self.field}: '{self.pattern}'"
+
+def _is_word_char(char: str) -> bool:
+    # Mismo criterio que \w en expresiones regulares sobre str
+    return char.isalnum() or char == "_"
+
+def _at_word_boundary(text: str, index: int) -> bool:
+    """Equivale a `\\b` en la posición `index` de `text`."""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+class SubstringAutomaton:
+    """Autómata de Aho-Corasick: encuentra las apariciones de un conjunto de cadenas en una sola pasada.
+
+    El costo de recorrer un texto depende de su largo, no de la cantidad de
+    cadenas buscadas.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Cadenas que terminan en cada estado (la propia y las de su enlace de falla)
+        self._output: List[Tuple[str, ...]] = [()]
+        for pattern in patterns:
+            node = 0
+            for char in pattern:
+                following = self._goto[node].get(char)
+                if following is None:
+                    following = len(self._goto)
+                    self._goto[node][char] = following
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                node = following
+            if pattern not in self._output[node]:
+                self._output[node] += (pattern,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, following in self._goto[node].items():
+                queue.append(following)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[following] = self._goto[fail].get(char, 0)
+                self._output[following] += self._output[self._fail[following]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Apariciones en `text` como (posición final, cadena), en orden de posición final."""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern in output[node]:
+                yield index + 1, pattern
+
+    def search(self, text: str) -> Optional[str]:
+        """Primera cadena del conjunto que aparece en `text`, o None."""
+        for _, pattern in self.iter_matches(text):
+            return pattern
+        return None
+
+    def search_word(self, text: str) -> Optional[str]:
+        """Primera cadena que aparece en `text` como palabra completa (`\\bcadena\\b`), o None."""
+        for end, pattern in self.iter_matches(text):
+            if _at_word_boundary(text, end) and _at_word_boundary(text, end - len(pattern)):
+                return pattern
+        return None
+
+class BlacklistMatcher:
+    """Filtro de fuentes no deseadas, compilado una sola vez.
+
+    Cada fuente bloquea un empleo si aparece en la vía, si es exactamente el
+    nombre de la empresa, si aparece en las extensiones o si está en el título
+    como palabra completa (mismas reglas que la lista fija anterior). Los
+    patrones de título son expresiones regulares adicionales (por ejemplo,
+    avisos de spam) que se buscan en el título en minúsculas. Vía,
+    extensiones y título se revisan con un solo autómata de Aho-Corasick (en
+    el título se verifica además el límite de palabra), la empresa con un
+    conjunto y los patrones con una sola expresión regular que los combina.
+    """
+
+    def __init__(self, sources: Sequence[str] = BLACKLISTED_SOURCES, title_patterns: Sequence[str] = ()):
+        sources = [self._validate(source).lower() for source in sources]
+        self.sources = list(dict.fromkeys(sources))
+        self.title_patterns = [self._validate(pattern) for pattern in title_patterns]
+        self._automaton = SubstringAutomaton(self.sources)
+        self._companies = frozenset(self.sources)
+
+        # Un grupo con nombre por patrón, para saber cuál coincidió (match.lastgroup)
+        alternatives = []
+        for index, pattern in enumerate(self.title_patterns):
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Patrón de título inválido '{pattern}': {e}")
+            alternatives.append(f"(?P<p{index}>{pattern})")
+        self._title_patterns: Optional[Pattern] = re.compile("|".join(alternatives)) if alternatives else None
+
+    @staticmethod
+    def _validate(value) -> str:
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"Entrada de lista negra inválida: {value!r}")
+        return value
+
+    @classmethod
+    def from_file(cls, path: str) -> "BlacklistMatcher":
+        """Carga `{"fuentes": [...], "patrones_titulo": [...]}` desde un archivo JSON."""
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                config = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Lista negra inválida en {path}: {e}")
+        if not isinstance(config, dict):
+            raise ValueError(f"Lista negra inválida en {path}: se esperaba un objeto")
+        return cls(config.get("fuentes", []), config.get("patrones_titulo", []))
+
+    def match(self, job: Dict) -> Optional[BlacklistMatch]:
+        """Motivo por el que el empleo está bloqueado, o None si no lo está."""
+        # Verificar la vía/fuente de la oferta (criterio más importante)
+        source = self._automaton.search(job.get("via", "").lower())
+        if source is not None:
+            return BlacklistMatch("via", source)
+        company = job.get("company_name", "").lower()
+        if company in self._companies:
+            return BlacklistMatch("empresa", company)
+        extensions = job.get("extensions", [])
+        if extensions:
+            source = self._automaton.search(", ".join(extensions).lower())
+            if source is not None:
+                return BlacklistMatch("extensiones", source)
+        title = job.get("title", "").lower()
+        source = self._automaton.search_word(title)
+        if source is not None:
+            return BlacklistMatch("titulo", source)
+        if self._title_patterns is not None:
+            title_match = self._title_patterns.search(title)
+            if title_match:
+                return BlacklistMatch("titulo", self.title_patterns[int(title_match.lastgroup[1:])])
+        return None
+
+    def filter_page(self, jobs: Iterable[Dict]) -> Tuple[List[Dict], List[Tuple[Dict, BlacklistMatch]]]:
+        """Separa una página de empleos en aceptados y rechazados (con el motivo de cada rechazo)."""
+        accepted, rejected = [], []
+        for job in jobs:
+            reason = self.match(job)
+            if reason is None:
+                accepted.append(job)
+            else:
+                rejected.append((job, reason))
+        return accepted, rejected
+
+class Blacklist:
+    """Lista negra configurable que se recarga sola cuando cambia su archivo.
+
+    Se consulta la fecha de modificación del archivo como mucho cada
+    `reload_seconds`; si cambió, se compila un nuevo BlacklistMatcher y se
+    reemplaza el anterior. Si el archivo nuevo es inválido se registra el
+    error y se sigue usando la versión anterior. Sin archivo se usan las
+    fuentes por defecto de BLACKLISTED_SOURCES.
+    """
+
+    def __init__(self, path: Optional[str] = BLACKLIST_FILE, reload_seconds: float = BLACKLIST_RELOAD_SECONDS):
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._stamp = self._file_stamp()
+        self._checked_at = time_module.monotonic()
+        self.matcher = self._load()
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        if not self.path:
+            return None
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self) -> BlacklistMatcher:
+        if self._stamp is None:
+            return BlacklistMatcher()
+        matcher = BlacklistMatcher.from_file(self.path)
+        logger.info(f"[LISTA NEGRA] {len(matcher.sources)} fuentes y {len(matcher.title_patterns)} patrones "
+                    f"de título cargados desde {self.path}")
+        return matcher
+
+    def reload_if_changed(self) -> bool:
+        """Recompila la lista si su archivo cambió desde la última carga."""
+        now = time_module.monotonic()
+        if now - self._checked_at < self.reload_seconds:
+            return False
+        with self._lock:
+            self._checked_at = now
+            stamp = self._file_stamp()
+            if stamp == self._stamp:
+                return False
+            try:
+                self._stamp = stamp
+                self.matcher = self._load()
+            except (OSError, ValueError) as e:
+                logger.error(f"[LISTA NEGRA] No se pudo recargar {self.path}, se mantiene la versión anterior: {e}")
+                return False
+            return True
+
+    def match(self, job: Dict) -> Optional[BlacklistMatch]:
+        self.reload_if_changed()
+        return self.matcher.match(job)
+
+    def filter_page(self, jobs: Iterable[Dict]) -> Tuple[List[Dict], List[Tuple[Dict, BlacklistMatch]]]:
+        self.reload_if_changed()
+        return self.matcher.filter_page(jobs)
+
+_blacklist: Optional[Blacklist] = None
+_blacklist_lock = threading.Lock()
+
+def get_blacklist() -> Blacklist:
+    """Devuelve la lista negra compartida, cargándola la primera vez."""
+    global _blacklist
+    with _blacklist_lock:
+        if _blacklist is None:
+            _blacklist = Blacklist()
+        return _blacklist
+
+def set_blacklist(blacklist: Optional[Blacklist]) -> None:
+    """Reemplaza la lista negra compartida (None para volver a cargarla desde BLACKLIST_FILE)."""
+    global _blacklist
+    with _blacklist_lock:
+        _blacklist = blacklist
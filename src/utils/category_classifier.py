@@ -0,0 +1,165 @@
+import re
+from collections import Counter
+from typing import Dict, List, Mapping, Optional, Pattern, Sequence, Tuple
+from src.config.categories import CATEGORIES, CATEGORY_KEYWORDS
+from src.config.settings import CATEGORY_DESCRIPTION_WEIGHT, CATEGORY_TITLE_WEIGHT
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él, los puntajes se suman en Python
+    np = None
+
+_WORD = re.compile(r"\w+")
+_WORD_CHAR = re.compile(r"\w")
+_INGENIERIA = re.compile(r"\b(ingenier[íi]a|ingeniero)\b")
+
+_TECH_HINTS = ("software", "informática", "tecnología", "desarrollo", "programador")
+_TURISMO_HINTS = ("turismo", "guía", "patagonia", "avistaje")
+_DISENO_HINTS = ("gráfico", "ux", "ui", "web", "industrial")
+_SERVICIOS_HINTS = ("limpieza", "seguridad", "jardinero", "conserje")
+
+class KeywordClassifier:
+    """Clasificador de categorías por palabras clave, construido una sola vez.
+
+    Equivale a buscar `\\bpalabra\\b` para cada palabra clave de cada categoría
+    en el orden de CATEGORY_KEYWORDS y quedarse con la primera que aparece,
+    pero recorre el texto una sola vez: se extraen sus palabras y solo se
+    consideran las palabras clave cuya primera palabra aparece en el texto.
+    Una palabra clave de una sola palabra está presente si y solo si está en
+    ese conjunto; las de varias palabras se confirman con su patrón
+    precompilado. Gana la de mayor prioridad (menor posición en el orden de
+    categorías y palabras clave).
+    """
+
+    def __init__(self, keywords: Mapping[str, Sequence[str]] = CATEGORY_KEYWORDS,
+                 categories: Mapping[str, str] = CATEGORIES):
+        self.categories = categories
+        self._names: List[str] = []
+        # primera palabra -> [(prioridad, patrón o None si es una sola palabra)] en orden de prioridad
+        self._by_first_word: Dict[str, List[Tuple[int, Optional[Pattern]]]] = {}
+        for category, category_keywords in keywords.items():
+            for keyword in category_keywords:
+                words = _WORD.findall(keyword)
+                if not words or not _WORD_CHAR.match(keyword) or not _WORD_CHAR.fullmatch(keyword[-1]):
+                    raise ValueError(f"Palabra clave no soportada: '{keyword}'")
+                pattern = re.compile(rf"\b{re.escape(keyword)}\b") if words != [keyword] else None
+                self._by_first_word.setdefault(words[0], []).append((len(self._names), pattern))
+                self._names.append(category)
+
+    def keyword_category(self, text: str) -> Optional[str]:
+        """Categoría de la palabra clave de mayor prioridad presente en `text` (ya en minúsculas)."""
+        best = len(self._names)
+        for word in self._by_first_word.keys() & _WORD.findall(text):
+            for priority, pattern in self._by_first_word[word]:
+                if priority >= best:
+                    break
+                if pattern is None or pattern.search(text):
+                    best = priority
+                    break
+        return self._names[best] if best < len(self._names) else None
+
+    def classify(self, title: str, description: str) -> str:
+        """Devuelve el id de la categoría; mismas reglas que el mapeo original."""
+        text = (title + " " + description).lower()
+
+        if _INGENIERIA.search(text) and any(keyword in text for keyword in _TECH_HINTS):
+            return self.categories["Tecnología"]
+        if "atención" in text and "cliente" in text:
+            return self.categories["Atención al Cliente"]
+        if "rrhh" in text or "recursos humanos" in text:
+            return self.categories["Recursos Humanos"]
+        if any(keyword in text for keyword in _TURISMO_HINTS):
+            return self.categories["Turismo"]
+        if "diseñador" in text and any(keyword in text for keyword in _DISENO_HINTS):
+            return self.categories["Diseño"]
+        if any(keyword in text for keyword in _SERVICIOS_HINTS) and "servicio" in text:
+            return self.categories["Servicios"]
+
+        category = self.keyword_category(text)
+        return self.categories[category or "Otros"]
+
+class ScoreClassifier:
+    """Clasificador por puntaje, pensado para clasificar una página de resultados a la vez.
+
+    Cuenta las apariciones de cada palabra clave (como palabra completa) en el
+    título y en la descripción, las pondera (el título pesa más) y elige la
+    categoría con mayor puntaje; a igual puntaje gana la que aparece antes en
+    CATEGORY_KEYWORDS, y sin ninguna palabra clave la categoría es "Otros". Con
+    NumPy, los conteos de todo el lote forman una matriz empleos × palabras
+    clave que se multiplica por la matriz palabras clave × categorías; sin
+    NumPy se obtiene el mismo resultado sumando en Python.
+    """
+
+    def __init__(self, keywords: Mapping[str, Sequence[str]] = CATEGORY_KEYWORDS,
+                 categories: Mapping[str, str] = CATEGORIES, title_weight: float = CATEGORY_TITLE_WEIGHT,
+                 description_weight: float = CATEGORY_DESCRIPTION_WEIGHT):
+        self.categories = categories
+        self.title_weight = title_weight
+        self.description_weight = description_weight
+        self._names: List[str] = list(keywords)
+        # palabra clave -> categorías (índices) a las que suma; una palabra clave puede estar en varias
+        self._keywords: Dict[str, List[int]] = {}
+        for column, category_keywords in enumerate(keywords.values()):
+            for keyword in category_keywords:
+                if column not in self._keywords.setdefault(keyword, []):
+                    self._keywords[keyword].append(column)
+        self._keyword_index = {keyword: row for row, keyword in enumerate(self._keywords)}
+        self._single: Dict[str, int] = {}
+        # primera palabra -> [(índice, patrón)] de las palabras clave de varias palabras
+        self._multi: Dict[str, List[Tuple[int, Pattern]]] = {}
+        for keyword, row in self._keyword_index.items():
+            words = _WORD.findall(keyword)
+            if words == [keyword]:
+                self._single[keyword] = row
+            else:
+                self._multi.setdefault(words[0], []).append((row, re.compile(rf"\b{re.escape(keyword)}\b")))
+        self._matrix = None
+        if np is not None:
+            self._matrix = np.zeros((len(self._keywords), len(self._names)))
+            for keyword, columns in self._keywords.items():
+                self._matrix[self._keyword_index[keyword], columns] = 1.0
+
+    def _counts(self, text: str) -> Dict[int, int]:
+        """Apariciones de cada palabra clave (por índice) en `text`, ya en minúsculas."""
+        counts: Dict[int, int] = {}
+        for word, count in Counter(_WORD.findall(text)).items():
+            row = self._single.get(word)
+            if row is not None:
+                counts[row] = count
+            for row, pattern in self._multi.get(word, ()):
+                counts[row] = len(pattern.findall(text))
+        return counts
+
+    def _weighted_counts(self, title: str, description: str) -> Dict[int, float]:
+        weighted: Dict[int, float] = {}
+        for weight, text in ((self.title_weight, title), (self.description_weight, description)):
+            for row, count in self._counts(text.lower()).items():
+                weighted[row] = weighted.get(row, 0.0) + weight * count
+        return weighted
+
+    def classify_batch(self, jobs: Sequence[Tuple[str, str]]) -> List[str]:
+        """Ids de categoría para una secuencia de (título, descripción)."""
+        weighted = [self._weighted_counts(title, description) for title, description in jobs]
+        if self._matrix is not None:
+            counts = np.zeros((len(jobs), len(self._keywords)))
+            for job_row, job_counts in enumerate(weighted):
+                if job_counts:
+                    counts[job_row, list(job_counts)] = list(job_counts.values())
+            scores = counts @ self._matrix
+            best = scores.argmax(axis=1)
+            has_keywords = scores.max(axis=1) > 0
+            names = [self._names[column] if found else "Otros" for column, found in zip(best.tolist(), has_keywords.tolist())]
+        else:
+            keyword_columns = list(self._keywords.values())
+            names = []
+            for job_counts in weighted:
+                scores = [0.0] * len(self._names)
+                for row, value in job_counts.items():
+                    for column in keyword_columns[row]:
+                        scores[column] += value
+                top = max(scores, default=0.0)
+                names.append(self._names[scores.index(top)] if top > 0 else "Otros")
+        return [self.categories[name] for name in names]
+
+    def classify(self, title: str, description: str) -> str:
+        return self.classify_batch([(title, description)])[0]
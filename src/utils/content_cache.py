@@ -0,0 +1,155 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time as time_module
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+from src.config.categories import CATEGORIES, CATEGORY_KEYWORDS
+from src.config.settings import CATEGORY_STRATEGY, CONTENT_CACHE_DISK_MAX_ENTRIES, CONTENT_CACHE_PATH, CONTENT_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Incrementar al cambiar text_to_html, las reglas de categoría o los enlaces generados:
+# invalida lo guardado en disco por versiones anteriores
+CONTENT_CACHE_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS derivados (
+    clave TEXT NOT NULL,
+    campo TEXT NOT NULL,
+    valor TEXT NOT NULL,
+    usada REAL NOT NULL,
+    PRIMARY KEY (clave, campo)
+);
+CREATE INDEX IF NOT EXISTS idx_derivados_usada ON derivados (usada);
+"""
+
+# Los ids de CATEGORIES cambian entre testing y producción: entran en la clave junto con las reglas
+_NAMESPACE = "\x1f".join((str(CONTENT_CACHE_VERSION), CATEGORY_STRATEGY,
+                          hashlib.sha1(json.dumps([CATEGORY_KEYWORDS, CATEGORIES], sort_keys=True)
+                                       .encode("utf-8")).hexdigest()))
+
+def content_key(job: Dict) -> str:
+    """Clave de contenido de un empleo de SerpApi: título, empresa, vía y descripción.
+
+    Incluye la versión de los campos derivados, la estrategia de categorización,
+    las palabras clave y los ids de categoría configurados, para no reutilizar
+    resultados calculados con otras reglas o para otra base.
+    """
+    raw = "\x1f".join((_NAMESPACE, job.get("title", ""), job.get("company_name", ""), job.get("via", ""),
+                       job.get("description", "")))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+class ContentCache:
+    """Memo de los campos derivados de un empleo (categoría, HTML, enlace de postulación).
+
+    El mismo empleo vuelve en distintas variantes de consulta, filtros de fecha
+    y horarios; sus campos derivados se calculan una vez por contenido. Guarda
+    en memoria hasta `max_entries` empleos (LRU) y, si se indica `path`, una
+    capa en SQLite que sobrevive reinicios, limitada a `disk_max_entries`
+    campos (se descartan los menos usados recientemente).
+    """
+
+    def __init__(self, max_entries: int = CONTENT_CACHE_SIZE, path: Optional[str] = CONTENT_CACHE_PATH,
+                 disk_max_entries: int = CONTENT_CACHE_DISK_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.path = path
+        self.disk_max_entries = disk_max_entries
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._entries: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, field: str) -> Optional[str]:
+        """Valor guardado del campo para la clave, o None si no está en memoria ni en disco."""
+        with self._lock:
+            fields = self._entries.get(key)
+            if fields is not None and field in fields:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return fields[field]
+            value = self._disk_get(key, field)
+            if value is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["disk_hits"] += 1
+            self._remember(key, field, value)
+            return value
+
+    def put(self, key: str, field: str, value: str) -> None:
+        with self._lock:
+            self._remember(key, field, value)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("INSERT OR REPLACE INTO derivados VALUES (?, ?, ?, ?)",
+                                       (key, field, value, time_module.time()))
+                    self._evict_disk()
+
+    def get_or_compute(self, key: str, field: str, compute: Callable[[], Optional[str]]) -> Optional[str]:
+        """Devuelve el campo guardado o lo calcula con `compute` y lo guarda (None no se guarda)."""
+        value = self.get(key, field)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, field, value)
+        return value
+
+    def _remember(self, key: str, field: str, value: str) -> None:
+        self._entries.setdefault(key, {})[field] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _disk_get(self, key: str, field: str) -> Optional[str]:
+        if self._conn is None:
+            return None
+        row = self._conn.execute("SELECT valor FROM derivados WHERE clave = ? AND campo = ?", (key, field)).fetchone()
+        if row is None:
+            return None
+        with self._conn:
+            self._conn.execute("UPDATE derivados SET usada = ? WHERE clave = ? AND campo = ?",
+                               (time_module.time(), key, field))
+        return row[0]
+
+    def _evict_disk(self) -> None:
+        excess = self._conn.execute("SELECT COUNT(*) FROM derivados").fetchone()[0] - self.disk_max_entries
+        if excess > 0:
+            self._conn.execute("DELETE FROM derivados WHERE rowid IN "
+                               "(SELECT rowid FROM derivados ORDER BY usada LIMIT ?)", (excess,))
+
+    def hit_rate(self) -> float:
+        hits = self.stats["hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return hits / lookups if lookups else 0.0
+
+    def log_stats(self) -> None:
+        logger.info(f"[CACHE] Campos derivados: {self.stats['hits']} aciertos en memoria, "
+                    f"{self.stats['disk_hits']} en disco, {self.stats['misses']} fallos, "
+                    f"tasa de acierto {self.hit_rate():.0%}")
+
+_cache: Optional[ContentCache] = None
+
+def get_content_cache() -> ContentCache:
+    """Devuelve el memo compartido (con capa en disco si CONTENT_CACHE_PATH está configurado)."""
+    global _cache
+    if _cache is None:
+        _cache = ContentCache()
+    return _cache
+
+def set_content_cache(cache: Optional[ContentCache]) -> None:
+    """Reemplaza el memo compartido (None para crear uno nuevo con la configuración)."""
+    global _cache
+    _cache = cache
@@ -1,131 +1,284 @@
+import logging
 import re
-from typing import Dict, List
-from src.config.categories import CATEGORIES, CATEGORY_KEYWORDS
-from src.config.settings import DEFAULT_LOGO_URL
-from src.utils.logging import setup_logging
+import sys
+from io import StringIO
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Union
+from src.config.settings import CATEGORY_STRATEGY, DEFAULT_LOGO_URL
+from src.utils.blacklist import get_blacklist
+from src.utils.category_classifier import KeywordClassifier, ScoreClassifier
+from src.utils.content_cache import content_key, get_content_cache
+from src.utils.metrics import DEDUP_SECONDS, timed
+from src.utils.minhash import NearDuplicateIndex
 
-logger = setup_logging()
+if TYPE_CHECKING:
+    from src.scraper.offer_store import OfferStore
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_STRATEGIES = ("reglas", "puntaje")
+
+_category_classifiers: Dict[str, Union[KeywordClassifier, ScoreClassifier]] = {}
+
+def get_category_classifier(strategy: str = CATEGORY_STRATEGY) -> Union[KeywordClassifier, ScoreClassifier]:
+    """Clasificador de la estrategia indicada, construido la primera vez que se pide."""
+    if strategy not in CATEGORY_STRATEGIES:
+        raise ValueError(f"Estrategia de categorización desconocida: {strategy}")
+    classifier = _category_classifiers.get(strategy)
+    if classifier is None:
+        classifier = KeywordClassifier() if strategy == "reglas" else ScoreClassifier()
+        _category_classifiers[strategy] = classifier
+    return classifier
 
 def map_category(title: str, description: str) -> str:
     """Mapea una categoría basada en el título y la descripción de la oferta."""
-    text = (title + " " + description).lower()
-
-    if re.search(r"\b(ingenier[íi]a|ingeniero)\b", text) and any(keyword in text for keyword in ["software", "informática", "tecnología", "desarrollo", "programador"]):
-        return CATEGORIES["Tecnología"]
-    if "atención" in text and "cliente" in text:
-        return CATEGORIES["Atención al Cliente"]
-    if "rrhh" in text or "recursos humanos" in text:
-        return CATEGORIES["Recursos Humanos"]
-    if any(keyword in text for keyword in ["turismo", "guía", "patagonia", "avistaje"]):
-        return CATEGORIES["Turismo"]
-    if "diseñador" in text and any(keyword in text for keyword in ["gráfico", "ux", "ui", "web", "industrial"]):
-        return CATEGORIES["Diseño"]
-    if any(keyword in text for keyword in ["limpieza", "seguridad", "jardinero", "conserje"]) and "servicio" in text:
-        return CATEGORIES["Servicios"]
-
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        for keyword in keywords:
-            if re.search(rf"\b{keyword}\b", text):
-                return CATEGORIES[category]
-    return CATEGORIES["Otros"]
+    return get_category_classifier().classify(title, description)
+
+def map_categories(jobs: List[Dict]) -> List[str]:
+    """Categorías de una página de empleos de SerpApi, en una sola pasada por lote.
+
+    Los empleos ya categorizados antes (ver ContentCache) no se vuelven a clasificar.
+    """
+    cache = get_content_cache()
+    keys = [content_key(job) for job in jobs]
+    categories = [cache.get(key, "categoria") for key in keys]
+    missing = [index for index, category in enumerate(categories) if category is None]
+    if not missing:
+        return categories
+
+    classifier = get_category_classifier()
+    pairs = [(jobs[index].get("title", ""), jobs[index].get("description", "")) for index in missing]
+    if isinstance(classifier, ScoreClassifier):
+        computed = classifier.classify_batch(pairs)
+    else:
+        computed = [classifier.classify(title, description) for title, description in pairs]
+    for index, category in zip(missing, computed):
+        cache.put(keys[index], "categoria", category)
+        categories[index] = category
+    return categories
 
 def get_logo_url(job: Dict) -> str:
     """Obtiene la URL del logo de la empresa, con un valor por defecto si no existe."""
     return job.get("thumbnail") or job.get("company_logo") or DEFAULT_LOGO_URL
 
-def is_duplicate(job: Dict, existing_offers: List[Dict]) -> bool:
+# Palabras comunes que no aportan significado al comparar títulos
+COMMON_TITLE_WORDS = frozenset(['el', 'la', 'los', 'las', 'un', 'una', 'unos', 'unas', 'y', 'o', 'de', 'del', 'para', 'por', 'en'])
+_NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+
+def normalize_title(title: str) -> str:
+    """Normaliza un título eliminando caracteres especiales y palabras comunes."""
+    normalized = _NON_WORD_PATTERN.sub(' ', title.strip().lower())
+    return ' '.join(word for word in normalized.split() if word not in COMMON_TITLE_WORDS)
+
+def normalize_company(company: str) -> str:
+    """Normaliza el nombre de la empresa para la comparación estricta."""
+    return company.strip().lower()
+
+def parse_fecha_publicacion(fecha: str) -> float:
+    """Convierte la fechaPublicacion ISO del backend a epoch (las fechas sin zona son hora local)."""
+    return datetime.fromisoformat(fecha).timestamp()
+
+class OfferRecord:
+    """Proyección compacta de una oferta existente.
+
+    Guarda solo lo que usan la deduplicación y la programación: la empresa
+    normalizada (internada, compartida por todas las ofertas de la empresa),
+    el título normalizado, su conjunto de palabras (calculado la primera vez
+    que se necesita) y la fecha de publicación en epoch, ya convertida.
+    """
+
+    __slots__ = ("empresa", "titulo", "publicada", "_palabras")
+
+    def __init__(self, empresa: str, titulo: str, publicada: Optional[float] = None):
+        self.empresa = sys.intern(empresa)
+        self.titulo = titulo
+        self.publicada = publicada
+        self._palabras: Optional[frozenset] = None
+
+    @classmethod
+    def from_offer(cls, offer: Dict) -> "OfferRecord":
+        """Crea el registro a partir de una oferta con el formato del backend."""
+        try:
+            publicada = parse_fecha_publicacion(offer["fechaPublicacion"])
+        except (KeyError, TypeError, ValueError):
+            publicada = None
+        return cls(normalize_company(offer.get("empresaConsultora") or ""), normalize_title(offer.get("titulo") or ""),
+                   publicada)
+
+    @property
+    def palabras(self) -> frozenset:
+        if self._palabras is None:
+            self._palabras = frozenset(self.titulo.split())
+        return self._palabras
+
+    def __repr__(self) -> str:
+        return f"OfferRecord({self.empresa!r}, {self.titulo!r}, {self.publicada!r})"
+
+def _titles_match(new_title: str, new_words: frozenset, existing_title: str, existing_words: frozenset) -> bool:
+    """Aplica la regla de coincidencia de títulos (igualdad normalizada o más del 80% de palabras)."""
+    # Verificar coincidencia exacta después de normalización
+    if new_title == existing_title:
+        return True
+
+    # Verificar si los títulos son muy similares (más del 80% de palabras coinciden)
+    if new_words and existing_words:
+        common_words = new_words.intersection(existing_words)
+        similarity = len(common_words) / max(len(new_words), len(existing_words))
+        return similarity > 0.8
+    return False
+
+class DuplicateIndex:
+    """Índice de ofertas existentes agrupadas por empresa normalizada.
+
+    Se construye una sola vez a partir de las ofertas del backend y se actualiza
+    con cada oferta publicada. Cada oferta se guarda como un OfferRecord en el
+    grupo de su empresa, de modo que cada consulta solo recorre las ofertas de
+    la misma empresa. Opcionalmente mantiene un NearDuplicateIndex para detectar
+    la misma oferta publicada por otra empresa o agregador.
+
+    Si se indica un OfferStore, los grupos de cada empresa se consultan en SQLite
+    la primera vez que se necesitan y las ofertas publicadas se guardan en él.
+    Con `refresh` se incorporan las ofertas nuevas del backend sin reconstruir
+    el índice.
+    """
+
+    def __init__(self, offers: Iterable[Union[Dict, OfferRecord]] = (),
+                 near_duplicates: Optional[NearDuplicateIndex] = None, store: Optional["OfferStore"] = None):
+        # empresa normalizada -> {título normalizado: registro}
+        self._buckets: Dict[str, Dict[str, OfferRecord]] = {}
+        self._size = 0
+        self.near_duplicates = near_duplicates
+        self.store = store
+        if store is not None:
+            self._load_store()
+        for offer in offers:
+            if isinstance(offer, OfferRecord):
+                self.add_record(offer)
+            else:
+                self.add(offer)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _load_store(self) -> None:
+        self._buckets.clear()
+        self._size = len(self.store)
+        if self.near_duplicates is not None:
+            self.near_duplicates.clear()
+            for signature in self.store.iter_signatures():
+                self.near_duplicates.add_signature(signature)
+
+    def refresh(self) -> int:
+        """Sincroniza el OfferStore con el backend e incorpora solo las ofertas nuevas.
+
+        Los grupos ya cargados y las firmas se completan con las filas nuevas
+        de la réplica; si la sincronización terminó siendo completa, el índice
+        se recarga desde el OfferStore. Devuelve la cantidad de ofertas nuevas.
+        """
+        if self.store is None:
+            return 0
+        generation, mark = self.store.generation, self.store.last_rowid()
+        added = self.store.sync()
+        if self.store.generation != generation:
+            self._load_store()
+            return added
+        for record, signature in self.store.rows_after(mark):
+            bucket = self._buckets.get(record.empresa)
+            if bucket is not None:
+                bucket[record.titulo] = record
+            if signature is not None and self.near_duplicates is not None:
+                self.near_duplicates.add_signature(signature)
+            self._size += 1
+        return added
+
+    def _bucket(self, company: str) -> Optional[Dict[str, OfferRecord]]:
+        bucket = self._buckets.get(company)
+        if bucket is None and self.store is not None:
+            bucket = {record.titulo: record for record in self.store.records_for_company(company)}
+            self._buckets[company] = bucket
+        return bucket
+
+    def records(self) -> Iterator[OfferRecord]:
+        """Recorre los registros cargados en memoria (con un OfferStore, solo los grupos ya consultados)."""
+        for bucket in self._buckets.values():
+            yield from bucket.values()
+
+    def add_record(self, record: OfferRecord) -> None:
+        """Agrega un registro ya construido (sin firma de casi duplicados ni persistencia)."""
+        bucket = self._buckets.setdefault(record.empresa, {})
+        if record.titulo not in bucket:
+            self._size += 1
+        bucket[record.titulo] = record
+
+    def add(self, offer: Dict) -> OfferRecord:
+        """Agrega una oferta con el formato del backend (titulo, empresaConsultora, fechaPublicacion)."""
+        record = OfferRecord.from_offer(offer)
+        signature = None
+        if self.near_duplicates is not None:
+            signature = self.near_duplicates.offer_signature(offer)
+            if signature is not None:
+                self.near_duplicates.add_signature(signature)
+
+        if self.store is not None:
+            # Con un OfferStore el tamaño es el de la réplica: una huella repetida no suma
+            if self.store.add(offer, signature):
+                self._size += 1
+            # Si el grupo aún no se cargó, se leerá completo desde SQLite
+            bucket = self._buckets.get(record.empresa)
+        else:
+            bucket = self._buckets.setdefault(record.empresa, {})
+            if record.titulo not in bucket:
+                self._size += 1
+        if bucket is not None:
+            bucket[record.titulo] = record
+        return record
+
+    def contains(self, job: Dict) -> bool:
+        """Indica si el empleo de SerpApi coincide con alguna oferta ya publicada."""
+        if self._matches_company_bucket(job):
+            return True
+        if self.near_duplicates is not None and self.near_duplicates.contains(job):
+            logger.info(f"[FILTRO] Casi duplicado de otra empresa: '{job.get('title', '')}' - {job.get('company_name', '')}")
+            return True
+        return False
+
+    def contains_offer(self, oferta: Dict) -> bool:
+        """Igual que contains, para una oferta ya mapeada al formato del backend."""
+        return self.contains({"title": oferta.get("titulo") or "", "company_name": oferta.get("empresaConsultora") or "",
+                              "description": oferta.get("descripcion") or ""})
+
+    def _matches_company_bucket(self, job: Dict) -> bool:
+        bucket = self._bucket(normalize_company(job.get("company_name", "")))
+        if not bucket:
+            return False
+
+        new_title = normalize_title(job.get("title", ""))
+        if new_title in bucket:
+            return True
+
+        new_words = frozenset(new_title.split())
+        return any(_titles_match(new_title, new_words, record.titulo, record.palabras)
+                   for record in bucket.values())
+
+@timed(DEDUP_SECONDS)
+def is_duplicate(job: Dict, existing_offers: Union[List[Union[Dict, OfferRecord]], DuplicateIndex]) -> bool:
     """Verifica si una oferta ya existe en la base de datos.
     
     Utiliza una comparación más inteligente que permite pequeñas variaciones en los títulos
     pero mantiene el criterio estricto para la empresa para evitar falsos positivos.
+    Acepta la lista de ofertas del backend (dicts u OfferRecord) o un DuplicateIndex ya construido.
     """
-    new_title = job.get("title", "").strip().lower()
-    new_company = job.get("company_name", "").strip().lower()
-    
-    # Normalizar el título (eliminar caracteres especiales y palabras comunes)
-    def normalize_title(title):
-        # Eliminar caracteres especiales y convertir a minúsculas
-        normalized = re.sub(r'[^\w\s]', ' ', title.lower())
-        # Eliminar palabras comunes que no aportan significado
-        common_words = ['el', 'la', 'los', 'las', 'un', 'una', 'unos', 'unas', 'y', 'o', 'de', 'del', 'para', 'por', 'en']
-        words = normalized.split()
-        filtered_words = [word for word in words if word not in common_words]
-        return ' '.join(filtered_words)
-    
-    normalized_new_title = normalize_title(new_title)
-    
-    for offer in existing_offers:
-        existing_title = offer.get("titulo", "").strip().lower()
-        existing_company = offer.get("empresaConsultora", "").strip().lower()
-        
-        # Criterio estricto para la empresa
-        if new_company != existing_company:
-            continue
-            
-        # Para el título, usamos criterios más flexibles
-        normalized_existing_title = normalize_title(existing_title)
-        
-        # Verificar coincidencia exacta después de normalización
-        if normalized_new_title == normalized_existing_title:
-            return True
-            
-        # Verificar si los títulos son muy similares (más del 80% de palabras coinciden)
-        new_words = set(normalized_new_title.split())
-        existing_words = set(normalized_existing_title.split())
-        
-        # Si ambos títulos tienen palabras
-        if new_words and existing_words:
-            # Calcular la intersección de palabras
-            common_words = new_words.intersection(existing_words)
-            # Calcular el porcentaje de coincidencia
-            similarity = len(common_words) / max(len(new_words), len(existing_words))
-            
-            if similarity > 0.8:  # 80% de similitud
-                return True
-    
-    return False
+    if isinstance(existing_offers, DuplicateIndex):
+        return existing_offers.contains(job)
+    return DuplicateIndex(existing_offers).contains(job)
 
 def is_blacklisted_source(job: Dict) -> bool:
     """Verifica si la oferta proviene de una fuente no deseada.
     
-    Analiza de forma más precisa si la oferta proviene de las fuentes específicas
-    que queremos excluir, evitando falsos positivos.
+    Usa la lista negra configurable (ver BlacklistMatcher): fuentes en la vía,
+    la empresa, las extensiones o el título, y patrones de título.
     """
-    # Fuentes específicas a excluir
-    blacklisted_sources = [
-        "conectan2.com", 
-        "bebee careers", 
-        "outlier",
-        "superprof"
-    ]
-    
-    # Obtener datos relevantes
-    title = job.get("title", "").lower()
-    company = job.get("company_name", "").lower()
-    via = job.get("via", "").lower()
-    description = job.get("description", "").lower()
-    extensions = job.get("extensions", [])
-    detected_extensions = ', '.join(extensions).lower() if extensions else ""
-    
-    # Verificar la vía/fuente de la oferta (criterio más importante)
-    if any(source in via for source in blacklisted_sources):
-        return True
-        
-    # Verificar si la empresa es una de las fuentes no deseadas
-    if any(source == company for source in blacklisted_sources):
-        return True
-    
-    # Verificar patrones específicos en extensiones (más preciso que buscar en toda la descripción)
-    if any(source in detected_extensions for source in blacklisted_sources):
-        return True
-    
-    # Verificar patrones específicos en el título que indiquen fuentes no deseadas
-    # (solo si el nombre exacto de la fuente aparece como palabra completa)
-    for source in blacklisted_sources:
-        if re.search(rf"\b{re.escape(source)}\b", title):
-            return True
-    
-    return False
+    return get_blacklist().match(job) is not None
 
 def generate_link_postulacion(job: Dict) -> str:
     """Genera un enlace de postulación basado en la plataforma."""
@@ -148,133 +301,102 @@ def generate_link_postulacion(job: Dict) -> str:
     
     return f"https://www.google.com/search?q={title}+{company}+job"
 
-def text_to_html(text: str) -> str:
-    """Convierte texto plano a formato HTML para el editor TipTap.
-    
-    Procesa el texto para mantener el formato de:
-    - Párrafos
-    - Secciones (como 'Responsabilidades:', 'Requisitos:', 'Beneficios:')
-    - Listas con viñetas (detecta líneas que comienzan con - • * o ◦)
-    - Listas numeradas (detecta líneas que comienzan con números seguidos de punto o paréntesis)
+# Una sola expresión clasifica cada línea: sección (palabras seguidas de dos puntos),
+# viñeta (- • * ◦) o elemento numerado; si no coincide, es texto
+_LINE_KIND_PATTERN = re.compile(r'(?P<section>[A-Za-zÁÉÍÓÚáéíóúÑñ\s]+:$)|(?P<bullet>[\-•\*◦]\s+)|(?P<numbered>\d+[\.)]\s*)')
+_BOLD_PREFIX_PATTERN = re.compile(r'([A-Za-zÁÉÍÓÚáéíóúÑñ\s]+):(.*)$')
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def iter_html(text: str) -> Iterator[str]:
+    """Genera el HTML de `text_to_html` de a fragmentos, en una sola pasada por las líneas.
+
+    Cada línea se clasifica una vez (vacía, sección, viñeta, elemento numerado
+    o texto) y solo se mantiene en memoria el párrafo en curso. El contenido
+    se escapa (&, < y >) para que el texto no se interprete como HTML.
     """
-    if not text:
-        return "<p></p>"
-    
-    # Normalizar saltos de línea
-    text = text.replace('\r\n', '\n').replace('\r', '\n')
-    
-    # Dividir en líneas
-    lines = text.split('\n')
-    result = []
-    
-    # Patrones para detectar secciones (palabras seguidas de dos puntos)
-    section_pattern = r'^([A-Za-zÁÉÍÓÚáéíóúÑñ\s]+):$'
-    
-    i = 0
+    separator = ""
     in_list = False
-    
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        # Saltar líneas vacías
-        if not line:
-            if in_list:
-                # Cerrar la lista si estábamos en una
-                result.append('</ul>')
-                in_list = False
-            i += 1
-            continue
-        
-        # Detectar secciones (como "Responsabilidades:", "Requisitos:", "Beneficios:")
-        section_match = re.match(section_pattern, line)
-        if section_match:
+    ol_open = False
+    paragraph: List[str] = []
+
+    # StringIO con newline=None reconoce \r\n, \r y \n sin partir el texto en una lista
+    for line in StringIO(text or "", newline=None):
+        line = line.strip()
+        match = _LINE_KIND_PATTERN.match(line) if line else None
+        kind = match.lastgroup if match else ("texto" if line else None)
+
+        if kind == "texto":
             if in_list:
-                # Cerrar la lista anterior si estábamos en una
-                result.append('</ul>')
+                yield f"{separator}</ul>"
+                separator = "\n"
                 in_list = False
-            
-            # Agregar la sección como un párrafo con estilo de encabezado
-            result.append(f'<p><strong>{line}</strong></p>')
-            i += 1
+            elif ol_open:
+                yield f"{separator}</ol>"
+                separator = "\n"
+                ol_open = False
+            paragraph.append(_escape(line))
             continue
-        
-        # Detectar listas con viñetas
-        if re.match(r'^[\-•\*◦]\s+', line):
-            # Iniciar lista si no estamos ya en una
+
+        if paragraph:
+            yield f'{separator}<p>{" ".join(paragraph)}</p>'
+            separator = "\n"
+            paragraph = []
+        # Una lista numerada se cierra en cuanto la línea siguiente no es un elemento numerado
+        if ol_open and kind != "numbered":
+            yield f"{separator}</ol>"
+            separator = "\n"
+            ol_open = False
+        if in_list and kind != "bullet":
+            yield f"{separator}</ul>"
+            separator = "\n"
+            in_list = False
+
+        if kind == "section":
+            yield f"{separator}<p><strong>{_escape(line)}</strong></p>"
+        elif kind == "bullet":
             if not in_list:
-                result.append('<ul>')
+                yield f"{separator}<ul>"
+                separator = "\n"
                 in_list = True
-            
-            # Extraer el contenido sin el marcador de viñeta
-            content = re.sub(r'^[\-•\*◦]\s+', '', line)
-            
-            # Verificar si el contenido contiene texto en negrita (como "Responsabilidades:")
-            bold_match = re.match(r'^([A-Za-zÁÉÍÓÚáéíóúÑñ\s]+):(.*)$', content)
+            content = line[match.end():]
+            bold_match = _BOLD_PREFIX_PATTERN.match(content)
             if bold_match:
-                section_title = bold_match.group(1)
-                rest_content = bold_match.group(2).strip()
-                if rest_content:
-                    content = f'<strong>{section_title}:</strong>{rest_content}'
-                else:
-                    content = f'<strong>{section_title}:</strong>'
-            
-            result.append(f'  <li>{content}</li>')
-        
-        # Detectar listas numeradas
-        elif re.match(r'^\d+[\.)]\s*', line):
-            # Cerrar lista de viñetas si estábamos en una
-            if in_list:
-                result.append('</ul>')
-                in_list = False
-            
-            # Iniciar lista numerada
-            if not (result and result[-1] == '<ol>'):
-                result.append('<ol>')
-            
-            # Extraer el contenido sin el número
-            content = re.sub(r'^\d+[\.)]\s*', '', line)
-            result.append(f'  <li>{content}</li>')
-            
-            # Verificar si la siguiente línea también es parte de la lista numerada
-            if i + 1 < len(lines) and re.match(r'^\d+[\.)]\s*', lines[i + 1].strip()):
-                i += 1
-                continue
+                content = f"<strong>{bold_match.group(1)}:</strong>{_escape(bold_match.group(2).strip())}"
             else:
-                result.append('</ol>')
-        
-        # Párrafo normal
+                content = _escape(content)
+            yield f"{separator}  <li>{content}</li>"
+        elif kind == "numbered":
+            # Cada elemento abre su propio <ol> y solo el último de la serie lo cierra (formato histórico)
+            yield f"{separator}<ol>\n  <li>{_escape(line[match.end():])}</li>"
+            ol_open = True
         else:
-            if in_list:
-                # Cerrar la lista si estábamos en una
-                result.append('</ul>')
-                in_list = False
-            
-            # Buscar líneas consecutivas que formen un párrafo
-            paragraph = [line]
-            j = i + 1
-            while j < len(lines):
-                next_line = lines[j].strip()
-                # Si la siguiente línea está vacía, es parte de una lista, o es una sección, terminar el párrafo
-                if (not next_line or 
-                    re.match(r'^[\-•\*◦]\s+', next_line) or 
-                    re.match(r'^\d+[\.)]\s*', next_line) or
-                    re.match(section_pattern, next_line)):
-                    break
-                paragraph.append(next_line)
-                j += 1
-            
-            # Unir las líneas del párrafo y envolverlas en etiquetas <p>
-            result.append(f'<p>{" ".join(paragraph)}</p>')
-            i = j - 1  # Ajustar el índice para continuar desde donde terminó el párrafo
-        
-        i += 1
-    
-    # Cerrar cualquier lista abierta
+            continue
+        separator = "\n"
+
+    if paragraph:
+        yield f'{separator}<p>{" ".join(paragraph)}</p>'
+        separator = "\n"
+    if ol_open:
+        yield f"{separator}</ol>"
+        separator = "\n"
     if in_list:
-        result.append('</ul>')
-    
+        yield f"{separator}</ul>"
+        separator = "\n"
     # Si el texto no generó ningún contenido HTML, crear al menos un párrafo vacío
-    if not result:
-        return "<p></p>"
+    if not separator:
+        yield "<p></p>"
+
+def text_to_html(text: str) -> str:
+    """Convierte texto plano a formato HTML para el editor TipTap.
     
-    return '\n'.join(result)
\ No newline at end of file
+    Procesa el texto para mantener el formato de:
+    - Párrafos
+    - Secciones (como 'Responsabilidades:', 'Requisitos:', 'Beneficios:')
+    - Listas con viñetas (detecta líneas que comienzan con - • * o ◦)
+    - Listas numeradas (detecta líneas que comienzan con números seguidos de punto o paréntesis)
+
+    El texto se escapa como HTML. Ver iter_html para generarlo de a fragmentos.
+    """
+    return "".join(iter_html(text))
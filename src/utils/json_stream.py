@@ -0,0 +1,98 @@
+import codecs
+import json
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Union
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+# Carácter que cierra un elemento según cómo empieza
+_CLOSERS = {"{": "}", "[": "]", '"': '"'}
+
+def iter_json_array(chunks: Iterable[Union[bytes, str]], fields: Optional[Sequence[str]] = None,
+                    encoding: str = "utf-8") -> Iterator[Dict]:
+    """Recorre los elementos de un arreglo JSON a medida que llegan los fragmentos.
+
+    Solo se mantiene en memoria el elemento en curso (y lo que falte leer de
+    él), no el arreglo completo. Si se indican `fields`, cada elemento se
+    reduce a esos campos antes de entregarlo, de modo que campos grandes como
+    la descripción HTML se descartan enseguida.
+
+    Un elemento incompleto no se vuelve a decodificar con cada fragmento, sino
+    cuando llega el carácter que puede cerrarlo, así el costo no crece con el
+    cuadrado del tamaño del elemento. Lanza ValueError si el contenido no es
+    un arreglo JSON válido (incluidos elementos sin coma entre ellos).
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ""
+    position = 0
+    started = finished = False
+    # Después de "[" o "," se espera un elemento; después de un elemento, "," o "]"
+    expect_element = True
+    element_count = 0
+    # Con un elemento incompleto, el texto recibido se acumula en `waiting` y solo se
+    # vuelve a intentar cuando llega el carácter que podría cerrarlo ("" = cualquiera)
+    closer: Optional[str] = None
+    waiting = []
+
+    def pending_chunks() -> Iterator[str]:
+        for chunk in chunks:
+            yield text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        yield text_decoder.decode(b"", final=True)
+
+    for text in pending_chunks():
+        if closer is not None:
+            waiting.append(text)
+            if closer not in text:
+                continue
+            text = "".join(waiting)
+            waiting = []
+            closer = None
+        buffer = buffer[position:] + text
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position >= len(buffer):
+                break
+            char = buffer[position]
+            if not started:
+                if char != "[":
+                    raise ValueError("Se esperaba un arreglo JSON")
+                started = True
+                position += 1
+                continue
+            if finished:
+                raise ValueError("Contenido inesperado después del arreglo JSON")
+            if char == "]":
+                if expect_element and element_count:
+                    raise ValueError("Coma sobrante antes de ']' en el arreglo JSON")
+                finished = True
+                position += 1
+                continue
+            if char == ",":
+                if expect_element:
+                    raise ValueError("Falta un elemento antes de ',' en el arreglo JSON")
+                expect_element = True
+                position += 1
+                continue
+            if not expect_element:
+                raise ValueError(f"Falta ',' entre los elementos del arreglo JSON (posición {position})")
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Elemento incompleto: esperar a que llegue con qué cerrarlo
+                closer = _CLOSERS.get(char, "")
+                break
+            # Un número cortado ("12" de "123", "-4" de "-4.5") puede continuar en el próximo fragmento
+            if not isinstance(element, (dict, list, str)) and (end == len(buffer) or buffer[end] not in _DELIMITERS):
+                closer = ""
+                break
+            position = end
+            expect_element = False
+            element_count += 1
+            if fields is not None and isinstance(element, dict):
+                element = {field: element.get(field) for field in fields}
+            yield element
+
+    if not finished:
+        raise ValueError("Arreglo JSON incompleto")
@@ -1,35 +1,83 @@
+import atexit
+import json
 import logging
+import queue
 import sys
-import os
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+from src.config.settings import ARGENTINA_TZ, LOG_BACKUP_COUNT, LOG_FILE, LOG_FORMAT, LOG_LEVEL, LOG_MAX_BYTES
 
-def setup_logging():
-    """Configura el logging para el proyecto con un formato más legible."""
-    # Formato personalizado: hora (sin fecha) - nivel - mensaje
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', 
-                                  datefmt='%H:%M:%S')
-    
-    # Configurar el logger raíz
+LOG_FORMATS = ("texto", "json")
+
+# Atributos propios de LogRecord; el resto (pasados con `extra=`) se agregan al registro JSON
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por línea: hora, nivel, logger, mensaje y los campos pasados con `extra=`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "hora": datetime.fromtimestamp(record.created, ARGENTINA_TZ).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensaje": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["excepcion"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+_listener: Optional[QueueListener] = None
+
+def setup_logging(level: str = LOG_LEVEL, log_format: str = LOG_FORMAT, log_file: Optional[str] = LOG_FILE) -> logging.Logger:
+    """Configura el logging del proceso una sola vez, al iniciar.
+
+    Los módulos solo piden su logger (`logging.getLogger(__name__)`). El
+    logger raíz encola cada registro (QueueHandler) y un hilo aparte
+    (QueueListener) lo escribe en la consola y, si se indica `log_file`, en
+    un archivo JSON que rota al llegar a LOG_MAX_BYTES. Así la escritura no
+    bloquea la búsqueda ni la publicación. Las llamadas siguientes no hacen nada.
+    """
+    global _listener
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
-    
-    # Eliminar handlers existentes para evitar duplicados
-    for handler in root_logger.handlers[:]: 
-        root_logger.removeHandler(handler)
-    
-    # Handler para la consola con buffer line
+    if _listener is not None:
+        return root_logger
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Formato de log desconocido: {log_format}")
+    numeric_level = logging.getLevelName(level.upper())
+    if not isinstance(numeric_level, int):
+        raise ValueError(f"Nivel de log desconocido: {level}")
+
+    # Formato personalizado: hora (sin fecha) - nivel - mensaje
+    text_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S')
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    
-    # Añadir el handler de consola
-    root_logger.addHandler(console_handler)
-    
-    # Desactivar propagación para evitar logs duplicados
-    for name in logging.root.manager.loggerDict:
-        logging.getLogger(name).propagate = False
-        logging.getLogger(name).handlers = []
-    
+    console_handler.setFormatter(JsonFormatter() if log_format == "json" else text_formatter)
+    handlers = [console_handler]
+    if log_file:
+        file_handler = RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                           encoding="utf-8")
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(numeric_level)
+
     # Forzar flush inmediato para evitar superposición
     sys.stdout.reconfigure(line_buffering=True)
-    
-    return root_logger
\ No newline at end of file
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return root_logger
+
+def shutdown_logging() -> None:
+    """Escribe los registros pendientes y detiene el hilo de salida."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,323 @@
+import bisect
+import functools
+import logging
+import os
+import threading
+import time as time_module
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from src.config.settings import METRICS_ENABLED, METRICS_HOST, METRICS_PORT, METRICS_TEXTFILE, METRICS_TEXTFILE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Límites de los histogramas (segundos): de decenas de microsegundos (deduplicación) a un minuto (SerpApi)
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# Demora de una publicación respecto de su horario programado (segundos)
+SLOT_DELAY_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+
+LabelValues = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if not labels and not self.labels:
+            return ()
+        if len(labels) != len(self.labels) or not all(name in labels for name in self.labels):
+            raise ValueError(f"La métrica {self.name} usa las etiquetas {self.labels}, no {tuple(labels)}")
+        return tuple([str(labels[name]) for name in self.labels])
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(f"{line}\n" for line in self.samples())
+
+class Counter(_Metric):
+    """Valor que solo crece (consultas, reintentos, ofertas publicadas)."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+class Gauge(_Metric):
+    """Valor que sube y baja. Con `callback`, se calcula al exportar (None = sin muestra)."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 callback: Optional[Callable[[], Optional[float]]] = None):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, callback: Callable[[], Optional[float]]) -> None:
+        self.callback = callback
+
+    def samples(self) -> Iterator[str]:
+        if self.callback is not None:
+            try:
+                value = self.callback()
+            except Exception as e:
+                logger.error(f"[METRICAS] Error al calcular {self.name}: {e}")
+                value = None
+            if value is not None:
+                yield f"{self.name} {_format_value(value)}"
+            return
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+class Histogram(_Metric):
+    """Distribución de valores (latencias) en intervalos acumulados, con suma y cantidad."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # etiquetas -> [conteo por intervalo (el último es +Inf), suma]
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observa la duración del bloque `with`."""
+        start = time_module.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time_module.perf_counter() - start, **labels)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = [(key, list(counts), total[0]) for key, (counts, total) in self._values.items()]
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}"
+
+class _NoopMetric:
+    """Métrica deshabilitada: todas las operaciones se ignoran."""
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        pass
+
+    def set(self, value: float, **labels: str) -> None:
+        pass
+
+    def set_function(self, callback: Callable[[], Optional[float]]) -> None:
+        pass
+
+    def observe(self, value: float, **labels: str) -> None:
+        pass
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        yield
+
+NOOP = _NoopMetric()
+
+class MetricsRegistry:
+    """Conjunto de métricas del proceso, exportadas en el formato de texto de Prometheus.
+
+    Deshabilitado (sin METRICS_PORT ni METRICS_TEXTFILE), `counter`, `gauge`
+    y `histogram` devuelven una métrica que no hace nada y `timed` deja la
+    función decorada sin cambios, de modo que la instrumentación casi no
+    tiene costo.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric):
+        if not self.enabled:
+            return NOOP
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Métrica duplicada: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = (),
+              callback: Optional[Callable[[], Optional[float]]] = None) -> Gauge:
+        return self._register(Gauge(name, documentation, labels, callback))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(metric.render() for metric in metrics)
+
+    def write_textfile(self, path: str) -> None:
+        """Escribe las métricas en `path` de forma atómica (para el textfile collector de node_exporter)."""
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(temporary, path)
+
+def timed(histogram, **labels: str):
+    """Decorador que observa en `histogram` la duración de cada llamada (nada si está deshabilitado)."""
+    def decorator(func):
+        if histogram is NOOP:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time_module.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time_module.perf_counter() - start, **labels)
+        return wrapper
+    return decorator
+
+REGISTRY = MetricsRegistry()
+
+# Búsqueda en SerpApi
+SERPAPI_PAGE_SECONDS = REGISTRY.histogram(
+    "empleos_serpapi_pagina_segundos", "Duración de scrape_google_jobs por página (caché, red y reintentos)")
+SERPAPI_PAGES = REGISTRY.counter(
+    "empleos_serpapi_paginas_total", "Páginas de SerpApi obtenidas, por origen (cache o red)", ("origen",))
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "empleos_http_pedido_segundos", "Latencia de los pedidos HTTP por endpoint (incluye reintentos)", ("endpoint",))
+HTTP_RETRIES = REGISTRY.counter(
+    "empleos_http_reintentos_total", "Reintentos del cliente HTTP por endpoint", ("endpoint",))
+JOBS_FILTERED = REGISTRY.counter(
+    "empleos_filtrados_total", "Empleos de SerpApi revisados, por resultado (valido, duplicado o bloqueado)",
+    ("resultado",))
+
+# Deduplicación, categorización y mapeo
+DEDUP_SECONDS = REGISTRY.histogram("empleos_deduplicacion_segundos", "Duración de is_duplicate")
+CATEGORIZE_SECONDS = REGISTRY.histogram(
+    "empleos_categorizacion_segundos", "Duración de la categorización de una página de empleos")
+MAP_SECONDS = REGISTRY.histogram("empleos_mapeo_segundos", "Duración de map_to_oferta_empleo")
+
+# Publicación
+BACKEND_SEND_SECONDS = REGISTRY.histogram("empleos_backend_envio_segundos", "Duración de send_to_backend")
+BACKEND_SENDS = REGISTRY.counter(
+    "empleos_backend_envios_total", "Ofertas enviadas al backend, por resultado (ok o error)", ("resultado",))
+OFFERS_PUBLISHED = REGISTRY.counter("empleos_ofertas_publicadas_total", "Ofertas publicadas en el backend")
+OFFERS_TODAY = REGISTRY.gauge("empleos_ofertas_hoy", "Ofertas publicadas en el día")
+CREDITS_PER_OFFER = REGISTRY.gauge(
+    "empleos_serpapi_creditos_por_oferta", "Créditos de SerpApi gastados por oferta publicada en el mes")
+
+# Bucle principal
+LOOP_EVENTS = REGISTRY.counter("empleos_eventos_total", "Eventos atendidos por el bucle principal, por tipo", ("tipo",))
+SLOT_PUBLISH_SECONDS = REGISTRY.histogram(
+    "empleos_horario_publicacion_segundos", "Duración de la publicación de un horario programado")
+SLOT_DELAY_SECONDS = REGISTRY.histogram(
+    "empleos_horario_demora_segundos", "Demora entre el horario programado y la publicación", buckets=SLOT_DELAY_BUCKETS)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = METRICS_HOST,
+                         registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """Sirve /metrics en un hilo aparte. Devuelve el servidor (shutdown() para detenerlo)."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metricas-http", daemon=True).start()
+    logger.info(f"[METRICAS] Exportando métricas en http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+def start_textfile_writer(path: str = METRICS_TEXTFILE, interval: float = METRICS_TEXTFILE_SECONDS,
+                          registry: MetricsRegistry = REGISTRY) -> threading.Event:
+    """Reescribe `path` cada `interval` segundos en un hilo aparte. Devuelve el evento que lo detiene."""
+    stop = threading.Event()
+
+    def run():
+        while True:
+            try:
+                registry.write_textfile(path)
+            except OSError as e:
+                logger.error(f"[METRICAS] Error al escribir {path}: {e}")
+            if stop.wait(interval):
+                return
+
+    threading.Thread(target=run, name="metricas-archivo", daemon=True).start()
+    logger.info(f"[METRICAS] Escribiendo métricas en {path} cada {interval:.0f}s")
+    return stop
+
+def start_metrics_exporter() -> None:
+    """Inicia los exportadores configurados (METRICS_PORT y/o METRICS_TEXTFILE)."""
+    if METRICS_PORT:
+        start_metrics_server()
+    if METRICS_TEXTFILE:
+        start_textfile_writer()
@@ -0,0 +1,155 @@
+import html
+import random
+import re
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.config.settings import NEAR_DUPLICATE_THRESHOLD, MINHASH_NUM_PERM, MINHASH_SHINGLE_SIZE
+
+# Primo mayor que 2^32 para la permutación (a * x + b) mod p
+_MERSENNE_PRIME = 4294967311
+_MAX_HASH = 0xFFFFFFFF
+_EMPTY_BIN = _MAX_HASH + 1
+_ROTATION_OFFSET = 0x9E3779B1
+
+_HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+_NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+_STOP_WORDS = frozenset(['el', 'la', 'los', 'las', 'un', 'una', 'unos', 'unas', 'y', 'o', 'de', 'del', 'para', 'por', 'en'])
+
+def _integrate(f, a: float, b: float, steps: int = 100) -> float:
+    """Integración numérica simple (regla del punto medio)."""
+    width = (b - a) / steps
+    return sum(f(a + (i + 0.5) * width) for i in range(steps)) * width
+
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Elige (bandas, filas) que minimizan falsos positivos + falsos negativos para el umbral."""
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        if rows == 0:
+            continue
+        false_positive = _integrate(lambda s: 1 - (1 - s ** rows) ** bands, 0.0, threshold)
+        false_negative = _integrate(lambda s: (1 - s ** rows) ** bands, threshold, 1.0)
+        if false_positive + false_negative < best_error:
+            best, best_error = (bands, rows), false_positive + false_negative
+    return best
+
+def tokenize(text: str) -> List[str]:
+    """Normaliza un texto (sin HTML, signos ni palabras comunes) y lo divide en palabras."""
+    text = html.unescape(_HTML_TAG_PATTERN.sub(' ', text)).lower()
+    return [word for word in _NON_WORD_PATTERN.sub(' ', text).split() if word not in _STOP_WORDS]
+
+def shingles(text: str, size: int = MINHASH_SHINGLE_SIZE) -> set:
+    """Devuelve los hashes de 32 bits de los shingles de `size` palabras del texto."""
+    words = tokenize(text)
+    if len(words) <= size:
+        return {zlib.crc32(' '.join(words).encode())} if words else set()
+    return {zlib.crc32(' '.join(words[i:i + size]).encode()) for i in range(len(words) - size + 1)}
+
+class NearDuplicateIndex:
+    """Índice MinHash + LSH por bandas para detectar ofertas casi duplicadas.
+
+    Cada oferta se resume en una firma MinHash sobre los shingles de su título y
+    descripción. Las firmas se dividen en bandas y cada banda se indexa en una
+    tabla hash, de modo que una consulta solo compara contra las ofertas que
+    comparten al menos una banda, sin importar la empresa que la publicó.
+    """
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD, num_perm: int = MINHASH_NUM_PERM,
+                 shingle_size: int = MINHASH_SHINGLE_SIZE, seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+
+        rng = random.Random(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME - 1)
+        self._b = rng.randint(0, _MERSENNE_PRIME - 1)
+        self._signatures: List[array] = []
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @property
+    def params_key(self) -> str:
+        """Identifica los parámetros que determinan las firmas (para firmas persistidas)."""
+        return f"{self.num_perm}:{self.shingle_size}:{self._a}:{self._b}"
+
+    def signature(self, text: str) -> Optional[array]:
+        """Calcula la firma MinHash de un texto; None si no tiene palabras útiles.
+
+        Usa una sola permutación repartida en `num_perm` cubetas (one permutation
+        hashing), así el costo crece con la cantidad de shingles y no con
+        shingles × permutaciones. Las cubetas vacías se completan rotando desde
+        la siguiente cubeta ocupada.
+        """
+        hashes = shingles(text, self.shingle_size)
+        if not hashes:
+            return None
+
+        num_perm, a, b = self.num_perm, self._a, self._b
+        bins = [_EMPTY_BIN] * num_perm
+        for x in hashes:
+            hashed = (a * x + b) % _MERSENNE_PRIME
+            bin_index, value = hashed % num_perm, hashed // num_perm
+            if value < bins[bin_index]:
+                bins[bin_index] = value
+
+        if _EMPTY_BIN in bins:
+            for i in range(num_perm):
+                if bins[i] != _EMPTY_BIN:
+                    continue
+                offset = 1
+                while bins[(i + offset) % num_perm] == _EMPTY_BIN:
+                    offset += 1
+                bins[i] = (bins[(i + offset) % num_perm] + offset * _ROTATION_OFFSET) & _MAX_HASH
+        return array('I', bins)
+
+    def _band_keys(self, signature: array) -> Iterable[Tuple[int, int]]:
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, hash(signature[start:start + self.rows].tobytes())
+
+    def clear(self) -> None:
+        """Descarta todas las firmas (los parámetros se conservan)."""
+        self._signatures = []
+        self._tables = [{} for _ in range(self.bands)]
+
+    def add_signature(self, signature: array) -> int:
+        """Agrega una firma ya calculada y devuelve su identificador interno."""
+        offer_id = len(self._signatures)
+        self._signatures.append(signature)
+        for band, key in self._band_keys(signature):
+            self._tables[band].setdefault(key, []).append(offer_id)
+        return offer_id
+
+    def offer_signature(self, offer: Dict) -> Optional[array]:
+        """Calcula la firma de una oferta con el formato del backend (titulo, descripcion)."""
+        return self.signature(f"{offer.get('titulo') or ''} {offer.get('descripcion') or ''}")
+
+    def add(self, offer: Dict) -> Optional[int]:
+        """Agrega una oferta con el formato del backend (titulo, descripcion)."""
+        signature = self.offer_signature(offer)
+        return self.add_signature(signature) if signature is not None else None
+
+    def similarity(self, first: array, second: array) -> float:
+        """Estima la similitud de Jaccard a partir de dos firmas."""
+        return sum(1 for x, y in zip(first, second) if x == y) / self.num_perm
+
+    def find_signature(self, signature: array) -> Optional[int]:
+        """Devuelve el identificador de una firma casi duplicada, o None si no hay ninguna."""
+        seen = set()
+        for band, key in self._band_keys(signature):
+            for offer_id in self._tables[band].get(key, ()):
+                if offer_id in seen:
+                    continue
+                seen.add(offer_id)
+                if self.similarity(signature, self._signatures[offer_id]) >= self.threshold:
+                    return offer_id
+        return None
+
+    def contains(self, job: Dict) -> bool:
+        """Indica si un empleo de SerpApi es casi duplicado de alguna oferta indexada."""
+        signature = self.signature(f"{job.get('title', '')} {job.get('description', '')}")
+        return signature is not None and self.find_signature(signature) is not None
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Los módulos de src leen la configuración al importarse
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SPRING_BOOT_API", "http://localhost:8080/api/ofertas")
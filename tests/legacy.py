@@ -0,0 +1,125 @@
+"""Implementaciones anteriores, congeladas como referencia para las pruebas de paridad.
+
+No deben modificarse: las pruebas verifican que las versiones actuales
+produzcan el mismo resultado que estas.
+"""
+import re
+from src.config.categories import CATEGORIES, CATEGORY_KEYWORDS
+
+def legacy_text_to_html(text: str) -> str:
+    """Implementación anterior de text_to_html (sin escape), como referencia."""
+    if not text:
+        return "<p></p>"
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = text.split('\n')
+    result = []
+    section_pattern = r'^([A-Za-zÁÉÍÓÚáéíóúÑñ\s]+):$'
+    i = 0
+    in_list = False
+    while i < len(lines):
+        line = lines[i].strip()
+        if not line:
+            if in_list:
+                result.append('</ul>')
+                in_list = False
+            i += 1
+            continue
+        section_match = re.match(section_pattern, line)
+        if section_match:
+            if in_list:
+                result.append('</ul>')
+                in_list = False
+            result.append(f'<p><strong>{line}</strong></p>')
+            i += 1
+            continue
+        if re.match(r'^[\-•\*◦]\s+', line):
+            if not in_list:
+                result.append('<ul>')
+                in_list = True
+            content = re.sub(r'^[\-•\*◦]\s+', '', line)
+            bold_match = re.match(r'^([A-Za-zÁÉÍÓÚáéíóúÑñ\s]+):(.*)$', content)
+            if bold_match:
+                section_title = bold_match.group(1)
+                rest_content = bold_match.group(2).strip()
+                if rest_content:
+                    content = f'<strong>{section_title}:</strong>{rest_content}'
+                else:
+                    content = f'<strong>{section_title}:</strong>'
+            result.append(f'  <li>{content}</li>')
+        elif re.match(r'^\d+[\.)]\s*', line):
+            if in_list:
+                result.append('</ul>')
+                in_list = False
+            if not (result and result[-1] == '<ol>'):
+                result.append('<ol>')
+            content = re.sub(r'^\d+[\.)]\s*', '', line)
+            result.append(f'  <li>{content}</li>')
+            if i + 1 < len(lines) and re.match(r'^\d+[\.)]\s*', lines[i + 1].strip()):
+                i += 1
+                continue
+            else:
+                result.append('</ol>')
+        else:
+            if in_list:
+                result.append('</ul>')
+                in_list = False
+            paragraph = [line]
+            j = i + 1
+            while j < len(lines):
+                next_line = lines[j].strip()
+                if (not next_line or
+                    re.match(r'^[\-•\*◦]\s+', next_line) or
+                    re.match(r'^\d+[\.)]\s*', next_line) or
+                    re.match(section_pattern, next_line)):
+                    break
+                paragraph.append(next_line)
+                j += 1
+            result.append(f'<p>{" ".join(paragraph)}</p>')
+            i = j - 1
+        i += 1
+    if in_list:
+        result.append('</ul>')
+    if not result:
+        return "<p></p>"
+    return '\n'.join(result)
+
+def legacy_map_category(title: str, description: str) -> str:
+    """Implementación anterior de map_category, como referencia."""
+    text = (title + " " + description).lower()
+
+    if re.search(r"\b(ingenier[íi]a|ingeniero)\b", text) and any(keyword in text for keyword in ["software", "informática", "tecnología", "desarrollo", "programador"]):
+        return CATEGORIES["Tecnología"]
+    if "atención" in text and "cliente" in text:
+        return CATEGORIES["Atención al Cliente"]
+    if "rrhh" in text or "recursos humanos" in text:
+        return CATEGORIES["Recursos Humanos"]
+    if any(keyword in text for keyword in ["turismo", "guía", "patagonia", "avistaje"]):
+        return CATEGORIES["Turismo"]
+    if "diseñador" in text and any(keyword in text for keyword in ["gráfico", "ux", "ui", "web", "industrial"]):
+        return CATEGORIES["Diseño"]
+    if any(keyword in text for keyword in ["limpieza", "seguridad", "jardinero", "conserje"]) and "servicio" in text:
+        return CATEGORIES["Servicios"]
+
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        for keyword in keywords:
+            if re.search(rf"\b{keyword}\b", text):
+                return CATEGORIES[category]
+    return CATEGORIES["Otros"]
+
+def legacy_is_blacklisted(job, blacklisted_sources) -> bool:
+    """Implementación anterior de is_blacklisted_source, con la lista de fuentes como parámetro."""
+    title = job.get("title", "").lower()
+    company = job.get("company_name", "").lower()
+    via = job.get("via", "").lower()
+    extensions = job.get("extensions", [])
+    detected_extensions = ', '.join(extensions).lower() if extensions else ""
+    if any(source in via for source in blacklisted_sources):
+        return True
+    if any(source == company for source in blacklisted_sources):
+        return True
+    if any(source in detected_extensions for source in blacklisted_sources):
+        return True
+    for source in blacklisted_sources:
+        if re.search(rf"\b{re.escape(source)}\b", title):
+            return True
+    return False
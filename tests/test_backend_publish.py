@@ -0,0 +1,79 @@
+import pytest
+import requests
+
+import src.scraper.backend as backend
+from src.scraper.backend import publish_offers
+
+def oferta(titulo: str) -> dict:
+    return {"titulo": titulo, "empresaConsultora": "Supermercado Sur", "fechaPublicacion": "2026-03-02T10:00:00"}
+
+OFERTAS = [oferta("Cajero/a"), oferta("Repositor"), oferta("Carnicero")]
+INVALID_JSON = object()
+
+class Response:
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        if self.body is INVALID_JSON:
+            raise ValueError("sin JSON")
+        return self.body
+
+class Client:
+    def __init__(self, answer):
+        self.answer = answer
+        self.batches = 0
+
+    def post(self, url, endpoint=None, headers=None, json=None):
+        self.batches += 1
+        if isinstance(self.answer, Exception):
+            raise self.answer
+        return Response(self.answer)
+
+@pytest.fixture
+def send(monkeypatch):
+    """Publica OFERTAS por lote con la respuesta indicada; devuelve los resultados y los reenvíos individuales."""
+    monkeypatch.setattr(backend, "BACKEND_BATCH_URL", "http://backend/lote")
+    sent = []
+
+    def send_to_backend(item):
+        sent.append(item["titulo"])
+        return True
+
+    monkeypatch.setattr(backend, "send_to_backend", send_to_backend)
+
+    def run(answer, in_backend=None):
+        client = Client(answer)
+        monkeypatch.setattr(backend, "get_http_client", lambda: client)
+        checker = None
+        if in_backend is not None:
+            checker = lambda ofertas: [item["titulo"] in in_backend for item in ofertas]
+        results = publish_offers(OFERTAS, max_workers=1, published_in_backend=checker)
+        assert client.batches == 1
+        return results, sent
+
+    return run
+
+def test_batch_results_are_used_as_returned(send):
+    results, sent = send([True, False, True])
+    assert results == [True, False, True]
+    assert sent == []
+
+@pytest.mark.parametrize("body", [{}, {"ok": True}, [True], INVALID_JSON])
+def test_body_without_results_is_not_taken_as_success(send, body):
+    results, sent = send(body, in_backend={"Cajero/a", "Carnicero"})
+    assert results == [True, True, True]
+    assert sent == ["Repositor"]
+
+def test_failed_batch_resends_only_offers_missing_from_the_backend(send):
+    results, sent = send(requests.exceptions.Timeout("tiempo agotado"), in_backend={"Repositor"})
+    assert results == [True, True, True]
+    assert sent == ["Cajero/a", "Carnicero"]
+
+def test_without_backend_check_every_offer_is_resent(send):
+    results, sent = send({"ok": True})
+    assert results == [True, True, True]
+    assert sent == ["Cajero/a", "Repositor", "Carnicero"]
@@ -0,0 +1,102 @@
+import json
+import os
+import random
+import time
+
+import pytest
+
+from src.config.settings import BLACKLISTED_SOURCES
+from src.utils.blacklist import Blacklist, BlacklistMatch, BlacklistMatcher, SubstringAutomaton
+from tests.legacy import legacy_is_blacklisted
+
+TITLES = ["Cajero/a", "Vendedor de salón", "Analista contable", "Mozo - turno noche", "Chofer (licencia D1)"]
+COMPANIES = ["Supermercado Sur", "Hotel Península", "Pesquera Madryn", "Estudio Contable Rawson"]
+VIAS = ["LinkedIn", "Indeed", "Computrabajo", "Sitio de la empresa"]
+
+def generated_sources(count: int, seed: int):
+    """Agregadores inventados: dominios, nombres de una y de varias palabras."""
+    rng = random.Random(seed)
+    syllables = ["em", "pleo", "jo", "bs", "tra", "ba", "jo", "net", "ya", "pro", "fe", "lab", "cv", "red"]
+    sources = set(BLACKLISTED_SOURCES)
+    while len(sources) < count:
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        sources.add(rng.choice([name, f"{name}.com", f"{name}.com.ar", f"{name} careers", f"{name} jobs"]))
+    return sorted(sources)
+
+def mixed_jobs(count: int, sources, seed: int):
+    """Empleos con fuentes insertadas al azar (enteras, pegadas, en mayúsculas o partidas) en cada campo."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        job = {"title": rng.choice(TITLES), "company_name": rng.choice(COMPANIES), "via": rng.choice(VIAS),
+               "extensions": rng.sample(["Tiempo completo", "Hace 2 días", "Medio tiempo"], rng.randint(0, 2))}
+        if rng.random() < 0.5:
+            source = rng.choice(sources)
+            variant = rng.choice([source, source.upper(), source.title(), f"{source}x", f"x{source}", source[:-1]])
+            field = rng.choice(["via", "company_name", "extensions", "title", "title_prefix"])
+            if field == "extensions":
+                cut = rng.randint(0, len(variant))
+                job["extensions"] = [variant[:cut], variant[cut:]] if rng.random() < 0.3 else [variant]
+            elif field == "title_prefix":
+                job["title"] = f"{variant} - {job['title']}"
+            elif field == "title":
+                job["title"] = f"{job['title']} {rng.choice(['', '(', '/'])}{variant}"
+            else:
+                job[field] = variant
+        yield job
+
+@pytest.mark.parametrize("size", [len(BLACKLISTED_SOURCES), 30, 300])
+def test_matches_legacy(size):
+    sources = list(BLACKLISTED_SOURCES) if size == len(BLACKLISTED_SOURCES) else generated_sources(size, seed=size)
+    matcher = BlacklistMatcher(sources)
+    jobs = list(mixed_jobs(1500, sources, seed=size))
+    mismatches = [job for job in jobs if (matcher.match(job) is not None) != legacy_is_blacklisted(job, sources)]
+    assert mismatches == []
+    # La muestra ejercita tanto empleos bloqueados como aceptados
+    blocked = sum(legacy_is_blacklisted(job, sources) for job in jobs)
+    assert 0 < blocked < len(jobs)
+
+def test_match_reports_field_and_source():
+    matcher = BlacklistMatcher(["superprof", "bumeran.com"])
+    assert matcher.match({"via": "vía Bumeran.com"}) == BlacklistMatch("via", "bumeran.com")
+    assert matcher.match({"company_name": "Superprof"}) == BlacklistMatch("empresa", "superprof")
+    assert matcher.match({"title": "Profesor de inglés - superprof"}) == BlacklistMatch("titulo", "superprof")
+    assert matcher.match({"title": "superprofesor de inglés"}) is None
+
+def test_title_patterns():
+    matcher = BlacklistMatcher(["superprof"], [r"gan[aá] \$+"])
+    assert matcher.match({"title": "Ganá $$$ desde tu casa"}) == BlacklistMatch("titulo", r"gan[aá] \$+")
+    with pytest.raises(ValueError):
+        BlacklistMatcher([], ["(sin cerrar"])
+
+def test_rejects_empty_entries():
+    with pytest.raises(ValueError):
+        BlacklistMatcher(["superprof", "  "])
+
+def test_search_word_checks_both_boundaries():
+    automaton = SubstringAutomaton(["jobs", "jobs ar"])
+    assert automaton.search_word("remote jobs ar") == "jobs"
+    assert automaton.search_word("remotejobs") is None
+    assert automaton.search_word("jobs_ar") is None
+
+def write(path, config, offset_seconds: int):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(config if isinstance(config, str) else json.dumps(config))
+    # Forzar una fecha de modificación distinta aunque el sistema de archivos tenga poca resolución
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + offset_seconds * 1_000_000_000))
+
+def test_reloads_when_file_changes_and_keeps_previous_on_error(tmp_path):
+    path = str(tmp_path / "blacklist.json")
+    write(path, {"fuentes": ["superprof"]}, 0)
+    blacklist = Blacklist(path, reload_seconds=0)
+    job = {"title": "Cajero", "via": "Empleos Truchos"}
+    assert blacklist.match(job) is None
+
+    write(path, {"fuentes": ["superprof", "empleos truchos"], "patrones_titulo": [r"gan[aá] \$+"]}, 1)
+    assert blacklist.match(job) == BlacklistMatch("via", "empleos truchos")
+
+    write(path, "{inválido", 2)
+    assert blacklist.match(job) == BlacklistMatch("via", "empleos truchos")
+
+def test_without_file_uses_default_sources(tmp_path):
+    blacklist = Blacklist(str(tmp_path / "no_existe.json"))
+    assert blacklist.matcher.sources == [source.lower() for source in dict.fromkeys(BLACKLISTED_SOURCES)]
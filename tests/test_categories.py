@@ -0,0 +1,77 @@
+import json
+import os
+import random
+
+import pytest
+
+from src.config.categories import CATEGORIES, CATEGORY_KEYWORDS
+from src.utils.category_classifier import KeywordClassifier
+from tests.legacy import legacy_map_category
+
+LABELLED_SAMPLE = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "data", "categorias_etiquetadas.jsonl")
+
+FILLER = ["empresa", "busca", "personal", "para", "puerto", "madryn", "experiencia", "turno", "mañana", "zona"]
+
+# Prioridades de las reglas y límites de palabra
+EDGE_CASES = [
+    ("Ingeniero de software", ""),
+    ("Ingeniería", "planta industrial"),
+    ("Atención al cliente", ""),
+    ("Analista de RRHH", ""),
+    ("Guía de turismo", "avistaje de ballenas"),
+    ("Diseñador gráfico", ""),
+    ("Personal de limpieza", "servicio de mantenimiento"),
+    ("Limpieza", ""),
+    ("", ""),
+    ("Vendedores", "ventas"),
+    ("CHOFER", "licencia profesional"),
+    ("mozo/a", "bar-restaurante"),
+    ("programador_senior", ""),
+    ("Cajero", "supermercado\nturno tarde"),
+]
+
+def mixed_texts(count: int, seed: int):
+    """Títulos y descripciones cortas con palabras clave de distintas categorías y bordes de palabra."""
+    rng = random.Random(seed)
+    keywords = [keyword for keywords in CATEGORY_KEYWORDS.values() for keyword in keywords]
+    glue = [" ", ", ", ". ", "-", "/", "", "s ", "_", "\n"]
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 6)):
+            word = rng.choice(keywords) if rng.random() < 0.6 else rng.choice(FILLER)
+            if rng.random() < 0.2:
+                word = word.upper() if rng.random() < 0.5 else word.title()
+            parts.append(word + rng.choice(glue))
+        split = rng.randint(0, len(parts))
+        yield "".join(parts[:split]), "".join(parts[split:])
+
+def load_sample():
+    with open(LABELLED_SAMPLE, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+@pytest.fixture(scope="module")
+def classify():
+    return KeywordClassifier().classify
+
+@pytest.mark.parametrize("title, description", EDGE_CASES)
+def test_edge_cases_match_legacy(classify, title, description):
+    assert classify(title, description) == legacy_map_category(title, description)
+
+@pytest.mark.parametrize("category, keyword", [(category, keyword) for category, keywords in CATEGORY_KEYWORDS.items()
+                                               for keyword in keywords])
+def test_each_keyword_matches_legacy(classify, category, keyword):
+    for title in (keyword, f"{keyword}es", f"x{keyword}", f"({keyword.upper()})"):
+        assert classify(title, "") == legacy_map_category(title, "")
+
+def test_labelled_sample_matches_legacy(classify):
+    mismatches = [row["titulo"] for row in load_sample()
+                  if classify(row["titulo"], row["descripcion"]) != legacy_map_category(row["titulo"], row["descripcion"])]
+    assert mismatches == []
+
+def test_mixed_texts_match_legacy(classify):
+    mismatches = [(title, description) for title, description in mixed_texts(5000, seed=7)
+                  if classify(title, description) != legacy_map_category(title, description)]
+    assert mismatches == []
+
+def test_without_keywords_is_otros(classify):
+    assert classify("Puesto", "sin palabras clave") == CATEGORIES["Otros"]
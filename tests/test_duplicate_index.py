@@ -0,0 +1,28 @@
+from src.scraper.offer_store import OfferStore
+from src.utils.helpers import DuplicateIndex, OfferRecord
+
+def offer(titulo: str, fecha: str = "2026-03-02T10:15:30", empresa: str = "Supermercado Sur") -> dict:
+    return {"titulo": titulo, "empresaConsultora": empresa, "fechaPublicacion": fecha}
+
+def test_size_counts_distinct_titles_per_company():
+    index = DuplicateIndex([offer("Cajero"), offer("Cajero", "2026-03-03T09:00:00"), offer("Repositor"),
+                            offer("Cajero", empresa="Hotel Península")])
+    assert len(index) == 3
+    index.add_record(OfferRecord("supermercado sur", "cajero"))
+    assert len(index) == 3
+    index.add_record(OfferRecord("supermercado sur", "panadero"))
+    assert len(index) == 4
+
+def test_size_with_store_ignores_repeated_fingerprints(tmp_path):
+    store = OfferStore(str(tmp_path / "ofertas.db"), fetcher=lambda since, fields, validators: iter([]))
+    index = DuplicateIndex(store=store)
+    index.add(offer("Cajero"))
+    index.add(offer("Cajero"))
+    assert len(index) == len(store) == 1
+    # Misma empresa y título con otra fecha: es otra oferta en la réplica
+    index.add(offer("Cajero", "2026-03-03T09:00:00"))
+    assert len(index) == len(store) == 2
+    # Sin fecha válida no se guarda
+    index.add({"titulo": "Repositor", "empresaConsultora": "Supermercado Sur"})
+    assert len(index) == len(store) == 2
+    store.close()
@@ -0,0 +1,147 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import src.main as main_module
+from src.config.settings import ARGENTINA_TZ, PREFETCH_LEAD_MINUTES, SLOT_TOLERANCE_SECONDS
+from src.scheduler.event_scheduler import (CATCH_UP_POLICIES, PREFETCH, PUBLISH, ROLLOVER, EventScheduler, FakeClock,
+                                           catch_up_count, plan_day)
+from src.scheduler.scheduler import get_scheduled_times
+from src.scraper.offer_store import OfferStore
+
+DAY = date(2026, 3, 2)
+
+def at(hour: int, minute: int = 0, day: date = DAY) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=ARGENTINA_TZ)
+
+# Con la configuración por defecto: 5 ofertas entre las 9:00 y las 18:00, una cada 1 h 48 min
+SLOTS = [at(9), at(10, 48), at(12, 36), at(14, 24), at(16, 12)]
+
+def drain(scheduler: EventScheduler, until: datetime):
+    events = []
+    while scheduler.peek() is not None and scheduler.peek().when <= until:
+        events.extend(scheduler.wait())
+    return events
+
+def test_slot_times():
+    assert get_scheduled_times(DAY) == SLOTS
+
+def test_plan_day_schedules_slots_prefetch_and_rollover():
+    clock = FakeClock(at(8))
+    scheduler = EventScheduler(clock)
+    assert plan_day(scheduler, DAY, 0, clock.now()) == SLOTS
+
+    events = drain(scheduler, at(0, day=DAY + timedelta(days=1)))
+    lead = timedelta(minutes=PREFETCH_LEAD_MINUTES)
+    expected = [event for slot in SLOTS for event in ((slot - lead, PREFETCH), (slot, PUBLISH))]
+    assert [(event.when, event.kind) for event in events] == expected + [(at(0, day=DAY + timedelta(days=1)), ROLLOVER)]
+    # Cada evento se atiende a su hora, sin esperas de más
+    assert clock.now() == at(0, day=DAY + timedelta(days=1))
+
+def test_plan_day_skips_published_slots_and_past_prefetch():
+    clock = FakeClock(at(10, 45))
+    scheduler = EventScheduler(clock)
+    assert plan_day(scheduler, DAY, 1, clock.now()) == SLOTS[1:]
+    events = drain(scheduler, SLOTS[1])
+    # El prefetch de las 10:38 ya pasó: solo queda la publicación
+    assert [(event.when, event.kind) for event in events] == [(SLOTS[1], PUBLISH)]
+
+def test_wait_returns_overdue_events_together():
+    clock = FakeClock(at(13))
+    scheduler = EventScheduler(clock)
+    plan_day(scheduler, DAY, 0, clock.now())
+    due = scheduler.wait()
+    assert [event.when for event in due if event.kind == PUBLISH] == SLOTS[:3]
+    assert clock.now() == at(13)
+
+def test_rollover_at_midnight_plans_the_next_day():
+    clock = FakeClock(at(17))
+    scheduler = EventScheduler(clock)
+    plan_day(scheduler, DAY, len(SLOTS), clock.now())
+    (event,) = scheduler.wait()
+    next_day = DAY + timedelta(days=1)
+    assert (event.kind, event.when) == (ROLLOVER, at(0, day=next_day))
+
+    plan_day(scheduler, event.when.date(), 0, clock.now())
+    assert scheduler.peek() == (SLOTS[0] - timedelta(minutes=PREFETCH_LEAD_MINUTES) + timedelta(days=1), PREFETCH)
+
+@pytest.mark.parametrize("policy, expected", [("skip", 1), ("one", 1), ("all", 3)])
+def test_catch_up_policies(policy, expected):
+    now = SLOTS[2] + timedelta(seconds=SLOT_TOLERANCE_SECONDS / 2)
+    assert catch_up_count(SLOTS[:3], now, policy) == expected
+
+def test_catch_up_skip_drops_every_late_slot():
+    now = SLOTS[2] + timedelta(seconds=SLOT_TOLERANCE_SECONDS + 1)
+    assert catch_up_count(SLOTS[:3], now, "skip") == 0
+
+def test_catch_up_without_due_slots():
+    assert all(catch_up_count([], at(12), policy) == 0 for policy in CATCH_UP_POLICIES)
+
+def test_catch_up_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        catch_up_count(SLOTS[:1], at(9), "todas")
+
+class StopLoop(Exception):
+    pass
+
+class StopClock(FakeClock):
+    """FakeClock que corta el ciclo principal al llegar a `stop`."""
+
+    def __init__(self, start: datetime, stop: datetime):
+        super().__init__(start)
+        self.stop = stop
+
+    def sleep(self, seconds: float) -> None:
+        super().sleep(seconds)
+        if self.current >= self.stop:
+            raise StopLoop
+
+class Stub:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+@pytest.fixture
+def run_main(tmp_path, monkeypatch):
+    """Corre main con un FakeClock y sin red; devuelve las publicaciones y los prefetch realizados."""
+    monkeypatch.chdir(tmp_path)
+    published, prefetched = [], []
+
+    def create_offer(existing_offers, desired_offers=1, pool=None, outbox=None):
+        published.append((clock.now(), desired_offers))
+        return desired_offers
+
+    def fill_pool(existing_offers, pool):
+        prefetched.append(clock.now())
+        return 0
+
+    monkeypatch.setattr(main_module, "OfferStore",
+                        lambda signer=None: OfferStore(str(tmp_path / "ofertas.db"), signer=signer,
+                                                       fetcher=lambda since, fields, validators: iter([])))
+    monkeypatch.setattr(main_module, "create_offer", create_offer)
+    monkeypatch.setattr(main_module, "fill_pool", fill_pool)
+    monkeypatch.setattr(main_module, "get_serpapi_cache", lambda: None)
+    monkeypatch.setattr(main_module, "get_serpapi_budget", Stub)
+    monkeypatch.setattr(main_module, "get_content_cache", Stub)
+    clock = None
+
+    def run(start: datetime, stop: datetime):
+        nonlocal clock
+        clock = StopClock(start, stop)
+        with pytest.raises(StopLoop):
+            main_module.main(clock=clock)
+        return published, prefetched
+
+    return run
+
+def test_main_publishes_each_slot_and_rolls_over(run_main):
+    next_day = DAY + timedelta(days=1)
+    published, prefetched = run_main(at(8), at(9, 30, day=next_day))
+    lead = timedelta(minutes=PREFETCH_LEAD_MINUTES)
+    assert published == [(slot, 1) for slot in SLOTS] + [(at(9, day=next_day), 1)]
+    assert prefetched == [slot - lead for slot in SLOTS] + [at(9, day=next_day) - lead]
+
+def test_main_catches_up_missed_slots_with_one_offer(run_main):
+    # Reinicio a las 13:00: vencieron los horarios de las 9:00, 10:48 y 12:36
+    published, prefetched = run_main(at(13), at(15))
+    assert published == [(at(13), 1), (SLOTS[3], 1)]
+    assert prefetched == [SLOTS[3] - timedelta(minutes=PREFETCH_LEAD_MINUTES)]
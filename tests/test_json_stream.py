@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from src.utils import json_stream
+from src.utils.json_stream import iter_json_array
+
+OFFERS = [{"id": index, "titulo": f"Oferta {index}", "descripcion": "<p>" + "texto " * index + "</p>",
+           "tags": [index, {"nivel": "junior"}]} for index in range(20)]
+
+def chunked(text: str, size: int):
+    data = text.encode("utf-8")
+    return [data[offset:offset + size] for offset in range(0, len(data), size)]
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64, 100000])
+def test_any_chunking_yields_the_same_elements(size):
+    assert list(iter_json_array(chunked(json.dumps(OFFERS, ensure_ascii=False), size))) == OFFERS
+
+def test_fields_are_projected():
+    elements = list(iter_json_array(chunked(json.dumps(OFFERS), 50), fields=("id", "titulo")))
+    assert elements == [{"id": offer["id"], "titulo": offer["titulo"]} for offer in OFFERS]
+
+@pytest.mark.parametrize("text, expected", [
+    ("[]", []), (" [ ] ", []), ("[1, 23, -4.5e2]", [1, 23, -450.0]), ('["a", "b,c]"]', ["a", "b,c]"]),
+    ("[true, null, [1, [2]]]", [True, None, [1, [2]]]),
+])
+def test_values(text, expected):
+    for size in (1, 2, len(text)):
+        assert list(iter_json_array(chunked(text, size))) == expected
+
+@pytest.mark.parametrize("text", [
+    '[{"a": 1}{"b": 2}]', "[1 2]", '["a" "b"]', "[1,]", "[,1]", "[1,,2]", '{"a": 1}', "[1] 2", "[1, 2", '[{"a": 1',
+])
+def test_invalid_arrays_raise_value_error(text):
+    for size in (1, len(text)):
+        with pytest.raises(ValueError):
+            list(iter_json_array(chunked(text, size)))
+
+def test_large_element_is_decoded_once_per_closing_brace(monkeypatch):
+    calls = []
+    decoder = json.JSONDecoder()
+
+    class CountingDecoder:
+        def raw_decode(self, text, position):
+            calls.append(position)
+            return decoder.raw_decode(text, position)
+
+    monkeypatch.setattr(json_stream.json, "JSONDecoder", CountingDecoder)
+    element = {"descripcion": "x" * 200_000}
+    chunks = chunked(json.dumps([element, element]), 1024)
+    assert list(iter_json_array(chunks)) == [element, element]
+    # Sin reintentos por fragmento: unos 400 fragmentos, pero solo un intento
+    # fallido y uno exitoso por elemento
+    assert len(calls) <= 4
@@ -0,0 +1,146 @@
+import sqlite3
+
+from src.scraper.offer_store import OfferStore, offer_fingerprint
+from src.utils.helpers import parse_fecha_publicacion
+
+def offer(fecha: str) -> dict:
+    return {"titulo": "Cajero/a", "empresaConsultora": "Supermercado Sur", "fechaPublicacion": fecha}
+
+def fetcher(offers):
+    def fetch(since, fields, validators):
+        return iter(offers)
+    return fetch
+
+def test_fingerprint_ignores_date_format():
+    naive = offer_fingerprint(offer("2026-03-02T10:15:30.123456"))
+    assert offer_fingerprint(offer("2026-03-02T10:15:30")) == naive
+    assert offer_fingerprint(offer("2026-03-02T10:15:31")) != naive
+
+def test_fingerprint_accepts_parsed_date():
+    parsed = offer("2026-03-02T10:15:30")
+    assert offer_fingerprint(parsed, parse_fecha_publicacion(parsed["fechaPublicacion"])) == offer_fingerprint(parsed)
+
+def test_replica_with_old_fingerprints_is_cleared(tmp_path):
+    path = str(tmp_path / "ofertas.db")
+    store = OfferStore(path, fetcher=fetcher([offer("2026-03-02T10:15:30")]))
+    store.sync()
+    assert len(store) == 1
+    store.close()
+    # Réplica escrita por una versión que no guardaba la versión de las huellas
+    with sqlite3.connect(path) as conn:
+        conn.execute("DELETE FROM sync_estado WHERE clave = 'huella_version'")
+    conn.close()
+
+    store = OfferStore(path, fetcher=fetcher([]))
+    assert len(store) == 0
+    store.close()
+
+def test_incremental_sync_sends_naive_local_since(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.scraper.offer_store.BACKEND_SINCE_PARAM", "desde")
+    calls = []
+    offers = [offer("2026-03-02T10:15:30.500000")]
+
+    def fetch(since, fields, validators):
+        calls.append(since)
+        return iter(offers)
+
+    store = OfferStore(str(tmp_path / "ofertas.db"), fetcher=fetch)
+    store.sync()
+    offers.append(offer("2026-03-02T11:00:00"))
+    assert store.sync() == 1
+    assert calls == [None, "2026-03-02T10:15:30"]
+    store.close()
+
+def test_unfiltered_listing_is_downloaded_at_most_once_per_interval(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr("src.scraper.offer_store.BACKEND_SINCE_PARAM", None)
+    calls = []
+
+    def fetch(since, fields, validators):
+        calls.append(since)
+        return iter([offer("2026-03-02T10:15:30")])
+
+    store = OfferStore(str(tmp_path / "ofertas.db"), fetcher=fetch, unfiltered_interval=3600)
+    store.sync()
+    store.sync()
+    store.sync()
+    assert calls == [None]
+    assert sum("listado completo" in record.getMessage() for record in caplog.records
+               if record.levelname == "WARNING") == 1
+
+    store.unfiltered_interval = 0
+    store.sync()
+    assert len(calls) == 2
+    store.close()
+
+def test_listing_with_since_param_is_not_rate_limited(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.scraper.offer_store.BACKEND_SINCE_PARAM", "desde")
+    calls = []
+
+    def fetch(since, fields, validators):
+        calls.append(since)
+        return iter([offer("2026-03-02T10:15:30")])
+
+    store = OfferStore(str(tmp_path / "ofertas.db"), fetcher=fetch, unfiltered_interval=3600)
+    store.sync()
+    store.sync()
+    assert len(calls) == 2
+    store.close()
+
+def filtering_fetcher(offers, calls=None):
+    """Backend que aplica el filtro `since` (inclusivo, con la fecha truncada a segundos)."""
+    def fetch(since, fields, validators):
+        if calls is not None:
+            calls.append(since)
+        return iter([item for item in offers if since is None or item["fechaPublicacion"][:19] >= since])
+    return fetch
+
+def test_offers_added_by_the_script_do_not_move_the_high_water_mark(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.scraper.offer_store.BACKEND_SINCE_PARAM", "desde")
+    backend = [offer("2026-03-02T09:00:00")]
+    calls = []
+    store = OfferStore(str(tmp_path / "ofertas.db"), fetcher=filtering_fetcher(backend, calls))
+    store.sync()
+
+    # Oferta cargada a mano a las 10:00 y, antes de la siguiente sincronización, la que publica el script a las 10:05
+    human = {"titulo": "Mozo", "empresaConsultora": "Hotel Península", "fechaPublicacion": "2026-03-02T10:00:00"}
+    bot = {"titulo": "Chofer", "empresaConsultora": "Pesquera Madryn", "fechaPublicacion": "2026-03-02T10:05:00"}
+    backend.extend([human, bot])
+    assert store.add(bot)
+
+    assert store.sync() == 1
+    assert calls[-1] == "2026-03-02T09:00:00"
+    assert len(store) == 3
+    assert store.high_water_mark() == parse_fecha_publicacion(bot["fechaPublicacion"])
+    store.close()
+
+def test_offers_resent_at_the_mark_second_do_not_force_a_full_sync(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.scraper.offer_store.BACKEND_SINCE_PARAM", "desde")
+    backend = [offer("2026-03-02T09:00:00"),
+               {"titulo": "Mozo", "empresaConsultora": "Hotel Península", "fechaPublicacion": "2026-03-02T10:00:00.200000"},
+               {"titulo": "Chofer", "empresaConsultora": "Pesquera Madryn", "fechaPublicacion": "2026-03-02T10:00:00.700000"}]
+    store = OfferStore(str(tmp_path / "ofertas.db"), fetcher=filtering_fetcher(backend))
+    store.sync()
+    generation = store.generation
+
+    # Las dos ofertas del segundo de la marca vuelven a llegar en cada sincronización
+    assert store.sync() == 0
+    backend.append(offer("2026-03-02T11:00:00"))
+    assert store.sync() == 1
+    assert store.generation == generation
+    assert len(store) == 4
+    store.close()
+
+def test_deleted_offers_force_a_full_sync_when_the_filter_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.scraper.offer_store.BACKEND_SINCE_PARAM", "desde")
+    backend = [offer("2026-03-02T09:00:00"), offer("2026-03-02T10:00:00"), offer("2026-03-02T11:00:00")]
+    store = OfferStore(str(tmp_path / "ofertas.db"), fetcher=fetcher(backend))
+    store.sync()
+    generation = store.generation
+
+    store.sync()
+    assert store.generation == generation
+    del backend[0]
+    store.sync()
+    assert store.generation == generation + 1
+    assert len(store) == 2
+    store.close()
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from src.scraper.query_planner import QueryPlanner
+
+ARMS = [(filter_index, variant) for filter_index in range(2) for variant in range(2)]
+
+class FixedRandom(random.Random):
+    """Devuelve siempre el mismo valor, para decidir los reintentos en las pruebas."""
+
+    def __init__(self, value: float):
+        super().__init__()
+        self.value = value
+
+    def random(self) -> float:
+        return self.value
+
+def planner(retry: bool = False, **kwargs) -> QueryPlanner:
+    return QueryPlanner(None, min_calls=10, min_yield=0.05, retry_rate=0.1,
+                        rng=FixedRandom(0.0 if retry else 1.0), **kwargs)
+
+def record_pages(planner: QueryPlanner, arm, pages: int, valid: int) -> None:
+    for _ in range(pages):
+        planner.record(arm, jobs=10, valid=valid, duplicates=10 - valid, blacklisted=0)
+
+def test_without_history_keeps_default_order():
+    assert planner().plan(ARMS) == ARMS
+
+def test_prunes_arm_after_enough_empty_pages():
+    subject = planner()
+    record_pages(subject, (0, 1), pages=30, valid=0)
+    assert subject.is_pruned((0, 1))
+    assert subject.plan(ARMS) == [(0, 0), (1, 0), (1, 1)]
+
+def test_few_empty_pages_do_not_prune():
+    subject = planner()
+    record_pages(subject, (0, 1), pages=5, valid=0)
+    assert not subject.is_pruned((0, 1))
+    assert (0, 1) in subject.plan(ARMS)
+
+def test_pruned_arm_is_retried_at_the_end_of_the_plan():
+    subject = planner(retry=True)
+    record_pages(subject, (0, 0), pages=30, valid=0)
+    assert subject.plan(ARMS) == [(0, 1), (1, 0), (1, 1), (0, 0)]
+
+def test_pruned_arm_recovers_after_a_productive_retry():
+    subject = planner()
+    record_pages(subject, (0, 0), pages=30, valid=0)
+    assert subject.is_pruned((0, 0))
+    # El reintento sorteado encuentra ofertas válidas otra vez
+    record_pages(subject, (0, 0), pages=1, valid=3)
+    assert not subject.is_pruned((0, 0))
+    assert (0, 0) in subject.plan(ARMS)
+
+def test_decay_lets_recent_results_outweigh_old_ones():
+    subject = planner()
+    record_pages(subject, (0, 0), pages=200, valid=5)
+    record_pages(subject, (0, 0), pages=300, valid=0)
+    assert subject.is_pruned((0, 0))
+
+def test_without_decay_old_results_keep_the_arm():
+    subject = planner(decay=1.0)
+    record_pages(subject, (0, 0), pages=200, valid=5)
+    record_pages(subject, (0, 0), pages=300, valid=0)
+    assert not subject.is_pruned((0, 0))
+
+def test_fallback_uses_best_pruned_arm_by_observed_yield():
+    subject = planner()
+    for arm in ARMS:
+        record_pages(subject, arm, pages=30, valid=0)
+    # Pocas válidas, pero más que el resto: sigue podado y es el mejor de los podados
+    subject.record((1, 1), jobs=10, valid=0, duplicates=10, blacklisted=0)
+    subject.stats["1|1"]["validas"] = 0.1
+    assert subject.is_pruned((1, 1))
+    assert subject.plan(ARMS) == [(1, 1)]
+
+def test_rejects_invalid_decay_and_retry_rate():
+    with pytest.raises(ValueError):
+        QueryPlanner(None, decay=0)
+    with pytest.raises(ValueError):
+        QueryPlanner(None, retry_rate=1.5)
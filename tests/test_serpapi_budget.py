@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from src.config.settings import ARGENTINA_TZ
+from src.scheduler.event_scheduler import FakeClock
+from src.scraper.serpapi_budget import SerpApiBudget
+
+def budget(tmp_path, clock: FakeClock, **kwargs) -> SerpApiBudget:
+    return SerpApiBudget(str(tmp_path / "presupuesto.json"), rate_per_minute=0, now=clock.now, **kwargs)
+
+def test_daily_limit_resets_on_the_injected_day(tmp_path):
+    clock = FakeClock(datetime(2026, 3, 2, 23, 59, tzinfo=ARGENTINA_TZ))
+    subject = budget(tmp_path, clock, daily_limit=2, monthly_limit=0)
+    assert subject.acquire() and subject.acquire()
+    assert not subject.acquire()
+    assert subject.remaining_today() == 0
+
+    clock.sleep(timedelta(minutes=1).total_seconds())
+    assert subject.remaining_today() == 2
+    assert subject.acquire()
+    assert subject.state["dia"] == "2026-03-03"
+
+def test_monthly_limit_resets_on_the_injected_month(tmp_path):
+    clock = FakeClock(datetime(2026, 3, 31, 12, 0, tzinfo=ARGENTINA_TZ))
+    subject = budget(tmp_path, clock, daily_limit=0, monthly_limit=1)
+    assert subject.acquire()
+    clock.sleep(timedelta(hours=11).total_seconds())
+    assert subject.exhausted()
+    clock.sleep(timedelta(hours=1).total_seconds())
+    assert not subject.exhausted()
+    assert subject.state["mes"] == "2026-04"
+
+def test_credits_per_offer_follows_the_period(tmp_path):
+    clock = FakeClock(datetime(2026, 3, 2, 10, 0, tzinfo=ARGENTINA_TZ))
+    subject = budget(tmp_path, clock, daily_limit=0, monthly_limit=0)
+    for _ in range(4):
+        subject.acquire()
+    subject.record_published(2)
+    assert subject.credits_per_offer("dia") == 2.0
+    clock.sleep(timedelta(days=1).total_seconds())
+    assert subject.credits_per_offer("dia") is None
+    assert subject.credits_per_offer("mes") == 2.0
@@ -0,0 +1,69 @@
+import logging
+
+import pytest
+
+import src.scraper.serpapi as serpapi
+from src.scraper.serpapi_cache import SerpApiCache
+
+PARAMS = {"engine": "google_jobs", "q": "empleos puerto madryn", "api_key": "secreta"}
+DATA = {"jobs_results": [{"title": "Cajero/a", "company_name": "Supermercado Sur"}]}
+
+def expired_cache(tmp_path) -> SerpApiCache:
+    # TTL negativo: toda respuesta guardada ya está vencida
+    return SerpApiCache(str(tmp_path / "serpapi.db"), ttl_hours={"none": -1})
+
+def test_expired_entry_is_served_only_when_stale_is_allowed(tmp_path):
+    cache = expired_cache(tmp_path)
+    cache.put(PARAMS, None, DATA)
+    assert cache.get(PARAMS, None) is None
+    assert cache.get(PARAMS, None, allow_stale=True) == DATA
+    assert cache.get({"q": "otra"}, None, allow_stale=True) is None
+    assert (cache.stats["misses"], cache.stats["expired"], cache.stats["stale"], cache.stats["hits"]) == (1, 1, 1, 0)
+    cache.close()
+
+class Budget:
+    def __init__(self, credits: int):
+        self.credits = credits
+
+    def acquire(self) -> bool:
+        self.credits -= 1
+        return self.credits >= 0
+
+class Response:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return DATA
+
+class Client:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, endpoint=None, params=None):
+        self.calls += 1
+        return Response()
+
+@pytest.fixture
+def search(tmp_path, monkeypatch):
+    cache = expired_cache(tmp_path)
+    client = Client()
+    monkeypatch.setattr(serpapi, "get_serpapi_cache", lambda: cache)
+    monkeypatch.setattr(serpapi, "get_http_client", lambda: client)
+
+    def run(credits: int, date_filter=None):
+        monkeypatch.setattr(serpapi, "get_serpapi_budget", lambda: Budget(credits))
+        jobs, _, _ = serpapi.scrape_google_jobs(date_filter=date_filter)
+        return jobs, client.calls
+
+    yield run
+    cache.close()
+
+def test_exhausted_budget_serves_the_expired_cached_response(search, caplog):
+    caplog.set_level(logging.INFO)
+    assert search(credits=1) == (DATA["jobs_results"], 1)
+    assert search(credits=0) == (DATA["jobs_results"], 1)
+    assert any(record.getMessage().startswith("[SERPAPI] Créditos agotados") for record in caplog.records)
+
+def test_exhausted_budget_without_cached_response_skips_the_query(search):
+    assert search(credits=0, date_filter="date_posted:week") == ([], 0)
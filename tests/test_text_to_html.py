@@ -0,0 +1,54 @@
+import html
+import json
+import os
+import random
+
+import pytest
+
+from src.utils.helpers import iter_html, text_to_html
+from tests.legacy import legacy_text_to_html
+
+CORPUS = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "data", "descripciones.jsonl")
+
+# Un ejemplo de cada tipo de línea, con sus casos borde
+LINE_KINDS = [
+    "", "   ", "Requisitos:", "Beneficios :", "Qué ofrecemos:", "Horario: 9 a 18", "- item", "-item", "• punto",
+    "* estrella", "◦ círculo", "- Horario: lunes a viernes", "- Sección:", "- Dólares: $ 1.000 & bonos",
+    "1. uno", "2) dos", "10.diez", "3 tres", "1.", "Texto común con <b>etiquetas</b> & símbolos",
+    "  espacios alrededor  ", "Q&A: preguntas", "C++ / C#", "x < y > z", "\t- tab viñeta", "é:", "A:",
+    "100% remoto", "línea final",
+]
+
+def expected(text: str) -> str:
+    """Paridad: el HTML de la versión anterior aplicada al texto ya escapado."""
+    return legacy_text_to_html(html.escape(text, quote=False) if text else text)
+
+def load_corpus():
+    with open(CORPUS, encoding="utf-8") as f:
+        return [json.loads(line)["descripcion"] for line in f if line.strip()]
+
+def random_texts(count: int, seed: int):
+    rng = random.Random(seed)
+    breaks = ["\n", "\r\n", "\r", "\n\n"]
+    for _ in range(count):
+        lines = [rng.choice(LINE_KINDS) for _ in range(rng.randint(0, 12))]
+        yield "".join(line + rng.choice(breaks) for line in lines[:-1]) + (lines[-1] if lines else "")
+
+@pytest.mark.parametrize("text", load_corpus())
+def test_corpus_matches_legacy(text):
+    assert text_to_html(text) == expected(text)
+
+@pytest.mark.parametrize("text", ["", "\n", "\r\n\r\n", "   "] + LINE_KINDS)
+def test_single_lines_match_legacy(text):
+    assert text_to_html(text) == expected(text)
+
+def test_random_edge_cases_match_legacy():
+    mismatches = [text for text in random_texts(5000, seed=3) if text_to_html(text) != expected(text)]
+    assert mismatches == []
+
+def test_content_is_escaped():
+    assert text_to_html("x < y & <b>z</b>") == "<p>x &lt; y &amp; &lt;b&gt;z&lt;/b&gt;</p>"
+
+def test_iter_html_streams_the_same_html():
+    text = "\n\n".join(load_corpus())
+    assert "".join(iter_html(text)) == text_to_html(text)